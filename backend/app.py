@@ -1,25 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import csv
+import hashlib
 import json
 import os
 import sys
 import logging
 import threading
+import time
 from datetime import datetime
 import re
-from io import BytesIO
+from io import BytesIO, StringIO
 from pathlib import Path
 from typing import Any, Dict, Optional
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-import pandas as pd
-import psycopg2
-from psycopg2 import extras
-from fastapi import FastAPI, File, HTTPException, UploadFile, Form, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
 
 def resolve_base_dir() -> Path:
     env_base = os.getenv("FAIZAN_BASE_DIR")
@@ -46,14 +44,53 @@ logging.basicConfig(
 if str(BASE_DIR) not in sys.path:
     sys.path.append(str(BASE_DIR))
 
+# Installed before the third-party imports so FAIZAN_PROFILE_STARTUP can time them
+from backend.core.startup_profile import startup_profile
+
+startup_profile.install_from_env(LOG_DIR)
+
+import psycopg2
+from psycopg2 import extras
+from fastapi import FastAPI, File, HTTPException, UploadFile, Form, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, HTMLResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, Field, ValidationError
+
 from backend.core.config_manager import ConfigManager
 from backend.core.pdf_manager import PDFManager
 from backend.core.helpers import calculate_age, calculate_years_studying, format_date
-from backend.core.db_config import load_db_config, save_db_config
+from backend.core.class_catalog import ClassCatalog
+from backend.core.class_ranks import ClassRankCache
+from backend.core.config_store import JsonDocument
+from backend.core.marks_sheet import MarksSheet
+from backend.core.diagnostics_schema import DiagnosticsSchema
+from backend.core.fast_json import FastJSONResponse, dumps_text, raw_items_response, register_jsonb
+from backend.core.http_cache import DataVersions, ResponseLayer, ResponseStats
+from backend.core.lazy import LazyModule, warm
+from backend.core.metrics import RequestMetrics, batch_sizes, db_connect_latency, process_rss_bytes, process_start, registry
+from backend.core.db_config import load_db_config, save_db_config, subscribe_db_config
+from backend.core.db_instrument import InstrumentedConnection
+from backend.core.query_stats import query_stats
+from backend.core.reference_cache import ReferenceCache
+from backend.core.render_profile import RenderProfile
+from backend.core.results import ResultEngine, boundaries_from_config, payload_percentage, rank_percentages
+from backend.core.student_index import StudentIndex
+from backend.core.table_versions import drop_legacy_triggers, read_table_versions
+from backend.core.tabulation import build_tabulation, write_tabulation_xlsx
+
+pd = LazyModule("pandas")
+startup_profile.mark("imports")
+
+# json/jsonb columns use the fast decoder; PDF render profiles go next to backend.log
+register_jsonb()
+PDFManager.render_log = LOG_DIR / "render-profile.jsonl"
 
 SAMPLE_EXCEL = BASE_DIR / "student_sample.xlsx"
 FILTERS_FILE = BASE_DIR / "settings" / "filters.json"
 REMARKS_FILE = BASE_DIR / "settings" / "remarks.json"
+FILTERS_DOCUMENT = JsonDocument(FILTERS_FILE)
+REMARKS_DOCUMENT = JsonDocument(REMARKS_FILE)
 REQUIRED_STUDENT_COLUMNS = [
     "gr_no",
     "student_name",
@@ -71,16 +108,25 @@ REQUIRED_STUDENT_COLUMNS = [
     "address",
 ]
 
-def get_connection():
+def open_connection():
+    """Connect without logging failures; for background probes that must stay quiet when Postgres is down"""
     config = load_db_config()
+    started = time.perf_counter()
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", config.get("host")),
+        dbname=os.getenv("DB_NAME", config.get("dbname")),
+        user=os.getenv("DB_USER", config.get("user")),
+        password=os.getenv("DB_PASSWORD", config.get("password")),
+        port=int(os.getenv("DB_PORT", config.get("port", 5432))),
+        connection_factory=InstrumentedConnection,
+    )
+    db_connect_latency.observe(time.perf_counter() - started)
+    return conn
+
+
+def get_connection():
     try:
-        return psycopg2.connect(
-            host=os.getenv("DB_HOST", config.get("host")),
-            dbname=os.getenv("DB_NAME", config.get("dbname")),
-            user=os.getenv("DB_USER", config.get("user")),
-            password=os.getenv("DB_PASSWORD", config.get("password")),
-            port=int(os.getenv("DB_PORT", config.get("port", 5432))),
-        )
+        return open_connection()
     except Exception:
         logging.exception("Database connection failed")
         raise
@@ -92,6 +138,66 @@ def require_admin(request: Request):
         raise HTTPException(status_code=403, detail="Admin access required")
 
 
+def probe_table_versions(conn, tables: list[str]) -> Dict[str, Optional[str]]:
+    try:
+        return read_table_versions(conn.cursor(), tables)
+    except Exception:
+        conn.rollback()  # leave the endpoint's transaction usable for its own queries
+        raise
+
+
+data_versions = DataVersions(probe_table_versions)
+response_layer = ResponseLayer(data_versions, ResponseStats())
+
+
+reference_cache = ReferenceCache()
+
+
+def reference_response(request: Request, key: str, loader, tables: tuple[str, ...] = ()) -> Response:
+    """
+    Serve cached reference data with an ETag, answering 304 when the client copy is current
+
+    `tables` are the tables the entry is read from; their database versions make
+    the cache reload after writes from other PCs. With tables, loader(conn) reads
+    on the connection the versions were probed on; without, loader() is called.
+    """
+    if tables:
+        conn = get_connection()
+        try:
+            version = tuple(sorted(data_versions.database(tables, conn).items()))
+            value, etag = reference_cache.get(key, lambda: loader(conn), version)
+        finally:
+            conn.close()
+    else:
+        value, etag = reference_cache.get(key, loader)
+    endpoint = f"reference.{key}"
+    cached = response_layer.not_modified(request, endpoint, etag)
+    if cached is not None:
+        return cached
+    return response_layer.send(request, endpoint, value, etag=etag)
+
+
+_class_catalog: Optional[ClassCatalog] = None
+
+
+def class_catalog() -> ClassCatalog:
+    """Class ordering/levels from config.json, rebuilt only when the config changes"""
+    global _class_catalog
+    config = ConfigManager.snapshot()
+    if _class_catalog is None:
+        _class_catalog = ClassCatalog.from_config(config)
+    return _class_catalog
+
+
+def on_config_changed(_config: Dict[str, Any]):
+    global _class_catalog
+    _class_catalog = None
+    reference_cache.invalidate("classes", "class_catalog")
+
+
+ConfigManager.subscribe(on_config_changed)
+
+
 def ensure_user_exists(user_id: int):
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -192,23 +298,72 @@ def normalize_value(value: Any, column: str) -> Optional[str]:
     return normalize_cell(value)
 
 
-def extract_student_rows(content: bytes) -> tuple[list[Dict[str, Optional[str]]], list[Optional[str]]]:
+ROSTER_EXTENSIONS = (".xlsx", ".xls", ".csv", ".parquet")
+
+
+def ensure_roster_file(file: UploadFile):
+    if not (file.filename or "").lower().endswith(ROSTER_EXTENSIONS):
+        raise HTTPException(
+            status_code=400,
+            detail="Please upload an Excel (.xlsx, .xls), CSV (.csv) or Parquet (.parquet) file",
+        )
+
+
+def read_roster_frame(
+    content: bytes,
+    filename: str,
+    columns: Optional[list[str]] = REQUIRED_STUDENT_COLUMNS,
+) -> pd.DataFrame:
+    name = (filename or "").lower()
     try:
-        df = pd.read_excel(BytesIO(content))
+        if name.endswith(".csv"):
+            # The C parser with every column as text skips dtype inference and keeps
+            # G.R numbers such as "00123" intact; blanks are handled by normalize_cell.
+            return pd.read_csv(
+                BytesIO(content),
+                engine="c",
+                dtype=str,
+                keep_default_na=False,
+                encoding="utf-8-sig",
+            )
+        if name.endswith(".parquet"):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as exc:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Parquet support requires pyarrow. Run: pip install pyarrow",
+                ) from exc
+            schema_names = set(pq.read_schema(BytesIO(content)).names)
+            projected = [column for column in columns or [] if column in schema_names]
+            return pd.read_parquet(BytesIO(content), columns=projected or None)
+        return pd.read_excel(BytesIO(content))
+    except HTTPException:
+        raise
     except Exception as exc:  # pragma: no cover - pandas raises many error types
-        raise HTTPException(status_code=400, detail=f"Unable to read Excel file: {exc}") from exc
+        raise HTTPException(status_code=400, detail=f"Unable to read roster file: {exc}") from exc
+
+
+def extract_student_rows(
+    content: bytes,
+    filename: str = "roster.xlsx",
+) -> tuple[list[Dict[str, Optional[str]]], list[Optional[str]]]:
+    df = read_roster_frame(content, filename)
+    df.columns = [str(column).strip() for column in df.columns]
 
     for column in REQUIRED_STUDENT_COLUMNS:
         if column not in df.columns:
             raise HTTPException(status_code=400, detail=f"Missing column: {column}")
 
+    frame = df[REQUIRED_STUDENT_COLUMNS].astype(object)
+    frame = frame.where(frame.notna(), None)
+
     rows = []
     row_errors: list[Optional[str]] = []
-    for _, row in df.iterrows():
+    for values in frame.itertuples(index=False, name=None):
         error = None
         row_data = {}
-        for column in REQUIRED_STUDENT_COLUMNS:
-            value = row.get(column) if pd.notna(row.get(column)) else None
+        for column, value in zip(REQUIRED_STUDENT_COLUMNS, values):
             normalized = normalize_value(value, column)
             if column in DATE_COLUMNS and value and not normalized:
                 error = f"Invalid date in {column}: {value}"
@@ -217,6 +372,7 @@ def extract_student_rows(content: bytes) -> tuple[list[Dict[str, Optional[str]]]
             row_data["gr_no"] = str(row_data["gr_no"]).strip()
         rows.append(row_data)
         row_errors.append(error)
+    batch_sizes.observe(len(rows), "roster_rows")
     return rows, row_errors
 
 
@@ -262,6 +418,17 @@ class DiagnosticsRequest(BaseModel):
     diagnostics_sections: list[Dict[str, Any]]
 
 
+class ClassCatalogEntry(BaseModel):
+    code: str
+    sort: Optional[float] = None
+    level: Optional[str] = None
+    aliases: list[str] = []
+
+
+class ClassCatalogPayload(BaseModel):
+    entries: list[ClassCatalogEntry]
+
+
 class FiltersPayload(BaseModel):
     filters: Dict[str, list[str]]
 
@@ -339,6 +506,7 @@ app = FastAPI(
     title="Faizan Report Studio API",
     version="2.0.0",
     description="Backend service powering the Discord-inspired React client",
+    default_response_class=FastJSONResponse,
 )
 
 app.mount("/templates", StaticFiles(directory=str(PDFManager.TEMPLATES_DIR)), name="templates")
@@ -349,7 +517,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(RequestMetrics)
 
 
 def ensure_report_queue_table():
@@ -385,6 +555,17 @@ def ensure_report_results_table():
         )
         """
     )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_report_results_partition ON report_results (session, class_sec, term, gr_no)"
+    )
+    # Listings read the report date without detoasting the whole payload
+    cursor.execute(
+        """
+        ALTER TABLE report_results
+        ADD COLUMN IF NOT EXISTS report_date TEXT GENERATED ALWAYS AS (payload->>'date') STORED
+        """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_report_results_gr_no ON report_results (gr_no, created_at DESC, id DESC)")
     conn.commit()
     conn.close()
 
@@ -405,6 +586,181 @@ def ensure_diagnostics_queue_table():
     conn.close()
 
 
+def ensure_student_sync_schema():
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS student_tombstones (
+            gr_no TEXT PRIMARY KEY,
+            deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+    cursor.execute("ALTER TABLE students ALTER COLUMN updated_at SET DEFAULT CURRENT_TIMESTAMP")
+    cursor.execute("UPDATE students SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_students_updated_at ON students (updated_at, gr_no)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_student_tombstones_deleted_at ON student_tombstones (deleted_at, gr_no)")
+    conn.commit()
+    conn.close()
+
+
+def remove_table_version_triggers():
+    conn = get_connection()
+    cursor = conn.cursor()
+    if drop_legacy_triggers(cursor):
+        logging.info("Removed the table_versions triggers; table versions are now probed at read time")
+    conn.commit()
+    conn.close()
+
+
+student_index = StudentIndex()
+STUDENT_INDEX_COLUMNS = "gr_no, student_name, father_name, current_class_sec, status"
+STUDENT_TABLES = ("students", "student_tombstones")
+# Without database table versions, the index polls for other PCs' changes at most this often
+STUDENT_INDEX_POLL_SECONDS = 30.0
+student_index_sync: Dict[str, Any] = {"version": None, "horizon": None, "at": 0.0}
+student_index_sync_lock = threading.Lock()
+
+# Rows written by transactions still open have updated_at (their start time) at or
+# after this horizon, so reading up to it never jumps over a row that commits later.
+SYNC_HORIZON_QUERY = """
+SELECT LEAST(
+    NOW(),
+    COALESCE(
+        (
+            SELECT MIN(xact_start) FROM pg_stat_activity
+            WHERE datname = current_database()
+              AND xact_start IS NOT NULL
+              AND pid <> pg_backend_pid()
+        ),
+        NOW()
+    )
+) AS horizon
+"""
+
+
+def student_table_versions(conn) -> tuple:
+    return tuple(sorted(data_versions.database(STUDENT_TABLES, conn).items()))
+
+
+def load_student_index():
+    conn = get_connection()
+    version = student_table_versions(conn)
+    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    cursor.execute(SYNC_HORIZON_QUERY)
+    horizon = cursor.fetchone()["horizon"]
+    cursor.execute(f"SELECT {STUDENT_INDEX_COLUMNS} FROM students")
+    rows = cursor.fetchall()
+    conn.close()
+    student_index.rebuild(rows)
+    student_index_sync.update(version=version, horizon=horizon, at=time.monotonic())
+    logging.info("Student suggest index built with %s students", len(student_index))
+
+
+def sync_student_index():
+    """
+    Apply students changed or deleted since the last sync, including writes from other PCs
+
+    Runs only when the database version of the students tables moved (or, where
+    versions are unavailable, every STUDENT_INDEX_POLL_SECONDS). Reads the same
+    (updated_at, deleted_at) windows as /students/changes, bounded by the horizon.
+    """
+    conn = get_connection()
+    version = student_table_versions(conn)
+    unversioned = any(value is None for _, value in version)
+    unchanged = version == student_index_sync["version"] and not (
+        unversioned and time.monotonic() - student_index_sync["at"] >= STUDENT_INDEX_POLL_SECONDS
+    )
+    # When another request is already syncing, serve the current index
+    if unchanged or not student_index_sync_lock.acquire(blocking=False):
+        conn.close()
+        return
+    try:
+        since = student_index_sync["horizon"]
+        cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+        try:
+            cursor.execute(SYNC_HORIZON_QUERY)
+            horizon = cursor.fetchone()["horizon"]
+            cursor.execute(
+                f"SELECT {STUDENT_INDEX_COLUMNS} FROM students WHERE updated_at >= %s AND updated_at < %s",
+                (since, horizon),
+            )
+            upserts = cursor.fetchall()
+            cursor.execute(
+                """
+                SELECT t.gr_no FROM student_tombstones t
+                LEFT JOIN students s ON s.gr_no = t.gr_no
+                WHERE t.deleted_at >= %s AND t.deleted_at < %s AND s.gr_no IS NULL
+                """,
+                (since, horizon),
+            )
+            deletes = [row["gr_no"] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+        for row in upserts:
+            student_index.upsert(row)
+        for gr_no in deletes:
+            student_index.remove(gr_no)
+        student_index_sync.update(version=version, horizon=horizon, at=time.monotonic())
+    except Exception:  # pragma: no cover - suggestions fall back to the current index
+        logging.exception("Unable to sync student suggest index")
+    finally:
+        student_index_sync_lock.release()
+
+
+def refresh_student_index(gr_nos: list[str]):
+    """Re-read the given students after a bulk write and sync them into the suggest index"""
+    if not gr_nos or not student_index.ready:
+        return
+    try:
+        conn = get_connection()
+        cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+        cursor.execute(f"SELECT {STUDENT_INDEX_COLUMNS} FROM students WHERE gr_no = ANY(%s)", (gr_nos,))
+        rows = cursor.fetchall()
+        conn.close()
+    except Exception:  # pragma: no cover - the index is rebuilt on next start
+        logging.exception("Unable to refresh student suggest index")
+        return
+    found = set()
+    for row in rows:
+        student_index.upsert(row)
+        found.add(row["gr_no"])
+    for gr_no in set(gr_nos) - found:
+        student_index.remove(gr_no)
+
+
+def on_db_config_changed(config: Dict[str, Any]):
+    reference_cache.invalidate()
+    class_rank_cache.invalidate()
+    data_versions.bump("report_results", "report_queue", "diagnostics_queue")
+    logging.info(
+        "Database settings changed; using %s:%s/%s",
+        config.get("host"),
+        config.get("port"),
+        config.get("dbname"),
+    )
+    if student_index.ready:
+        # The suggest index mirrors the old database; rebuild it against the new one
+        threading.Thread(target=safe_load_student_index, daemon=True).start()
+
+
+def safe_load_student_index():
+    try:
+        load_student_index()
+    except Exception:  # pragma: no cover
+        logging.exception("Unable to rebuild student suggest index")
+
+
+subscribe_db_config(on_db_config_changed)
+
+
+RENDER_WARMUP = os.getenv("FAIZAN_RENDER_WARMUP", "1").strip().lower() not in {"0", "false", "no", "off"}
+WARMUP_HEALTH_WAIT_SECONDS = 3.0
+health_served = threading.Event()
+startup_state = {"phase": "starting"}
+
+
 @app.on_event("startup")
 def initialize_report_queue():
     def init_task():
@@ -412,6 +768,9 @@ def initialize_report_queue():
             ensure_report_queue_table()
             ensure_report_results_table()
             ensure_diagnostics_queue_table()
+            ensure_student_sync_schema()
+            remove_table_version_triggers()
+            load_student_index()
             migrate_principal_roles()
             conn = get_connection()
             cursor = conn.cursor()
@@ -419,14 +778,179 @@ def initialize_report_queue():
             cursor.execute("DELETE FROM diagnostics_queue")
             conn.commit()
             conn.close()
+            data_versions.bump("report_queue", "diagnostics_queue")
         except Exception as exc:  # pragma: no cover
             print(f"Unable to prepare queue tables: {exc}")
 
     threading.Thread(target=init_task, daemon=True).start()
+    startup_state["phase"] = "warming"
+    threading.Thread(target=warm_up, daemon=True).start()
+    startup_profile.finish()
+
+
+def render_warmup_jobs() -> list[dict[str, Any]]:
+    """The preview samples, rendered through every template the PDF and preview endpoints use"""
+    return [
+        {"name": "report_card", "data": REPORT_PREVIEW_SAMPLE, "template_name": "report_card.html", "pdf": True},
+        {"name": "report_batch", "data": {"records": [dict(REPORT_PREVIEW_SAMPLE)]}, "template_name": "report_batch.html"},
+        {
+            "name": "report_preview",
+            "data": REPORT_PREVIEW_SAMPLE,
+            "template_name": "report_preview.html",
+            "asset_base": "/templates",
+        },
+        {
+            "name": "diagnostics_batch",
+            "data": {"records": [dict(DIAGNOSTICS_PREVIEW_SAMPLE)]},
+            "template_name": "report_diagnostics_batch.html",
+            "css_name": "diagnostics_styles.css",
+            "pdf": True,
+        },
+        {
+            "name": "diagnostics_preview",
+            "data": DIAGNOSTICS_PREVIEW_SAMPLE,
+            "template_name": "report_diagnostics_preview.html",
+            "css_name": "diagnostics_styles.css",
+            "asset_base": "/templates",
+        },
+    ]
+
+
+def warm_up():
+    """
+    Prime the render caches and preload pandas once the server answers /health
+
+    Waits for the first /health request (or a few seconds without one), so the
+    work never competes with the Electron launch check. /health reports
+    "warming" until it finishes; FAIZAN_RENDER_WARMUP=0 skips the renders.
+    """
+    health_served.wait(WARMUP_HEALTH_WAIT_SECONDS)
+    try:
+        if RENDER_WARMUP:
+            timings = PDFManager.warm_up(render_warmup_jobs())
+            summary = ", ".join(f"{name} {elapsed:.0f} ms" for name, elapsed in timings.items())
+            logging.info("Render warm-up: %s", summary or "nothing rendered")
+        started = time.perf_counter()
+        warm(pd)
+        logging.info("Preloaded pandas in %.0f ms", (time.perf_counter() - started) * 1000)
+    except Exception:  # pragma: no cover
+        logging.exception("Startup warm-up failed")
+    finally:
+        startup_state["phase"] = "ready"
 
 
 @app.get("/health")
 def health_check():
+    health_served.set()
+    return {"status": "ok", "phase": startup_state["phase"]}
+
+
+QUEUE_DEPTH_CACHE_SECONDS = 5.0
+_queue_depths: dict[str, Any] = {"at": 0.0, "values": {}}
+
+
+def queue_depths() -> Dict[tuple, float]:
+    """
+    Rows waiting in each queue table, read when /metrics is scraped
+
+    The result, including a failure, is reused for QUEUE_DEPTH_CACHE_SECONDS so
+    frequent scrapes neither open a connection each time nor fill backend.log
+    while Postgres is down.
+    """
+    now = time.monotonic()
+    if now - _queue_depths["at"] < QUEUE_DEPTH_CACHE_SECONDS:
+        return _queue_depths["values"]
+    values: Dict[tuple, float] = {}
+    try:
+        conn = open_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT (SELECT COUNT(*) FROM report_queue), (SELECT COUNT(*) FROM diagnostics_queue)")
+            reports, diagnostics = cursor.fetchone()
+            values = {("report_queue",): reports, ("diagnostics_queue",): diagnostics}
+        finally:
+            conn.close()
+    except psycopg2.Error as exc:
+        logging.debug("Queue depths unavailable: %s", exc)
+    _queue_depths.update(at=now, values=values)
+    return values
+
+
+def response_byte_totals() -> Dict[tuple, float]:
+    totals: Dict[tuple, float] = {}
+    for endpoint, stats in response_layer.stats.snapshot().items():
+        totals[(endpoint, "raw")] = stats["raw_bytes"]
+        totals[(endpoint, "sent")] = stats["sent_bytes"]
+    return totals
+
+
+registry.gauge("queue_depth", "Rows waiting in a queue table", queue_depths, ("queue",))
+registry.gauge(
+    "process_resident_memory_bytes",
+    "Resident set size of the backend process",
+    lambda: {(): rss} if (rss := process_rss_bytes()) is not None else {},
+)
+registry.gauge("process_uptime_seconds", "Seconds since the backend started", lambda: {(): time.time() - process_start})
+registry.gauge(
+    "response_bytes_total",
+    "Bytes produced (raw) and sent after compression by opted-in endpoints",
+    response_byte_totals,
+    ("endpoint", "kind"),
+    kind="counter",
+)
+registry.gauge(
+    "response_not_modified_total",
+    "304 answers by opted-in endpoints",
+    lambda: {(endpoint,): stats["not_modified"] for endpoint, stats in response_layer.stats.snapshot().items()},
+    ("endpoint",),
+    kind="counter",
+)
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of request, query, render, batch and process metrics"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/admin/response-stats")
+def response_stats(request: Request):
+    """Bytes produced and sent, and 304 answers, per opted-in endpoint"""
+    require_admin(request)
+    endpoints = response_layer.stats.snapshot()
+    raw = sum(stats["raw_bytes"] for stats in endpoints.values())
+    sent = sum(stats["sent_bytes"] for stats in endpoints.values())
+    return {
+        "threshold": response_layer.threshold,
+        "totals": {
+            "raw_bytes": raw,
+            "sent_bytes": sent,
+            "saved_bytes": sum(stats["saved_bytes"] for stats in endpoints.values()),
+        },
+        "endpoints": endpoints,
+    }
+
+
+QUERY_STATS_SORTS = {"total_ms", "max_ms", "mean_ms", "calls", "slow_calls", "errors", "rows"}
+
+
+@app.get("/admin/query-stats")
+def get_query_stats(request: Request, limit: int = 20, sort: str = "total_ms"):
+    """
+    Statement fingerprints with call counts and timings, plus the slowest executions
+
+    Plans appear under "explain" when FAIZAN_EXPLAIN_SLOW_MS is set.
+    """
+    require_admin(request)
+    if sort not in QUERY_STATS_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(sorted(QUERY_STATS_SORTS))}")
+    return query_stats.snapshot(limit=max(1, min(limit, 200)), sort=sort)
+
+
+@app.post("/admin/query-stats/reset")
+def reset_query_stats(request: Request):
+    require_admin(request)
+    query_stats.reset()
     return {"status": "ok"}
 
 
@@ -466,25 +990,11 @@ def login(payload: LoginRequest):
         raise HTTPException(status_code=500, detail=f"Login failed: {exc}")
 
 
-@app.get("/students")
-def list_students(
+def build_student_filters(
     search: Optional[str] = None,
     class_sec: Optional[str] = None,
     status: Optional[str] = None,
-    limit: int = 15,
-    offset: int = 0,
-):
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-
-    query = """
-        SELECT gr_no, student_name, father_name, 
-               current_class_sec, current_session, status, 
-               contact_number_resident as contact, address
-        FROM students
-    """
-    count_query = "SELECT COUNT(*) as total FROM students"
-    
+) -> tuple[str, list[Any]]:
     clauses = []
     params: list[Any] = []
 
@@ -500,16 +1010,45 @@ def list_students(
         )
         params.extend([like] * 11)
     if class_sec and class_sec.lower() != "all":
-        clauses.append("current_class_sec = %s")
-        params.append(class_sec)
+        # A value that is only commas or blanks, like an empty one, means no class filter
+        classes = [value.strip() for value in class_sec.split(",") if value.strip()]
+        if len(classes) > 1:
+            clauses.append("current_class_sec = ANY(%s)")
+            params.append(classes)
+        elif classes:
+            clauses.append("current_class_sec = %s")
+            params.append(classes[0])
     if status and status.lower() != "all":
         clauses.append("status = %s")
         params.append(status)
 
-    if clauses:
-        where_clause = " WHERE " + " AND ".join(clauses)
-        query += where_clause
-        count_query += where_clause
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+@app.get("/students")
+def list_students(
+    search: Optional[str] = None,
+    class_sec: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 15,
+    offset: int = 0,
+):
+    conn = get_connection()
+    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+
+    query = """
+        SELECT gr_no, student_name, father_name, 
+               current_class_sec, current_session, status, 
+               contact_number_resident as contact, address
+        FROM students
+    """
+    count_query = "SELECT COUNT(*) as total FROM students"
+
+    where_clause, params = build_student_filters(search, class_sec, status)
+    query += where_clause
+    count_query += where_clause
 
     # Get total count
     cursor.execute(count_query, params)
@@ -531,89 +1070,56 @@ def list_students(
     }
 
 
+def load_class_list(conn) -> list[str]:
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT DISTINCT current_class_sec FROM students
+        WHERE current_class_sec IS NOT NULL
+        ORDER BY current_class_sec
+        """
+    )
+    rows = [row[0] for row in cursor.fetchall() if row[0]]
+    return class_catalog().sort(rows)
+
+
 @app.get("/students/classes")
-def list_classes():
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-    cursor.execute("SELECT DISTINCT current_class_sec FROM students WHERE current_class_sec IS NOT NULL")
-    rows = [row["current_class_sec"] for row in cursor.fetchall() if row["current_class_sec"]]
-    conn.close()
+def list_classes(request: Request):
+    return reference_response(request, "classes", load_class_list, ("students",))
 
-    custom_order = [
-        "NURA",
-        "NURB",
-        "KGA",
-        "KGB",
-        "KGIA",
-        "KGIB",
-        "KGIIA",
-        "KGIIB",
-        "IA",
-        "IB",
-        "IC",
-        "IIA",
-        "IIB",
-        "IIC",
-        "IIIAN",
-        "IIIBN",
-        "IVAN",
-        "IVBN",
-        "VAN",
-        "VBN",
-        "IIIA",
-        "IIIB",
-        "IVA",
-        "IVB",
-        "VA",
-        "VB",
-        "VIA",
-        "VIB",
-        "VIIA",
-        "VIIB",
-        "VIIIA",
-        "VIIIB",
-        "IXA",
-        "IXB",
-        "XA",
-        "XB",
-        "FDHIIIA",
-        "FDHIIIB",
-        "FDHIVA",
-        "FDHIVB",
-        "FDHVA",
-        "FDHVB",
-    ]
 
-    def normalize(value: str) -> str:
-        return value.upper().replace(" ", "").replace("-", "")
+@app.get("/classes/catalog")
+def get_class_catalog(request: Request):
+    return reference_response(request, "class_catalog", lambda: class_catalog().describe())
 
-    sorted_classes: list[str] = []
-    seen = set()
-    for preferred in custom_order:
-        for cls in rows:
-            if normalize(cls) == preferred and cls not in seen:
-                sorted_classes.append(cls)
-                seen.add(cls)
 
-    for cls in rows:
-        if cls not in seen:
-            sorted_classes.append(cls)
+@app.put("/classes/catalog")
+def update_class_catalog(payload: ClassCatalogPayload, request: Request):
+    require_admin(request)
+    config = ConfigManager.load()
+    config["class_catalog"] = [entry.dict(exclude_none=True) for entry in payload.entries]
+    if not ConfigManager.save(config):
+        raise HTTPException(status_code=500, detail="Unable to save config")
+    return {"status": "ok", "entries": class_catalog().describe()}
+
 
-    return sorted_classes
+def load_student_stats(conn) -> Dict[str, int]:
+    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    cursor.execute(
+        """
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'Active') AS active,
+               COUNT(*) FILTER (WHERE status != 'Active') AS inactive
+        FROM students
+        """
+    )
+    row = cursor.fetchone()
+    return {"total": row["total"], "active": row["active"], "inactive": row["inactive"]}
 
 
 @app.get("/students/stats")
-def student_stats():
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-    cursor.execute("SELECT COUNT(*) AS total FROM students")
-    total = cursor.fetchone()["total"]
-    cursor.execute("SELECT COUNT(*) AS active FROM students WHERE status = 'Active'")
-    active = cursor.fetchone()["active"]
-    cursor.execute("SELECT COUNT(*) AS inactive FROM students WHERE status != 'Active'")
-    inactive = cursor.fetchone()["inactive"]
-    conn.close()
-    return {"total": total, "active": active, "inactive": inactive}
+def student_stats(request: Request):
+    return reference_response(request, "student_stats", load_student_stats, ("students",))
 
 
 @app.get("/students/sample")
@@ -624,38 +1130,340 @@ def sample_excel():
     sample = pd.DataFrame(columns=REQUIRED_STUDENT_COLUMNS)
     sample.to_excel(file_path, index=False)
     return {
-        "message": "Sample Excel saved",
-        "file": filename,
+        "message": "Sample Excel saved",
+        "file": filename,
+    }
+
+
+EXPORT_BATCH_SIZE = 2000
+
+
+def iter_student_export_rows(
+    search: Optional[str] = None,
+    class_sec: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """Yield roster rows as tuples through a named (server-side) cursor in batches"""
+    where_clause, params = build_student_filters(search, class_sec, status)
+    conn = get_connection()
+    try:
+        cursor = conn.cursor(name="students_export")
+        cursor.itersize = EXPORT_BATCH_SIZE
+        cursor.execute(
+            f"""
+            SELECT {", ".join(REQUIRED_STUDENT_COLUMNS)}
+            FROM students
+            {where_clause}
+            ORDER BY LOWER(student_name)
+            """,
+            params,
+        )
+        while True:
+            batch = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not batch:
+                break
+            yield from batch
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def iter_student_export_csv(rows):
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(REQUIRED_STUDENT_COLUMNS)
+    for idx, row in enumerate(rows, start=1):
+        writer.writerow(["" if value is None else value for value in row])
+        if idx % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+@app.get("/students/export")
+def export_students(
+    search: Optional[str] = None,
+    class_sec: Optional[str] = None,
+    status: Optional[str] = None,
+    format: str = "xlsx",
+):
+    export_format = format.lower()
+    if export_format not in {"xlsx", "csv"}:
+        raise HTTPException(status_code=400, detail="Export format must be 'xlsx' or 'csv'")
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    rows = iter_student_export_rows(search, class_sec, status)
+
+    if export_format == "csv":
+        filename = f"students_export_{stamp}.csv"
+        return StreamingResponse(
+            iter_student_export_csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    from openpyxl import Workbook
+
+    # write_only workbooks flush each row to a temp file instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Students")
+    sheet.append(REQUIRED_STUDENT_COLUMNS)
+    exported = 0
+    for row in rows:
+        sheet.append(row)
+        exported += 1
+
+    output_dir = PDFManager.ensure_output_dir()
+    filename = f"students_export_{stamp}.xlsx"
+    file_path = output_dir / filename
+    workbook.save(file_path)
+    return {
+        "message": "Students exported",
+        "file": filename,
+        "count": exported,
+    }
+
+
+SYNC_PAGE_LIMIT = 5000
+
+
+def encode_sync_cursor(position: Dict[str, Any]) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_sync_cursor(cursor_value: str) -> Dict[str, Any]:
+    try:
+        padded = cursor_value + "=" * (-len(cursor_value) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(position, dict):
+            raise ValueError("cursor must be an object")
+        return position
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail="Invalid sync cursor") from exc
+
+
+@app.get("/students/changes")
+def student_changes(since: Optional[str] = None, limit: int = 1000):
+    """
+    Delta sync for the client roster cache
+
+    Rows are read in (updated_at, gr_no) keyset order, so many students sharing one
+    timestamp are never split or skipped across pages. The upper bound is the start
+    of the oldest transaction still open: updated_at is CURRENT_TIMESTAMP (the
+    transaction start), so rows from in-flight imports and edits stay invisible until
+    they commit and are picked up by a later call instead of being jumped over.
+    """
+    limit = max(1, min(limit, SYNC_PAGE_LIMIT))
+    position = decode_sync_cursor(since) if since else {}
+    upsert_after = position.get("u")
+    delete_after = position.get("d")
+
+    conn = get_connection()
+    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    try:
+        cursor.execute(SYNC_HORIZON_QUERY)
+        horizon = cursor.fetchone()["horizon"]
+
+        params: list[Any] = [horizon]
+        keyset = ""
+        if upsert_after:
+            keyset = " AND (updated_at, gr_no) > (%s, %s)"
+            params.extend(upsert_after)
+        params.append(limit + 1)
+        cursor.execute(
+            f"""
+            SELECT gr_no, student_name, father_name,
+                   current_class_sec, current_session, status,
+                   contact_number_resident as contact, address, updated_at
+            FROM students
+            WHERE updated_at < %s{keyset}
+            ORDER BY updated_at, gr_no
+            LIMIT %s
+            """,
+            params,
+        )
+        upserts = [row_to_dict(row) for row in cursor.fetchall()]
+        has_more = len(upserts) > limit
+        upserts = upserts[:limit]
+        if upserts:
+            last = upserts[-1]
+            upsert_after = [last["updated_at"].isoformat(), last["gr_no"]]
+
+        deletes: list[str] = []
+        if since:
+            params = [horizon]
+            keyset = ""
+            if delete_after:
+                keyset = " AND (t.deleted_at, t.gr_no) > (%s, %s)"
+                params.extend(delete_after)
+            params.append(limit + 1)
+            cursor.execute(
+                f"""
+                SELECT t.gr_no, t.deleted_at
+                FROM student_tombstones t
+                LEFT JOIN students s ON s.gr_no = t.gr_no
+                WHERE t.deleted_at < %s{keyset} AND s.gr_no IS NULL
+                ORDER BY t.deleted_at, t.gr_no
+                LIMIT %s
+                """,
+                params,
+            )
+            tombstones = cursor.fetchall()
+            has_more = has_more or len(tombstones) > limit
+            tombstones = tombstones[:limit]
+            deletes = [row["gr_no"] for row in tombstones]
+            if tombstones:
+                delete_after = [tombstones[-1]["deleted_at"].isoformat(), tombstones[-1]["gr_no"]]
+        else:
+            # A full sync already reflects every past deletion
+            delete_after = [horizon.isoformat(), ""]
+    finally:
+        conn.close()
+
+    next_position = {"u": upsert_after, "d": delete_after}
+    return {
+        "upserts": upserts,
+        "deletes": deletes,
+        "cursor": encode_sync_cursor(next_position),
+        "has_more": has_more,
+        "full": not since,
     }
 
 
-@app.get("/students/export")
-def export_students():
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+SNAPSHOT_BATCH_SIZE = 5000
+
+
+def roster_version(cursor) -> str:
     cursor.execute(
         """
-        SELECT gr_no, student_name, father_name, current_class_sec, current_session,
-               date_of_birth, contact_number_resident, contact_number_neighbour,
-               contact_number_relative, contact_number_other1, contact_number_other2,
-               contact_number_other3, contact_number_other4, address
-        FROM students
-        ORDER BY LOWER(student_name)
+        SELECT
+            (SELECT COUNT(*) FROM students) AS total,
+            (SELECT MAX(updated_at) FROM students) AS last_update,
+            (SELECT MAX(deleted_at) FROM student_tombstones) AS last_delete
         """
     )
-    rows = cursor.fetchall()
-    conn.close()
+    total, last_update, last_delete = cursor.fetchone()
+    raw = f"{total}|{last_update}|{last_delete}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:20]
 
-    data = [row_to_dict(row) for row in rows]
-    df = pd.DataFrame(data, columns=REQUIRED_STUDENT_COLUMNS)
-    output_dir = PDFManager.ensure_output_dir()
-    filename = f"students_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    file_path = output_dir / filename
-    df.to_excel(file_path, index=False)
-    return {
-        "message": "Students exported",
-        "file": filename,
-    }
+
+@app.get("/students/snapshot")
+def student_snapshot(request: Request, format: str = "json"):
+    """
+    Whole active roster in one column-oriented response
+
+    class_sec and current_session are dictionary-encoded: each column holds indexes
+    into the matching list under "dictionaries". The ETag changes whenever a student
+    is inserted, updated or deleted, so a revalidation costs one small query.
+    """
+    export_format = format.lower()
+    if export_format not in {"json", "arrow"}:
+        raise HTTPException(status_code=400, detail="Snapshot format must be 'json' or 'arrow'")
+
+    conn = get_connection()
+    # The version and the rows must come from the same snapshot of the table
+    conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+    try:
+        cursor = conn.cursor()
+        # JSON and Arrow bodies are different representations, so they carry different tags
+        etag = f"{roster_version(cursor)}-{export_format}"
+        cached = response_layer.not_modified(request, "students.snapshot", etag)
+        if cached is not None:
+            return cached
+
+        columns: Dict[str, list[Any]] = {
+            "gr_no": [],
+            "student_name": [],
+            "father_name": [],
+            "class_sec": [],
+            "session": [],
+        }
+        dictionaries: Dict[str, Dict[Any, int]] = {"class_sec": {}, "session": {}}
+        named = conn.cursor(name="students_snapshot")
+        named.itersize = SNAPSHOT_BATCH_SIZE
+        named.execute(
+            """
+            SELECT gr_no, student_name, father_name, current_class_sec, current_session
+            FROM students
+            WHERE status = 'Active'
+            ORDER BY LOWER(student_name)
+            """
+        )
+        class_codes = dictionaries["class_sec"]
+        session_codes = dictionaries["session"]
+        while True:
+            batch = named.fetchmany(SNAPSHOT_BATCH_SIZE)
+            if not batch:
+                break
+            for gr_no, student_name, father_name, class_sec, session in batch:
+                columns["gr_no"].append(gr_no)
+                columns["student_name"].append(student_name)
+                columns["father_name"].append(father_name)
+                columns["class_sec"].append(class_codes.setdefault(class_sec, len(class_codes)))
+                columns["session"].append(session_codes.setdefault(session, len(session_codes)))
+        named.close()
+        conn.commit()
+    finally:
+        conn.close()
+
+    class_values = list(class_codes)
+    session_values = list(session_codes)
+
+    if export_format == "arrow":
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise HTTPException(
+                status_code=400,
+                detail="Arrow snapshots require pyarrow. Run: pip install pyarrow",
+            ) from exc
+        table = pa.table(
+            {
+                "gr_no": pa.array(columns["gr_no"], pa.string()),
+                "student_name": pa.array(columns["student_name"], pa.string()),
+                "father_name": pa.array(columns["father_name"], pa.string()),
+                "class_sec": pa.DictionaryArray.from_arrays(
+                    pa.array(columns["class_sec"], pa.int32()), pa.array(class_values, pa.string())
+                ),
+                "session": pa.DictionaryArray.from_arrays(
+                    pa.array(columns["session"], pa.int32()), pa.array(session_values, pa.string())
+                ),
+            }
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return response_layer.send(
+            request,
+            "students.snapshot",
+            sink.getvalue().to_pybytes(),
+            etag=etag,
+            media_type="application/vnd.apache.arrow.stream",
+        )
+
+    return response_layer.send(
+        request,
+        "students.snapshot",
+        {
+            "version": etag,
+            "count": len(columns["gr_no"]),
+            "dictionaries": {"class_sec": class_values, "session": session_values},
+            "columns": columns,
+        },
+        etag=etag,
+    )
+
+
+@app.get("/students/suggest")
+def suggest_students(q: str = "", limit: int = 10):
+    if not student_index.ready:
+        load_student_index()
+    else:
+        sync_student_index()
+    limit = max(1, min(limit, 50))
+    return {"query": q, "items": student_index.suggest(q, limit)}
 
 
 @app.get("/students/{gr_no}")
@@ -751,6 +1559,8 @@ def update_student(gr_no: str, payload: StudentUpdateRequest):
         conn.close()
         
         detail = row_to_dict(row)
+        student_index.upsert(detail)
+        reference_cache.invalidate("classes", "student_stats")
         detail["date_of_birth_display"] = format_date(detail.get("date_of_birth"))
         detail["joining_date_display"] = format_date(detail.get("joining_date"))
         detail["left_date_display"] = format_date(detail.get("left_date"))
@@ -789,7 +1599,16 @@ def delete_student(gr_no: str):
 
     try:
         cursor.execute("DELETE FROM students WHERE gr_no = %s", (gr_no,))
+        cursor.execute(
+            """
+            INSERT INTO student_tombstones (gr_no, deleted_at) VALUES (%s, NOW())
+            ON CONFLICT (gr_no) DO UPDATE SET deleted_at = EXCLUDED.deleted_at
+            """,
+            (gr_no,),
+        )
         conn.commit()
+        student_index.remove(gr_no)
+        reference_cache.invalidate("classes", "student_stats")
         return {"status": "ok", "message": f"Student '{gr_no}' deleted successfully"}
     except Exception as exc:
         conn.rollback()
@@ -798,13 +1617,43 @@ def delete_student(gr_no: str):
         conn.close()
 
 
+IMPORT_WORKERS = int(os.getenv("FAIZAN_IMPORT_WORKERS", "2"))
+IMPORT_QUEUE_TIMEOUT = float(os.getenv("FAIZAN_IMPORT_QUEUE_TIMEOUT", "60"))
+IMPORT_EXECUTOR = ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="roster-import")
+IMPORT_SLOTS = asyncio.Semaphore(IMPORT_WORKERS)
+
+
+async def run_import_job(func, *args):
+    """
+    Run a blocking import step (pandas parsing, row loop, psycopg2) on the import pool
+
+    The event loop only awaits the result, so /health and every other endpoint stay
+    responsive while a large roster is processed. IMPORT_SLOTS caps simultaneous
+    imports; further uploads wait for a slot and give up after IMPORT_QUEUE_TIMEOUT.
+    """
+    try:
+        # Unlike wait_for, a timeout here cannot fire after acquire() succeeded and leak the permit
+        async with asyncio.timeout(IMPORT_QUEUE_TIMEOUT):
+            await IMPORT_SLOTS.acquire()
+    except TimeoutError as exc:
+        raise HTTPException(status_code=503, detail="Another import is still running. Try again shortly.") from exc
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(IMPORT_EXECUTOR, func, *args)
+    finally:
+        IMPORT_SLOTS.release()
+
+
 @app.post("/students/import")
 async def import_students(file: UploadFile = File(...)):
-    if not file.filename.endswith((".xlsx", ".xls")):
-        raise HTTPException(status_code=400, detail="Please upload an Excel file (.xlsx or .xls)")
+    ensure_roster_file(file)
 
     content = await file.read()
-    rows, row_errors = extract_student_rows(content)
+    return await run_import_job(import_student_rows, content, file.filename)
+
+
+def import_student_rows(content: bytes, filename: str):
+    rows, row_errors = extract_student_rows(content, filename)
 
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
@@ -839,17 +1688,25 @@ async def import_students(file: UploadFile = File(...)):
 
     conn.commit()
     conn.close()
+    refresh_student_index([row.get("gr_no") for row in rows if row.get("gr_no")])
+    reference_cache.invalidate("classes", "student_stats")
 
     return {"imported": success, "errors": errors}
 
 
 @app.post("/students/import/preview")
-async def preview_import(file: UploadFile = File(...)):
-    if not file.filename.endswith((".xlsx", ".xls")):
-        raise HTTPException(status_code=400, detail="Please upload an Excel file (.xlsx or .xls)")
+async def preview_import(request: Request, file: UploadFile = File(...)):
+    ensure_roster_file(file)
 
     content = await file.read()
-    rows, row_errors = extract_student_rows(content)
+    # Compression runs on the import pool as well, off the event loop
+    return await run_import_job(
+        lambda: response_layer.send(request, "students.import_preview", build_import_preview(content, file.filename))
+    )
+
+
+def build_import_preview(content: bytes, filename: str):
+    rows, row_errors = extract_student_rows(content, filename)
 
     gr_nos = [row.get("gr_no") for row in rows if row.get("gr_no")]
     dup_counts = {}
@@ -860,7 +1717,7 @@ async def preview_import(file: UploadFile = File(...)):
     existing = {}
     if gr_nos:
         conn = get_connection()
-        cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+        cursor = conn.cursor()
         cursor.execute(
             f"""
             SELECT {", ".join(REQUIRED_STUDENT_COLUMNS)}
@@ -870,7 +1727,8 @@ async def preview_import(file: UploadFile = File(...)):
             (gr_nos,),
         )
         for row in cursor.fetchall():
-            existing[row["gr_no"]] = row_to_dict(row)
+            record = dict(zip(REQUIRED_STUDENT_COLUMNS, row))
+            existing[record["gr_no"]] = record
         conn.close()
 
     preview_rows = []
@@ -939,7 +1797,7 @@ async def preview_import(file: UploadFile = File(...)):
         entry["diffs"] = diffs
         preview_rows.append(entry)
 
-    return {
+    return FastJSONResponse({
         "summary": {
             "total": len(rows),
             "new": counts["new"],
@@ -949,16 +1807,19 @@ async def preview_import(file: UploadFile = File(...)):
             "error": counts["error"],
         },
         "rows": preview_rows,
-    }
+    })
 
 
 @app.post("/students/import/apply")
 async def apply_import(file: UploadFile = File(...), decisions: str = Form(...)):
-    if not file.filename.endswith((".xlsx", ".xls")):
-        raise HTTPException(status_code=400, detail="Please upload an Excel file (.xlsx or .xls)")
+    ensure_roster_file(file)
 
     content = await file.read()
-    rows, row_errors = extract_student_rows(content)
+    return await run_import_job(apply_import_decisions, content, file.filename, decisions)
+
+
+def apply_import_decisions(content: bytes, filename: str, decisions: str):
+    rows, row_errors = extract_student_rows(content, filename)
     try:
         decision_data = json.loads(decisions)
     except json.JSONDecodeError as exc:
@@ -1026,7 +1887,8 @@ async def apply_import(file: UploadFile = File(...), decisions: str = Form(...))
                 cursor.execute(
                     f"""
                     UPDATE students
-                    SET {", ".join([f"{col} = %s" for col in REQUIRED_STUDENT_COLUMNS if col != "gr_no"])}
+                    SET {", ".join([f"{col} = %s" for col in REQUIRED_STUDENT_COLUMNS if col != "gr_no"])},
+                        updated_at = CURRENT_TIMESTAMP
                     WHERE gr_no = %s
                     """,
                     tuple(
@@ -1062,17 +1924,16 @@ async def apply_import(file: UploadFile = File(...), decisions: str = Form(...))
 
     conn.commit()
     conn.close()
+    refresh_student_index(list(seen))
+    reference_cache.invalidate("classes", "student_stats")
 
     return {"status": "ok", "applied": applied, "errors": errors}
 
 
-@app.get("/subjects")
-def list_subjects():
-    conn = get_connection()
+def load_subject_list(conn) -> list[Dict[str, Any]]:
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
     cursor.execute("SELECT subject_id, subject_name, type FROM subjects ORDER BY subject_name")
     rows = cursor.fetchall()
-    conn.close()
     return [
         {
             "subject_id": row["subject_id"],
@@ -1083,6 +1944,11 @@ def list_subjects():
     ]
 
 
+@app.get("/subjects")
+def list_subjects(request: Request):
+    return reference_response(request, "subjects", load_subject_list, ("subjects",))
+
+
 class SubjectCreateRequest(BaseModel):
     subject_name: str
     type: str = "Core"
@@ -1108,6 +1974,7 @@ def create_subject(payload: SubjectCreateRequest):
         )
         conn.commit()
         conn.close()
+        reference_cache.invalidate("subjects")
         return {"status": "ok", "subject_name": payload.subject_name.strip(), "type": payload.type}
     except psycopg2.IntegrityError:
         conn.close()
@@ -1138,6 +2005,7 @@ def update_subject(subject_name: str, payload: SubjectUpdateRequest):
         )
         conn.commit()
         conn.close()
+        reference_cache.invalidate("subjects")
         return {"status": "ok", "subject_name": payload.new_name.strip(), "type": payload.type}
     except psycopg2.IntegrityError:
         conn.close()
@@ -1162,6 +2030,7 @@ def delete_subject(subject_name: str):
         cursor.execute("DELETE FROM subjects WHERE subject_name = %s", (subject_name,))
         conn.commit()
         conn.close()
+        reference_cache.invalidate("subjects")
         return {"status": "ok", "message": f"Subject '{subject_name}' deleted successfully"}
     except Exception as exc:
         conn.close()
@@ -1171,7 +2040,7 @@ def delete_subject(subject_name: str):
 
 @app.get("/config")
 def get_config():
-    return ConfigManager.load()
+    return ConfigManager.snapshot()
 
 
 @app.put("/config")
@@ -1183,40 +2052,126 @@ def update_config(data: Dict[str, Any]):
 
 @app.get("/filters")
 def get_filters():
-    if FILTERS_FILE.exists():
-        with open(FILTERS_FILE, "r", encoding="utf-8") as handle:
-            return {"filters": json.load(handle)}
-    return {"filters": {}}
+    return {"filters": FILTERS_DOCUMENT.get() or {}}
 
 
 @app.put("/filters")
 def save_filters(payload: FiltersPayload):
-    FILTERS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(FILTERS_FILE, "w", encoding="utf-8") as handle:
-        json.dump(payload.filters, handle, indent=2)
+    FILTERS_DOCUMENT.save(payload.filters)
     return {"status": "ok"}
 
 
 @app.get("/remarks")
 def get_remarks():
-    if REMARKS_FILE.exists():
-        with open(REMARKS_FILE, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
-            return {"presets": data.get("presets", [])}
-    return {"presets": []}
+    data = REMARKS_DOCUMENT.get() or {}
+    return {"presets": data.get("presets", [])}
 
 
 @app.put("/remarks")
 def save_remarks(payload: RemarksPayload):
-    REMARKS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(REMARKS_FILE, "w", encoding="utf-8") as handle:
-        json.dump({"presets": payload.presets}, handle, indent=2)
+    REMARKS_DOCUMENT.save({"presets": payload.presets})
     return {"status": "ok"}
 
 
+class_rank_cache = ClassRankCache()
+
+# One row per student (the newest queued report, otherwise the newest saved
+# result) ranked by grand total percentage; rows without counted marks get no rank.
+CLASS_RANK_QUERY = r"""
+WITH wanted AS (
+    SELECT * FROM unnest(%s::text[], %s::text[], %s::text[]) AS w(session, class_sec, term)
+),
+candidates AS (
+    SELECT q.payload->>'session' AS session, q.payload->>'class_sec' AS class_sec,
+           q.payload->>'term' AS term, q.payload->>'gr_no' AS gr_no,
+           q.payload->'grand_totals' AS totals, 0 AS source, q.id
+    FROM report_queue q
+    JOIN wanted w ON (q.payload->>'session') = w.session
+        AND (q.payload->>'class_sec') = w.class_sec
+        AND (q.payload->>'term') = w.term
+    UNION ALL
+    SELECT r.session, r.class_sec, r.term, r.gr_no, r.payload->'grand_totals', 1, r.id
+    FROM report_results r
+    JOIN wanted w ON r.session = w.session AND r.class_sec = w.class_sec AND r.term = w.term
+),
+effective AS (
+    SELECT DISTINCT ON (session, class_sec, term, gr_no)
+        session, class_sec, term, gr_no,
+        CASE
+            WHEN trim(totals->>'pct') ~ '^[0-9]+(\.[0-9]+)?%%?$'
+                AND trim(totals->>'max') ~ '^[0-9]+(\.[0-9]+)?$'
+                AND trim(totals->>'max')::numeric > 0
+            THEN replace(trim(totals->>'pct'), '%%', '')::numeric
+        END AS pct
+    FROM candidates
+    ORDER BY session, class_sec, term, gr_no, source, id DESC
+)
+SELECT session, class_sec, term, gr_no,
+       RANK() OVER (PARTITION BY session, class_sec, term ORDER BY pct DESC) AS rank
+FROM effective
+WHERE pct IS NOT NULL
+"""
+
+
+RANKED_TABLES = ("report_queue", "report_results")
+
+
+def class_ranks(cursor, partitions, fresh: bool = False) -> Dict[tuple[str, str, str], Dict[str, int]]:
+    """
+    Return {(session, class_sec, term): {gr_no: rank}}, querying only uncached partitions (tuple cursor)
+
+    With fresh=True every partition is ranked by the database, bypassing the cache;
+    used where the ranks are printed.
+    """
+
+    def load(missing):
+        cursor.execute(
+            CLASS_RANK_QUERY,
+            (
+                [partition[0] for partition in missing],
+                [partition[1] for partition in missing],
+                [partition[2] for partition in missing],
+            ),
+        )
+        ranks: Dict[tuple[str, str, str], Dict[str, int]] = defaultdict(dict)
+        for row in cursor.fetchall():
+            ranks[(row[0], row[1], row[2])][row[3]] = int(row[4])
+        return ranks
+
+    if fresh:
+        loaded = load(list(dict.fromkeys(partitions)))
+        return {partition: loaded.get(partition, {}) for partition in partitions}
+    version = tuple(sorted(data_versions.database(RANKED_TABLES, cursor.connection).items()))
+    return class_rank_cache.get(partitions, load, version)
+
+
+def report_partition(data: Dict[str, Any]) -> tuple[str, str, str]:
+    return (str(data.get("session") or ""), str(data.get("class_sec") or ""), str(data.get("term") or ""))
+
+
+@app.get("/reports/ranks")
+def report_ranks(session: str, class_sec: str, term: str):
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        ranks = class_ranks(cursor, [(session, class_sec, term)])[(session, class_sec, term)]
+    finally:
+        conn.close()
+    return {
+        "session": session,
+        "class_sec": class_sec,
+        "term": term,
+        "items": [
+            {"gr_no": gr_no, "rank": rank}
+            for gr_no, rank in sorted(ranks.items(), key=lambda item: (item[1], item[0]))
+        ],
+    }
+
+
 @app.post("/reports/save")
 def save_report(payload: ReportRequest, overwrite: bool = False):
     data = payload.dict(by_alias=True)
+    payload_json = dumps_text(data)
     gr_no = data.get("gr_no")
     session = data.get("session")
     term = data.get("term")
@@ -1273,7 +2228,7 @@ def save_report(payload: ReportRequest, overwrite: bool = False):
                 WHERE id = %s
                 """,
                 (
-                    json.dumps(data),
+                    payload_json,
                     data.get("student_name"),
                     data.get("class_sec"),
                     session,
@@ -1285,26 +2240,475 @@ def save_report(payload: ReportRequest, overwrite: bool = False):
             if queue_row:
                 cursor.execute(
                     "UPDATE report_queue SET payload = %s WHERE id = %s",
-                    (json.dumps(data), queue_row["id"]),
+                    (payload_json, queue_row["id"]),
                 )
             else:
-                cursor.execute("INSERT INTO report_queue (payload) VALUES (%s)", (json.dumps(data),))
+                cursor.execute("INSERT INTO report_queue (payload) VALUES (%s)", (payload_json,))
         elif overwrite and queue_row:
             cursor.execute(
                 "UPDATE report_queue SET payload = %s WHERE id = %s",
-                (json.dumps(data), queue_row["id"]),
+                (payload_json, queue_row["id"]),
             )
         else:
-            cursor.execute("INSERT INTO report_queue (payload) VALUES (%s)", (json.dumps(data),))
+            cursor.execute("INSERT INTO report_queue (payload) VALUES (%s)", (payload_json,))
 
         cursor.execute("SELECT COUNT(*) AS count FROM report_queue")
         count = cursor.fetchone()["count"]
         conn.commit()
+        class_rank_cache.invalidate((session, None, term))
+        data_versions.bump("report_results", "report_queue")
         return {"status": "ok", "count": count}
     finally:
         conn.close()
 
 
+def report_key(data: Dict[str, Any]) -> tuple[str, str, str]:
+    return (str(data.get("gr_no") or ""), str(data.get("session") or ""), str(data.get("term") or ""))
+
+
+@app.post("/reports/save/bulk")
+def save_reports_bulk(payloads: list[ReportRequest], overwrite: bool = False):
+    """
+    Queue a whole class in one round trip
+
+    Conflicts with report_results and report_queue are found for every student in
+    one query, and all writes are batched (one multi-row INSERT plus at most two
+    set-based UPDATEs). Per-student outcomes mirror POST /reports/save: without
+    overwrite an existing result or queued report is reported as a conflict,
+    with overwrite it is replaced.
+    """
+    count, results = queue_report_payloads([payload.dict(by_alias=True) for payload in payloads], overwrite)
+    return {"status": "ok", "count": count, "summary": status_summary(results), "results": results}
+
+
+def status_summary(results: list[Dict[str, Any]]) -> Dict[str, int]:
+    summary: Dict[str, int] = defaultdict(int)
+    for entry in results:
+        summary[entry["status"]] += 1
+    return dict(summary)
+
+
+def queue_report_payloads(items: list[Dict[str, Any]], overwrite: bool) -> tuple[int, list[Dict[str, Any]]]:
+    """Queue report payloads in one transaction; returns (queue count, per-item outcomes)"""
+    batch_sizes.observe(len(items), "queue_reports")
+    results: list[Dict[str, Any]] = []
+    accepted: list[tuple[int, Dict[str, Any]]] = []
+    seen_keys: set[tuple[str, str, str]] = set()
+    for idx, data in enumerate(items):
+        key = report_key(data)
+        entry = {"index": idx, "gr_no": key[0], "session": key[1], "term": key[2]}
+        results.append(entry)
+        if key in seen_keys:
+            entry.update(status="error", message="Duplicate student and term in this request.")
+            continue
+        seen_keys.add(key)
+        accepted.append((idx, data))
+
+    conn = get_connection()
+    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    try:
+        existing: Dict[tuple[str, str, str], Dict[str, Any]] = {}
+        if accepted:
+            keys = [report_key(data) for _, data in accepted]
+            cursor.execute(
+                """
+                SELECT k.gr_no, k.session, k.term, r.id AS result_id, q.id AS queue_id
+                FROM unnest(%s::text[], %s::text[], %s::text[]) AS k(gr_no, session, term)
+                LEFT JOIN LATERAL (
+                    SELECT id FROM report_results
+                    WHERE gr_no = k.gr_no AND session = k.session AND term = k.term
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                ) r ON TRUE
+                LEFT JOIN LATERAL (
+                    SELECT id FROM report_queue
+                    WHERE (payload->>'gr_no') = k.gr_no AND (payload->>'session') = k.session
+                      AND (payload->>'term') = k.term
+                    ORDER BY id DESC
+                    LIMIT 1
+                ) q ON TRUE
+                """,
+                ([key[0] for key in keys], [key[1] for key in keys], [key[2] for key in keys]),
+            )
+            for row in cursor.fetchall():
+                existing[(row["gr_no"], row["session"], row["term"])] = row
+
+        queue_inserts: list[tuple[str]] = []
+        queue_updates: list[tuple[int, str]] = []
+        result_updates: list[tuple[Any, ...]] = []
+        for idx, data in accepted:
+            key = report_key(data)
+            entry = results[idx]
+            found = existing.get(key) or {}
+            history_id = found.get("result_id")
+            queue_id = found.get("queue_id")
+            if history_id and not overwrite:
+                entry.update(
+                    status="conflict",
+                    type="history",
+                    result_id=history_id,
+                    message=f"{key[2]} result for session {key[1]} already exists for this student.",
+                )
+                continue
+            if queue_id and not overwrite:
+                entry.update(
+                    status="conflict",
+                    type="queue",
+                    queue_id=queue_id,
+                    message=f"{key[2]} result for session {key[1]} is already saved in the queue.",
+                )
+                continue
+
+            payload_json = dumps_text(data)
+            if history_id:
+                result_updates.append(
+                    (
+                        history_id,
+                        payload_json,
+                        data.get("student_name"),
+                        data.get("class_sec"),
+                        key[1],
+                        key[2],
+                        key[0],
+                    )
+                )
+            if queue_id:
+                queue_updates.append((queue_id, payload_json))
+                entry.update(status="updated", queue_id=queue_id)
+            else:
+                queue_inserts.append((payload_json,))
+                entry.update(status="queued")
+            if history_id:
+                entry["result_id"] = history_id
+
+        if result_updates:
+            extras.execute_values(
+                cursor,
+                """
+                UPDATE report_results AS r
+                SET payload = v.payload::jsonb, student_name = v.student_name, class_sec = v.class_sec,
+                    session = v.session, term = v.term, gr_no = v.gr_no
+                FROM (VALUES %s) AS v(id, payload, student_name, class_sec, session, term, gr_no)
+                WHERE r.id = v.id
+                """,
+                result_updates,
+            )
+        if queue_updates:
+            extras.execute_values(
+                cursor,
+                """
+                UPDATE report_queue AS q
+                SET payload = v.payload::jsonb
+                FROM (VALUES %s) AS v(id, payload)
+                WHERE q.id = v.id
+                """,
+                queue_updates,
+            )
+        if queue_inserts:
+            extras.execute_values(
+                cursor,
+                "INSERT INTO report_queue (payload) VALUES %s",
+                queue_inserts,
+                page_size=max(len(queue_inserts), 1),
+            )
+
+        cursor.execute("SELECT COUNT(*) AS count FROM report_queue")
+        count = cursor.fetchone()["count"]
+        conn.commit()
+    finally:
+        conn.close()
+    if seen_keys:
+        class_rank_cache.invalidate(*{(key[1], None, key[2]) for key in seen_keys})
+        data_versions.bump("report_results", "report_queue")
+    return count, results
+
+
+def result_engine() -> ResultEngine:
+    return ResultEngine.from_config(ConfigManager.snapshot(), default_days=class_catalog().default_days)
+
+
+def apply_class_ranks(records: list[Dict[str, Any]]):
+    """Fill rank per (session, class_sec, term) from the grand total percentages"""
+    groups = [(record.get("session"), record.get("class_sec"), record.get("term")) for record in records]
+    ranks = rank_percentages([payload_percentage(record) for record in records], groups)
+    for record, rank in zip(records, ranks):
+        record["rank"] = str(rank) if rank is not None else "N/A"
+
+
+@app.post("/reports/compute")
+def compute_reports(payloads: list[ReportRequest], rank: bool = True):
+    """
+    Compute marks, totals, grades (and optionally ranks) for payloads without saving them
+
+    Payloads listed in `errors` (non-numeric marks) are returned unchanged and left out of the ranking.
+    """
+    batch_sizes.observe(len(payloads), "compute")
+    records, warnings, errors = result_engine().compute([payload.dict(by_alias=True) for payload in payloads])
+    if rank:
+        apply_class_ranks([record for record, messages in zip(records, errors) if not messages])
+    return {"items": records, "warnings": warnings, "errors": errors}
+
+
+class RecomputeRequest(BaseModel):
+    session: str
+    class_sec: str
+    term: str
+    include_queue: bool = True
+    rank: bool = True
+    dry_run: bool = False
+
+
+@app.post("/reports/recompute")
+def recompute_reports(payload: RecomputeRequest, request: Request):
+    """
+    Re-apply the current grading config to every stored result of one class and term
+
+    Ranks are computed over one row per student: the pending queue entry when there
+    is one, otherwise the latest saved result. All rows are written back with two
+    set-based UPDATEs. Rows with non-numeric marks are skipped: neither ranked nor
+    written, and listed under errors.
+    """
+    require_admin(request)
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT DISTINCT ON (gr_no) 'results', id, gr_no, payload
+            FROM report_results
+            WHERE session = %s AND class_sec = %s AND term = %s
+            ORDER BY gr_no, created_at DESC, id DESC
+            """,
+            (payload.session, payload.class_sec, payload.term),
+        )
+        rows = cursor.fetchall()
+        if payload.include_queue:
+            cursor.execute(
+                """
+                SELECT 'queue', id, payload->>'gr_no', payload
+                FROM report_queue
+                WHERE (payload->>'session') = %s AND (payload->>'class_sec') = %s AND (payload->>'term') = %s
+                ORDER BY id
+                """,
+                (payload.session, payload.class_sec, payload.term),
+            )
+            rows.extend(cursor.fetchall())
+        if not rows:
+            raise HTTPException(status_code=404, detail="No results found for the selected class and term.")
+
+        records, warnings, errors = result_engine().compute([row[3] for row in rows])
+        batch_sizes.observe(len(records), "recompute")
+        valid = [idx for idx, messages in enumerate(errors) if not messages]
+        if payload.rank:
+            # The queue entry supersedes the saved result of the same student
+            effective: Dict[str, int] = {}
+            for idx in valid:
+                row = rows[idx]
+                if row[0] == "queue" or row[2] not in effective:
+                    effective[row[2]] = idx
+            apply_class_ranks([records[idx] for idx in effective.values()])
+            for idx in valid:
+                records[idx]["rank"] = records[effective[rows[idx][2]]]["rank"]
+
+        changed = [
+            (rows[idx][0], rows[idx][1], records[idx])
+            for idx in valid
+            if records[idx] != rows[idx][3]
+        ]
+        if not payload.dry_run:
+            result_updates = [(row_id, dumps_text(record)) for table, row_id, record in changed if table == "results"]
+            queue_updates = [(row_id, dumps_text(record)) for table, row_id, record in changed if table == "queue"]
+            if result_updates:
+                extras.execute_values(
+                    cursor,
+                    """
+                    UPDATE report_results AS r SET payload = v.payload::jsonb
+                    FROM (VALUES %s) AS v(id, payload)
+                    WHERE r.id = v.id
+                    """,
+                    result_updates,
+                )
+            if queue_updates:
+                extras.execute_values(
+                    cursor,
+                    """
+                    UPDATE report_queue AS q SET payload = v.payload::jsonb
+                    FROM (VALUES %s) AS v(id, payload)
+                    WHERE q.id = v.id
+                    """,
+                    queue_updates,
+                )
+            conn.commit()
+            class_rank_cache.invalidate((payload.session, payload.class_sec, payload.term))
+            data_versions.bump("report_results", "report_queue")
+    finally:
+        conn.close()
+
+    return {
+        "status": "ok",
+        "dry_run": payload.dry_run,
+        "total": len(rows),
+        "changed": len(changed),
+        "skipped": len(rows) - len(valid),
+        "warnings": [
+            {"gr_no": row[2], "source": row[0], "id": row[1], "messages": messages}
+            for row, messages in zip(rows, warnings)
+            if messages
+        ],
+        "errors": [
+            {"gr_no": row[2], "source": row[0], "id": row[1], "messages": messages}
+            for row, messages in zip(rows, errors)
+            if messages
+        ],
+    }
+
+
+# First option of each selector on the Reports page
+REPORT_FIELD_DEFAULTS = {
+    "rank": "N/A",
+    "conduct": "Excellent",
+    "performance": "Excellent",
+    "progress": "Satisfactory",
+    "status": "Passed",
+    "remarks": "",
+}
+
+
+@app.post("/reports/import-marks")
+async def import_marks_sheet(
+    session: str,
+    term: str,
+    file: UploadFile = File(...),
+    class_sec: Optional[str] = None,
+    date: Optional[str] = None,
+    overwrite: bool = False,
+    dry_run: bool = False,
+):
+    """
+    Queue a class from a marks sheet: one row per G.R No and "<Subject> CW",
+    "<Subject> TE" (and optional "<Subject> Max") columns, as in the tabulation export
+    """
+    ensure_roster_file(file)
+
+    content = await file.read()
+    options = {
+        "session": session,
+        "term": term,
+        "class_sec": (class_sec or "").strip() or None,
+        "date": date or datetime.now().strftime("%d %B %Y"),
+        "overwrite": overwrite,
+        "dry_run": dry_run,
+    }
+    return await run_import_job(build_marks_import, content, file.filename, options)
+
+
+def build_marks_import(content: bytes, filename: str, options: Dict[str, Any]):
+    config = ConfigManager.snapshot()
+    try:
+        sheet = MarksSheet(read_roster_frame(content, filename, columns=None), config.get("default_max_marks", 100))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    conn = get_connection()
+    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    try:
+        cursor.execute(
+            """
+            SELECT gr_no, student_name, father_name, current_class_sec, current_session
+            FROM students
+            WHERE gr_no = ANY(%s)
+            """,
+            (list({gr_no for gr_no in sheet.gr_nos if gr_no}),),
+        )
+        students = {row["gr_no"]: row for row in cursor.fetchall()}
+    finally:
+        conn.close()
+
+    rows: list[Dict[str, Any]] = []
+    drafts: list[Dict[str, Any]] = []
+    seen: set[str] = set()
+    for idx, gr_no in enumerate(sheet.gr_nos):
+        entry: Dict[str, Any] = {"row": idx + 2, "gr_no": gr_no}
+        rows.append(entry)
+        student = students.get(gr_no)
+        if not gr_no:
+            errors = ["Missing G.R No"]
+        elif gr_no in seen:
+            errors = ["G.R No appears more than once in the sheet"]
+        elif student is None:
+            errors = ["Student not found"]
+        else:
+            errors = sheet.row_errors(idx)
+        seen.add(gr_no)
+        if errors:
+            entry.update(status="error", message="; ".join(errors))
+            continue
+        draft = {
+            "student_name": sheet.field("student_name", idx) or student["student_name"] or "",
+            "father_name": student["father_name"] or "",
+            "class_sec": options["class_sec"] or sheet.field("class_sec", idx) or student["current_class_sec"] or "",
+            "session": options["session"],
+            "gr_no": gr_no,
+            "total_days": sheet.field("total_days", idx) or "",
+            "days_attended": sheet.field("days_attended", idx) or "0",
+            "days_absent": "0",
+            "term": options["term"],
+            "marks_data": sheet.marks_data(idx),
+            "date": options["date"],
+            "grand_totals": {},
+        }
+        for field, default in REPORT_FIELD_DEFAULTS.items():
+            draft[field] = sheet.field(field, idx) or default
+        entry["draft"] = len(drafts)
+        drafts.append(draft)
+
+    records, warnings, errors = result_engine().compute(drafts)
+    if "rank" not in sheet.fields:
+        apply_class_ranks([record for record, messages in zip(records, errors) if not messages])
+
+    valid: list[Dict[str, Any]] = []
+    valid_rows: list[Dict[str, Any]] = []
+    for entry in rows:
+        draft_idx = entry.pop("draft", None)
+        if draft_idx is None:
+            continue
+        record = records[draft_idx]
+        if errors[draft_idx]:
+            entry.update(status="error", message="; ".join(errors[draft_idx]))
+            continue
+        try:
+            # Blank total days are filled from the class defaults; classes without one need the column
+            if not str(record["total_days"]).strip() and int(float(record["days_attended"])) > 0:
+                raise ValueError("Total days required")
+            if int(float(record["days_attended"])) > int(float(record["total_days"] or 0)):
+                raise ValueError("Days attended exceed total days")
+            valid.append(ReportRequest(**record).dict(by_alias=True))
+        except (ValueError, ValidationError) as exc:
+            entry.update(status="error", message=str(exc))
+            continue
+        if warnings[draft_idx]:
+            entry["warnings"] = warnings[draft_idx]
+        valid_rows.append(entry)
+
+    count = None
+    if options["dry_run"]:
+        for entry, record in zip(valid_rows, valid):
+            entry.update(status="valid", payload=record)
+    elif valid:
+        count, outcomes = queue_report_payloads(valid, options["overwrite"])
+        for entry, outcome in zip(valid_rows, outcomes):
+            entry.update({key: value for key, value in outcome.items() if key not in ("index", "gr_no")})
+
+    return {
+        "status": "ok",
+        "dry_run": options["dry_run"],
+        "count": count,
+        "subjects": sheet.subjects,
+        "summary": status_summary(rows),
+        "results": rows,
+    }
+
+
 @app.get("/reports/queue")
 def report_queue():
     conn = get_connection()
@@ -1316,13 +2720,18 @@ def report_queue():
 
 
 @app.get("/reports/queue/items")
-def report_queue_items():
+def report_queue_items(request: Request):
     conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-    cursor.execute("SELECT id, payload FROM report_queue ORDER BY id")
-    rows = cursor.fetchall()
-    conn.close()
-    return {"items": [row_to_dict(row) for row in rows]}
+
+    def build():
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, payload::text FROM report_queue ORDER BY id")
+        return raw_items_response(cursor.fetchall(), ("id", "payload"), raw=("payload",))
+
+    try:
+        return response_layer.conditional(request, "reports.queue_items", ("report_queue",), conn, build)
+    finally:
+        conn.close()
 
 
 @app.delete("/reports/queue")
@@ -1332,6 +2741,8 @@ def clear_report_queue():
     try:
         cursor.execute("DELETE FROM report_queue")
         conn.commit()
+        class_rank_cache.invalidate()
+        data_versions.bump("report_queue")
         return {"status": "ok", "count": 0}
     finally:
         conn.close()
@@ -1343,24 +2754,49 @@ def update_report_queue(queue_id: int, payload: ReportRequest):
     conn = get_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute("UPDATE report_queue SET payload = %s WHERE id = %s", (json.dumps(data), queue_id))
-        if cursor.rowcount == 0:
+        cursor.execute(
+            """
+            UPDATE report_queue AS q SET payload = %s
+            FROM report_queue AS old
+            WHERE q.id = old.id AND q.id = %s
+            RETURNING old.payload->>'session', old.payload->>'class_sec', old.payload->>'term'
+            """,
+            (dumps_text(data), queue_id),
+        )
+        previous = cursor.fetchone()
+        if previous is None:
             raise HTTPException(status_code=404, detail="Queued report not found")
         cursor.execute("SELECT COUNT(*) AS count FROM report_queue")
         count = cursor.fetchone()[0]
         conn.commit()
+        class_rank_cache.invalidate(tuple(previous), report_partition(data))
+        data_versions.bump("report_queue")
         return {"status": "ok", "count": count}
     finally:
         conn.close()
 
 
+def pdf_export_response(response: Response, message: str, pdf_path: str, profile: RenderProfile) -> Dict[str, Any]:
+    """Body of every PDF endpoint; the render breakdown goes in "profile" and the Server-Timing header"""
+    pdf_file = Path(pdf_path)
+    response.headers["Server-Timing"] = profile.server_timing()
+    return {
+        "message": message,
+        "file": pdf_file.name,
+        "download_url": f"/reports/files/{pdf_file.name}",
+        "profile": profile.summary(),
+    }
+
+
 @app.get("/reports/queue/{queue_id}/pdf")
-def report_queue_pdf(queue_id: int):
+def report_queue_pdf(queue_id: int, response: Response):
+    profile = RenderProfile()
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
     try:
-        cursor.execute("SELECT payload FROM report_queue WHERE id = %s", (queue_id,))
-        row = cursor.fetchone()
+        with profile.stage("db"):
+            cursor.execute("SELECT payload FROM report_queue WHERE id = %s", (queue_id,))
+            row = cursor.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Queued report not found")
         payload = row["payload"]
@@ -1371,81 +2807,189 @@ def report_queue_pdf(queue_id: int):
             filename,
             payload,
             template_name="report_card.html",
+            profile=profile,
         )
         if not success:
             raise HTTPException(status_code=500, detail=message)
-        pdf_file = Path(pdf_path)
-        return {
-            "message": message,
-            "file": pdf_file.name,
-            "download_url": f"/reports/files/{pdf_file.name}",
-        }
+        return pdf_export_response(response, message, pdf_path, profile)
     finally:
         conn.close()
 
 
-@app.get("/reports/history/{gr_no}")
-def report_history(gr_no: str):
+HISTORY_COLUMNS = "id, gr_no, student_name, class_sec, session, term, report_date AS date, created_at"
+HISTORY_PAGE_LIMIT = 2000
+
+
+def history_position(cursor_value: str, keys: tuple[str, ...]) -> Dict[str, Any]:
+    position = decode_sync_cursor(cursor_value)
+    if not all(key in position for key in keys):
+        raise HTTPException(status_code=400, detail="Invalid history cursor")
+    return {key: position[key] for key in keys}
+
+
+def history_page(rows: list[Dict[str, Any]], limit: int, position) -> Dict[str, Any]:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [dict(row) for row in rows],
+        "cursor": encode_sync_cursor(position(rows[-1])) if has_more else None,
+        "has_more": has_more,
+    }
+
+
+@app.get("/reports/history/summary")
+def report_history_summary(request: Request, session: Optional[str] = None):
+    """Result counts per session, class and term for the Results tree; no payloads are read"""
     conn = get_connection()
+    try:
+        return response_layer.conditional(
+            request,
+            "reports.history_summary",
+            ("report_results",),
+            conn,
+            lambda: build_history_summary(conn, session),
+        )
+    finally:
+        conn.close()
+
+
+def build_history_summary(conn, session: Optional[str]) -> Dict[str, Any]:
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
     cursor.execute(
-        """
-        SELECT id, gr_no, student_name, class_sec, session, term, created_at, payload
+        f"""
+        SELECT session, class_sec, term, COUNT(*) AS count,
+               COUNT(DISTINCT gr_no) AS students, MAX(created_at) AS latest_created_at
         FROM report_results
-        WHERE gr_no = %s
-        ORDER BY created_at DESC
+        {"WHERE session = %s" if session else ""}
+        GROUP BY session, class_sec, term
         """,
-        (gr_no,),
+        (session,) if session else None,
     )
-    rows = cursor.fetchall()
-    conn.close()
-    items = []
-    for row in rows:
-        payload = row.get("payload") or {}
-        items.append(
-            {
-                "id": row["id"],
-                "gr_no": row.get("gr_no"),
-                "student_name": row.get("student_name"),
-                "class_sec": row.get("class_sec"),
-                "session": row.get("session"),
-                "term": row.get("term"),
-                "date": payload.get("date"),
-                "created_at": row.get("created_at"),
-            }
+    rows = [dict(row) for row in cursor.fetchall()]
+    catalog = class_catalog()
+    rows.sort(key=lambda row: (catalog.sort_key(row["class_sec"]), row["term"] or ""))
+    rows.sort(key=lambda row: row["session"] or "", reverse=True)
+    return {"items": rows}
+
+
+@app.get("/reports/history/{gr_no}")
+def report_history(request: Request, gr_no: str, limit: int = 200, cursor: Optional[str] = None):
+    conn = get_connection()
+    try:
+        return response_layer.conditional(
+            request,
+            "reports.history_student",
+            ("report_results",),
+            conn,
+            lambda: build_student_history(conn, gr_no, limit, cursor),
         )
-    return {"items": items}
+    finally:
+        conn.close()
+
+
+def build_student_history(conn, gr_no: str, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+    limit = max(1, min(limit, HISTORY_PAGE_LIMIT))
+    position = history_position(cursor, ("at", "id")) if cursor else None
+    db_cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    db_cursor.execute(
+        f"""
+        SELECT {HISTORY_COLUMNS}
+        FROM report_results
+        WHERE gr_no = %(gr_no)s
+          {"AND (created_at, id) < (%(at)s::timestamptz, %(id)s)" if position else ""}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %(limit)s
+        """,
+        {"gr_no": gr_no, "limit": limit + 1, **(position or {})},
+    )
+    rows = db_cursor.fetchall()
+    return history_page(rows, limit, lambda row: {"at": row["created_at"].isoformat(), "id": row["id"]})
 
 
 @app.get("/reports/history")
-def report_history_all():
+def report_history_all(
+    request: Request,
+    session: Optional[str] = None,
+    class_sec: Optional[str] = None,
+    term: Optional[str] = None,
+    limit: int = 500,
+    cursor: Optional[str] = None,
+):
+    """
+    Saved results without their payloads, in Results tree order, one keyset page at a time
+
+    Pass the returned cursor back to continue; it is None on the last page. An
+    empty session, class_sec or term (`?class_sec=`) selects results where that
+    column is NULL or empty, the "Unknown" groups of the summary; an omitted one
+    does not filter.
+    """
     conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-    cursor.execute(
-        """
-        SELECT id, gr_no, student_name, class_sec, session, term, created_at, payload
+    try:
+        return response_layer.conditional(
+            request,
+            "reports.history",
+            ("report_results",),
+            conn,
+            lambda: build_history_page(conn, session, class_sec, term, limit, cursor),
+        )
+    finally:
+        conn.close()
+
+
+def build_history_page(
+    conn,
+    session: Optional[str],
+    class_sec: Optional[str],
+    term: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+) -> Dict[str, Any]:
+    limit = max(1, min(limit, HISTORY_PAGE_LIMIT))
+    clauses = []
+    params: Dict[str, Any] = {"limit": limit + 1}
+    for column, value in (("session", session), ("class_sec", class_sec), ("term", term)):
+        if value:
+            clauses.append(f"{column} = %({column})s")
+            params[column] = value
+        elif value is not None:
+            clauses.append(f"COALESCE({column}, '') = ''")
+    if cursor:
+        position = history_position(cursor, ("s", "c", "t", "at", "id"))
+        clauses.append(
+            """
+            (COALESCE(session, '') < %(s)s
+             OR (COALESCE(session, '') = %(s)s AND (COALESCE(class_sec, '') > %(c)s
+                 OR (COALESCE(class_sec, '') = %(c)s AND (COALESCE(term, '') > %(t)s
+                     OR (COALESCE(term, '') = %(t)s AND (created_at, id) < (%(at)s::timestamptz, %(id)s)))))))
+            """
+        )
+        params.update(position)
+    where_clause = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    db_cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    db_cursor.execute(
+        f"""
+        SELECT {HISTORY_COLUMNS}
         FROM report_results
-        ORDER BY session DESC, class_sec ASC, term ASC, created_at DESC
-        """
+        {where_clause}
+        ORDER BY COALESCE(session, '') DESC, COALESCE(class_sec, '') ASC, COALESCE(term, '') ASC,
+                 created_at DESC, id DESC
+        LIMIT %(limit)s
+        """,
+        params,
+    )
+    rows = db_cursor.fetchall()
+    return history_page(
+        rows,
+        limit,
+        lambda row: {
+            "s": row["session"] or "",
+            "c": row["class_sec"] or "",
+            "t": row["term"] or "",
+            "at": row["created_at"].isoformat(),
+            "id": row["id"],
+        },
     )
-    rows = cursor.fetchall()
-    conn.close()
-    items = []
-    for row in rows:
-        payload = row.get("payload") or {}
-        items.append(
-            {
-                "id": row["id"],
-                "gr_no": row.get("gr_no"),
-                "student_name": row.get("student_name"),
-                "class_sec": row.get("class_sec"),
-                "session": row.get("session"),
-                "term": row.get("term"),
-                "date": payload.get("date"),
-                "created_at": row.get("created_at"),
-            }
-        )
-    return {"items": items}
 
 
 @app.get("/admin/users")
@@ -1689,11 +3233,32 @@ def change_own_password(payload: PasswordChangePayload, request: Request):
 
 @app.get("/reports/analytics")
 def report_analytics(
+    request: Request,
     session: Optional[str] = None,
     class_sec: Optional[str] = None,
     term: Optional[str] = None,
     search: Optional[str] = None,
 ):
+    conn = get_connection()
+    try:
+        return response_layer.conditional(
+            request,
+            "reports.analytics",
+            ("report_results",),
+            conn,
+            lambda: build_report_analytics(conn, session, class_sec, term, search),
+        )
+    finally:
+        conn.close()
+
+
+def build_report_analytics(
+    conn,
+    session: Optional[str],
+    class_sec: Optional[str],
+    term: Optional[str],
+    search: Optional[str],
+) -> Dict[str, Any]:
     def parse_pct(value: Any) -> float:
         if value is None:
             return 0.0
@@ -1705,11 +3270,12 @@ def report_analytics(
         except ValueError:
             return 0.0
 
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    cursor = conn.cursor()
 
+    # Only the totals and per-subject marks are read from the payload
     query = """
-        SELECT id, gr_no, student_name, class_sec, session, term, created_at, payload
+        SELECT id, gr_no, student_name, class_sec, session, term, created_at,
+               payload->'grand_totals'->>'pct', payload->'grand_totals'->>'grade', payload->'marks_data'
         FROM report_results
     """
     clauses = []
@@ -1734,7 +3300,6 @@ def report_analytics(
     query += " ORDER BY created_at DESC"
     cursor.execute(query, params)
     rows = cursor.fetchall()
-    conn.close()
 
     grade_counts: dict[str, int] = defaultdict(int)
     session_agg: dict[str, dict[str, float]] = defaultdict(lambda: {"count": 0, "sum_pct": 0.0})
@@ -1750,19 +3315,17 @@ def report_analytics(
     total_count = 0
     recent = []
 
-    for row in rows:
-        payload = row.get("payload") or {}
-        totals = payload.get("grand_totals") or {}
-        pct = parse_pct(totals.get("pct"))
-        grade = totals.get("grade") or "N/A"
+    for result_id, gr_no, student_name, class_value, session_value, term_value, created_at, raw_pct, grade, marks_data in rows:
+        pct = parse_pct(raw_pct)
+        grade = grade or "N/A"
 
         total_pct += pct
         total_count += 1
         grade_counts[grade] += 1
 
-        session_key = row.get("session") or "Unknown"
-        class_key = row.get("class_sec") or "Unknown"
-        term_key = row.get("term") or "Unknown"
+        session_key = session_value or "Unknown"
+        class_key = class_value or "Unknown"
+        term_key = term_value or "Unknown"
         timeline_key = f"{session_key} | {term_key}"
 
         session_agg[session_key]["count"] += 1
@@ -1778,7 +3341,6 @@ def report_analytics(
         available_classes.add(class_key)
         available_terms.add(term_key)
 
-        marks_data = payload.get("marks_data") or {}
         if isinstance(marks_data, dict):
             for subject, data in marks_data.items():
                 subject_pct = parse_pct((data or {}).get("pct"))
@@ -1787,15 +3349,15 @@ def report_analytics(
 
         recent.append(
             {
-                "id": row.get("id"),
-                "gr_no": row.get("gr_no"),
-                "student_name": row.get("student_name"),
-                "class_sec": row.get("class_sec"),
-                "session": row.get("session"),
-                "term": row.get("term"),
+                "id": result_id,
+                "gr_no": gr_no,
+                "student_name": student_name,
+                "class_sec": class_value,
+                "session": session_value,
+                "term": term_value,
                 "pct": round(pct, 1),
                 "grade": grade,
-                "created_at": row.get("created_at"),
+                "created_at": created_at,
             }
         )
 
@@ -1844,23 +3406,26 @@ def report_analytics(
 
 
 @app.get("/reports/history-term")
-def report_history_batch(session: str, class_sec: str, term: str):
+def report_history_batch(session: str, class_sec: str, term: str, response: Response):
+    profile = RenderProfile()
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
     try:
-        cursor.execute(
-            """
-            SELECT payload FROM report_results
-            WHERE session = %s AND class_sec = %s AND term = %s
-            ORDER BY created_at DESC
-            """,
-            (session, class_sec, term),
-        )
-        rows = cursor.fetchall()
+        with profile.stage("db"):
+            cursor.execute(
+                """
+                SELECT payload FROM report_results
+                WHERE session = %s AND class_sec = %s AND term = %s
+                ORDER BY created_at DESC
+                """,
+                (session, class_sec, term),
+            )
+            rows = cursor.fetchall()
         if not rows:
             raise HTTPException(status_code=404, detail="No results found for the selected term.")
 
         records = [row["payload"] for row in rows]
+        batch_sizes.observe(len(records), "history_batch")
         safe_session = session.replace(" ", "_")
         safe_class = class_sec.replace(" ", "_")
         safe_term = term.replace(" ", "_")
@@ -1869,27 +3434,92 @@ def report_history_batch(session: str, class_sec: str, term: str):
             filename,
             {"records": records},
             template_name="report_batch.html",
+            profile=profile,
         )
         if not success:
             raise HTTPException(status_code=500, detail=message)
 
-        pdf_file = Path(pdf_path)
-        return {
-            "message": message,
-            "file": pdf_file.name,
-            "download_url": f"/reports/files/{pdf_file.name}",
-        }
+        return pdf_export_response(response, message, pdf_path, profile)
+    finally:
+        conn.close()
+
+
+@app.get("/reports/tabulation")
+def report_tabulation(
+    session: str,
+    class_sec: Optional[str] = None,
+    term: Optional[str] = None,
+    format: str = "xlsx",
+):
+    export_format = format.lower()
+    if export_format not in {"xlsx", "csv"}:
+        raise HTTPException(status_code=400, detail="Export format must be 'xlsx' or 'csv'")
+
+    clauses = ["session = %s"]
+    params: list[Any] = [session]
+    if class_sec:
+        clauses.append("class_sec = %s")
+        params.append(class_sec)
+    if term:
+        clauses.append("term = %s")
+        params.append(term)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        # Only the latest saved result per student and term counts towards the sheet
+        cursor.execute(
+            f"""
+            SELECT DISTINCT ON (gr_no, session, term)
+                   id, session, class_sec, term, gr_no, student_name, payload->'marks_data'
+            FROM report_results
+            WHERE {" AND ".join(clauses)}
+            ORDER BY gr_no, session, term, created_at DESC
+            """,
+            params,
+        )
+        rows = cursor.fetchall()
     finally:
         conn.close()
 
+    if not rows:
+        raise HTTPException(status_code=404, detail="No results found for the selected filters.")
+
+    sheet = build_tabulation(
+        rows,
+        class_sort_key=class_catalog().sort_key,
+        boundaries=boundaries_from_config(ConfigManager.snapshot()),
+    )
+    parts = [session, class_sec or "All_Classes", term or "All_Terms"]
+    stem = "Tabulation_" + "_".join(part.replace(" ", "_").replace("/", "-") for part in parts)
+
+    if export_format == "csv":
+        filename = f"{stem}.csv"
+        return Response(
+            content=sheet.to_csv(index=False),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    output_dir = PDFManager.ensure_output_dir()
+    filename = f"{stem}.xlsx"
+    write_tabulation_xlsx(sheet, output_dir / filename)
+    return {
+        "message": "Tabulation exported",
+        "file": filename,
+        "count": len(sheet),
+    }
+
 
 @app.get("/reports/history/{result_id}/pdf")
-def report_history_pdf(result_id: int):
+def report_history_pdf(result_id: int, response: Response):
+    profile = RenderProfile()
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
     try:
-        cursor.execute("SELECT payload FROM report_results WHERE id = %s", (result_id,))
-        row = cursor.fetchone()
+        with profile.stage("db"):
+            cursor.execute("SELECT payload FROM report_results WHERE id = %s", (result_id,))
+            row = cursor.fetchone()
         if not row:
             raise HTTPException(status_code=404, detail="Result not found")
         payload = row["payload"]
@@ -1900,15 +3530,11 @@ def report_history_pdf(result_id: int):
             filename,
             payload,
             template_name="report_card.html",
+            profile=profile,
         )
         if not success:
             raise HTTPException(status_code=500, detail=message)
-        pdf_file = Path(pdf_path)
-        return {
-            "message": message,
-            "file": pdf_file.name,
-            "download_url": f"/reports/files/{pdf_file.name}",
-        }
+        return pdf_export_response(response, message, pdf_path, profile)
     finally:
         conn.close()
 
@@ -1920,27 +3546,45 @@ def clear_report_results():
     try:
         cursor.execute("DELETE FROM report_results")
         conn.commit()
+        class_rank_cache.invalidate()
+        data_versions.bump("report_results")
         return {"status": "ok", "count": 0}
     finally:
         conn.close()
 
 
 @app.post("/reports/export")
-def export_saved_reports():
+def export_saved_reports(response: Response, auto_rank: bool = True):
+    profile = RenderProfile()
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
     try:
-        cursor.execute("SELECT id, payload FROM report_queue ORDER BY id")
-        rows = cursor.fetchall()
+        with profile.stage("db"):
+            cursor.execute("SELECT id, payload FROM report_queue ORDER BY id")
+            rows = cursor.fetchall()
         if not rows:
             raise HTTPException(status_code=400, detail="No saved reports available for export.")
 
-        records = [row["payload"] for row in rows]
+        catalog = class_catalog()
+        records = sorted(
+            (row["payload"] for row in rows),
+            key=lambda record: catalog.sort_key(record.get("class_sec")),
+        )
+        batch_sizes.observe(len(records), "report_export")
+        partitions = {report_partition(record) for record in records}
+        if auto_rank:
+            with profile.stage("ranks"):
+                ranks = class_ranks(conn.cursor(), partitions, fresh=True)
+            for record in records:
+                rank = ranks[report_partition(record)].get(str(record.get("gr_no") or ""))
+                if rank is not None:
+                    record["rank"] = str(rank)
         filename = f"Faizan_Report_Batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         success, message, pdf_path = PDFManager.generate_pdf(
             filename,
             {"records": records},
             template_name="report_batch.html",
+            profile=profile,
         )
         if not success:
             logging.error("Report batch export failed: %s", message)
@@ -1953,27 +3597,25 @@ def export_saved_reports():
                 record.get("class_sec"),
                 record.get("session"),
                 record.get("term"),
-                json.dumps(record),
+                dumps_text(record),
             )
             for record in records
         ]
-        cursor.executemany(
-            """
-            INSERT INTO report_results (gr_no, student_name, class_sec, session, term, payload)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """,
-            insert_rows,
-        )
+        with profile.stage("save"):
+            cursor.executemany(
+                """
+                INSERT INTO report_results (gr_no, student_name, class_sec, session, term, payload)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                insert_rows,
+            )
 
-        cursor.execute("DELETE FROM report_queue")
-        conn.commit()
+            cursor.execute("DELETE FROM report_queue")
+            conn.commit()
+        class_rank_cache.invalidate(*partitions)
+        data_versions.bump("report_results", "report_queue")
 
-        pdf_file = Path(pdf_path)
-        return {
-            "message": message,
-            "file": pdf_file.name,
-            "download_url": f"/reports/files/{pdf_file.name}",
-        }
+        return pdf_export_response(response, message, pdf_path, profile)
     except HTTPException:
         raise
     except Exception as exc:
@@ -1989,15 +3631,161 @@ def save_diagnostics(payload: DiagnosticsRequest):
     conn = get_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute("INSERT INTO diagnostics_queue (payload) VALUES (%s)", (json.dumps(data),))
+        cursor.execute("INSERT INTO diagnostics_queue (payload) VALUES (%s)", (dumps_text(data),))
         cursor.execute("SELECT COUNT(*) AS count FROM diagnostics_queue")
         count = cursor.fetchone()[0]
         conn.commit()
+        data_versions.bump("diagnostics_queue")
         return {"status": "ok", "count": count}
     finally:
         conn.close()
 
 
+def diagnostics_schema() -> DiagnosticsSchema:
+    return DiagnosticsSchema.from_config(ConfigManager.snapshot())
+
+
+@app.get("/diagnostics/schema")
+def get_diagnostics_schema():
+    return diagnostics_schema().describe()
+
+
+DIAGNOSTICS_GRID_FIELDS = ("total_days", "days_attended", "attendance_dates", "rank", "overall_remark", "comment")
+
+
+@app.post("/diagnostics/bulk")
+async def import_diagnostics_grid(
+    file: UploadFile = File(...),
+    term: str = "Diagnostics",
+    class_sec: Optional[str] = None,
+    total_days: Optional[str] = None,
+    attendance_dates: Optional[str] = None,
+    dry_run: bool = False,
+):
+    """
+    Queue diagnostics for a class from a ratings grid: one row per G.R No, one
+    column per section and label ("ENGLISH: Reading"), plus optional attendance columns
+    """
+    ensure_roster_file(file)
+
+    content = await file.read()
+    options = {
+        "term": term,
+        "class_sec": (class_sec or "").strip() or None,
+        "total_days": (total_days or "").strip(),
+        "attendance_dates": (attendance_dates or "").strip(),
+        "dry_run": dry_run,
+    }
+    return await run_import_job(build_diagnostics_import, content, file.filename, options)
+
+
+def build_diagnostics_import(content: bytes, filename: str, options: Dict[str, Any]):
+    schema = diagnostics_schema()
+    df = read_roster_frame(content, filename, columns=None)
+    df.columns = [str(column).strip() for column in df.columns]
+    if "gr_no" not in df.columns:
+        raise HTTPException(status_code=400, detail="Missing column: gr_no")
+    mapping, missing = schema.resolve_columns(df.columns)
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing rating columns: {', '.join(missing)}")
+
+    def text_column(column: str) -> list[str]:
+        if column not in df.columns:
+            return [""] * len(df)
+        series = df[column].astype(object).where(df[column].notna(), "")
+        return series.astype(str).str.strip().str.replace(r"^(\d+)\.0+$", r"\1", regex=True).tolist()
+
+    gr_nos = text_column("gr_no")
+    batch_sizes.observe(len(gr_nos), "diagnostics_import")
+    fields = {field: text_column(field) for field in DIAGNOSTICS_GRID_FIELDS}
+    # Each rating column is normalized once; cells that are blank or off-scale become None
+    ratings = {cell: schema.normalize_ratings(df[column]).tolist() for cell, column in mapping.items()}
+    raw_ratings = {cell: text_column(column) for cell, column in mapping.items()}
+
+    conn = get_connection()
+    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
+    try:
+        cursor.execute(
+            "SELECT gr_no, student_name, father_name, current_class_sec FROM students WHERE gr_no = ANY(%s)",
+            (list({gr_no for gr_no in gr_nos if gr_no}),),
+        )
+        students = {row["gr_no"]: row for row in cursor.fetchall()}
+
+        results: list[Dict[str, Any]] = []
+        accepted: list[Dict[str, Any]] = []
+        seen: set[str] = set()
+        for idx, gr_no in enumerate(gr_nos):
+            entry: Dict[str, Any] = {"row": idx + 2, "gr_no": gr_no}
+            results.append(entry)
+            student = students.get(gr_no)
+            errors: list[str] = []
+            if not gr_no:
+                errors.append("Missing G.R No")
+            elif gr_no in seen:
+                errors.append("G.R No appears more than once in the grid")
+            elif student is None:
+                errors.append("Student not found")
+            seen.add(gr_no)
+            for cell, values in ratings.items():
+                if values[idx] is None:
+                    shown = raw_ratings[cell][idx]
+                    errors.append(f"{cell[0]}: {cell[1]} " + (f"has an unknown rating '{shown}'" if shown else "is blank"))
+
+            total = fields["total_days"][idx] or options["total_days"]
+            attended = fields["days_attended"][idx]
+            try:
+                days_absent = max(int(float(total or 0)) - int(float(attended or 0)), 0)
+            except ValueError:
+                errors.append("Attendance must be a number of days")
+                days_absent = 0
+            if errors:
+                entry.update(status="error", message="; ".join(errors))
+                continue
+
+            payload = DiagnosticsRequest(
+                student_name=student["student_name"] or "",
+                father_name=student["father_name"] or "",
+                class_sec=options["class_sec"] or student["current_class_sec"] or "",
+                gr_no=gr_no,
+                rank=fields["rank"][idx] or "N/A",
+                total_days=total,
+                days_attended=attended,
+                days_absent=str(days_absent),
+                attendance_dates=fields["attendance_dates"][idx] or options["attendance_dates"],
+                overall_remark=fields["overall_remark"][idx],
+                term=options["term"],
+                comment=fields["comment"][idx],
+                diagnostics_sections=schema.build_sections({cell: values[idx] for cell, values in ratings.items()}),
+            ).dict()
+            entry["status"] = "valid" if options["dry_run"] else "queued"
+            if options["dry_run"]:
+                entry["payload"] = payload
+            accepted.append(payload)
+
+        count = None
+        if accepted and not options["dry_run"]:
+            extras.execute_values(
+                cursor,
+                "INSERT INTO diagnostics_queue (payload) VALUES %s",
+                [(dumps_text(payload),) for payload in accepted],
+                page_size=len(accepted),
+            )
+            cursor.execute("SELECT COUNT(*) AS count FROM diagnostics_queue")
+            count = cursor.fetchone()["count"]
+            conn.commit()
+            data_versions.bump("diagnostics_queue")
+    finally:
+        conn.close()
+
+    return {
+        "status": "ok",
+        "dry_run": options["dry_run"],
+        "count": count,
+        "summary": status_summary(results),
+        "results": results,
+    }
+
+
 @app.get("/diagnostics/queue")
 def diagnostics_queue():
     conn = get_connection()
@@ -2009,13 +3797,16 @@ def diagnostics_queue():
 
 
 @app.get("/diagnostics/queue/items")
-def diagnostics_queue_items():
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
-    cursor.execute("SELECT id, payload FROM diagnostics_queue ORDER BY id")
-    rows = cursor.fetchall()
-    conn.close()
-    return {"items": [row_to_dict(row) for row in rows]}
+def diagnostics_queue_items(request: Request):
+    def build():
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, payload::text FROM diagnostics_queue ORDER BY id")
+        rows = cursor.fetchall()
+        conn.close()
+        return raw_items_response(rows, ("id", "payload"), raw=("payload",))
+
+    return response_layer.conditional(request, "diagnostics.queue_items", ("diagnostics_queue",), build)
 
 
 @app.delete("/diagnostics/queue")
@@ -2025,6 +3816,7 @@ def clear_diagnostics_queue():
     try:
         cursor.execute("DELETE FROM diagnostics_queue")
         conn.commit()
+        data_versions.bump("diagnostics_queue")
         return {"status": "ok", "count": 0}
     finally:
         conn.close()
@@ -2036,48 +3828,54 @@ def update_diagnostics_queue(queue_id: int, payload: DiagnosticsRequest):
     conn = get_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute("UPDATE diagnostics_queue SET payload = %s WHERE id = %s", (json.dumps(data), queue_id))
+        cursor.execute("UPDATE diagnostics_queue SET payload = %s WHERE id = %s", (dumps_text(data), queue_id))
         if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Queued diagnostics not found")
         cursor.execute("SELECT COUNT(*) AS count FROM diagnostics_queue")
         count = cursor.fetchone()[0]
         conn.commit()
+        data_versions.bump("diagnostics_queue")
         return {"status": "ok", "count": count}
     finally:
         conn.close()
 
 
 @app.post("/diagnostics/export")
-def export_saved_diagnostics():
+def export_saved_diagnostics(response: Response):
+    profile = RenderProfile()
     conn = get_connection()
     cursor = conn.cursor(cursor_factory=extras.RealDictCursor)
     try:
-        cursor.execute("SELECT id, payload FROM diagnostics_queue ORDER BY id")
-        rows = cursor.fetchall()
+        with profile.stage("db"):
+            cursor.execute("SELECT id, payload FROM diagnostics_queue ORDER BY id")
+            rows = cursor.fetchall()
         if not rows:
             raise HTTPException(status_code=400, detail="No saved diagnostics available for export.")
 
-        records = [row["payload"] for row in rows]
+        catalog = class_catalog()
+        records = sorted(
+            (row["payload"] for row in rows),
+            key=lambda record: catalog.sort_key(record.get("class_sec")),
+        )
+        batch_sizes.observe(len(records), "diagnostics_export")
         filename = f"Faizan_Diagnostics_Batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         success, message, pdf_path = PDFManager.generate_pdf(
             filename,
             {"records": records},
             template_name="report_diagnostics_batch.html",
             css_name="diagnostics_styles.css",
+            profile=profile,
         )
         if not success:
             logging.error("Diagnostics batch export failed: %s", message)
             raise HTTPException(status_code=500, detail=message)
 
-        cursor.execute("DELETE FROM diagnostics_queue")
-        conn.commit()
+        with profile.stage("save"):
+            cursor.execute("DELETE FROM diagnostics_queue")
+            conn.commit()
+        data_versions.bump("diagnostics_queue")
 
-        pdf_file = Path(pdf_path)
-        return {
-            "message": message,
-            "file": pdf_file.name,
-            "download_url": f"/reports/files/{pdf_file.name}",
-        }
+        return pdf_export_response(response, message, pdf_path, profile)
     except HTTPException:
         raise
     except Exception as exc:
@@ -2088,20 +3886,16 @@ def export_saved_diagnostics():
 
 
 @app.post("/reports/pdf")
-def generate_pdf(payload: ReportRequest):
+def generate_pdf(payload: ReportRequest, response: Response):
+    profile = RenderProfile()
     data = payload.dict(by_alias=True)
     filename = f"{data['student_name'].replace(' ', '_')}_ReportCard_{data['session']}"
-    success, message, pdf_path = PDFManager.generate_pdf(filename, data)
+    success, message, pdf_path = PDFManager.generate_pdf(filename, data, profile=profile)
     if not success:
         logging.error("Report PDF export failed: %s", message)
         raise HTTPException(status_code=500, detail=message)
 
-    pdf_file = Path(pdf_path)
-    return {
-        "message": message,
-        "file": pdf_file.name,
-        "download_url": f"/reports/files/{pdf_file.name}",
-    }
+    return pdf_export_response(response, message, pdf_path, profile)
 
 
 @app.post("/reports/preview", response_class=HTMLResponse)
@@ -2111,108 +3905,111 @@ def preview_report(payload: ReportRequest):
     return HTMLResponse(content=html_content)
 
 
-@app.get("/reports/preview", response_class=HTMLResponse)
-def preview_report_sample():
-    sample = {
-        "student_name": "Student Name",
-        "father_name": "Father Name",
-        "class_sec": "X-A",
-        "session": "2025-2026",
-        "gr_no": "00000",
-        "rank": "N/A",
-        "total_days": "0",
-        "days_attended": "0",
-        "days_absent": "0",
-        "term": "Annual Year",
-        "conduct": "Good",
-        "performance": "Excellent",
-        "progress": "Satisfactory",
-        "remarks": "Remarks will appear here.",
-        "status": "Passed",
-        "date": "01 January 2026",
-        "grand_totals": {
-            "cw": "0",
-            "te": "0",
-            "max": "0",
+REPORT_PREVIEW_SAMPLE = {
+    "student_name": "Student Name",
+    "father_name": "Father Name",
+    "class_sec": "X-A",
+    "session": "2025-2026",
+    "gr_no": "00000",
+    "rank": "N/A",
+    "total_days": "0",
+    "days_attended": "0",
+    "days_absent": "0",
+    "term": "Annual Year",
+    "conduct": "Good",
+    "performance": "Excellent",
+    "progress": "Satisfactory",
+    "remarks": "Remarks will appear here.",
+    "status": "Passed",
+    "date": "01 January 2026",
+    "grand_totals": {
+        "cw": "0",
+        "te": "0",
+        "max": "0",
+        "obt": "0",
+        "pct": "0.0%",
+        "grade": "A1",
+    },
+    "marks_data": {
+        "Subject 1": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
             "obt": "0",
             "pct": "0.0%",
             "grade": "A1",
+            "is_absent": False,
         },
-        "marks_data": {
-            "Subject 1": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
-            "Subject 2": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
-            "Subject 3": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
-            "Subject 4": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
-            "Subject 5": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
-            "Subject 6": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
-            "Subject 7": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
-            "Subject 8": {
-                "coursework": "0",
-                "termexam": "0",
-                "maxmarks": "100",
-                "obt": "0",
-                "pct": "0.0%",
-                "grade": "A1",
-                "is_absent": False,
-            },
+        "Subject 2": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
+            "obt": "0",
+            "pct": "0.0%",
+            "grade": "A1",
+            "is_absent": False,
         },
-    }
+        "Subject 3": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
+            "obt": "0",
+            "pct": "0.0%",
+            "grade": "A1",
+            "is_absent": False,
+        },
+        "Subject 4": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
+            "obt": "0",
+            "pct": "0.0%",
+            "grade": "A1",
+            "is_absent": False,
+        },
+        "Subject 5": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
+            "obt": "0",
+            "pct": "0.0%",
+            "grade": "A1",
+            "is_absent": False,
+        },
+        "Subject 6": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
+            "obt": "0",
+            "pct": "0.0%",
+            "grade": "A1",
+            "is_absent": False,
+        },
+        "Subject 7": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
+            "obt": "0",
+            "pct": "0.0%",
+            "grade": "A1",
+            "is_absent": False,
+        },
+        "Subject 8": {
+            "coursework": "0",
+            "termexam": "0",
+            "maxmarks": "100",
+            "obt": "0",
+            "pct": "0.0%",
+            "grade": "A1",
+            "is_absent": False,
+        },
+    },
+}
+
+
+@app.get("/reports/preview", response_class=HTMLResponse)
+def preview_report_sample():
+    sample = dict(REPORT_PREVIEW_SAMPLE)
     html_content = PDFManager.render_template(
         sample,
         template_name="report_preview.html",
@@ -2221,78 +4018,81 @@ def preview_report_sample():
     return HTMLResponse(content=html_content)
 
 
+DIAGNOSTICS_PREVIEW_SAMPLE = {
+    "student_name": "Muhammad Hashim",
+    "father_name": "Taha",
+    "class_sec": "KG-A",
+    "gr_no": "3779",
+    "rank": "N/A",
+    "total_days": "82",
+    "days_attended": "75",
+    "days_absent": "7",
+    "attendance_dates": "01 Feb - 28 Feb",
+    "overall_remark": "Excellent",
+    "term": "Mid Term",
+    "comment": "Muhammad Hashim has shown excellent performance in all academic areas. Well done!",
+    "diagnostics_sections": [
+        {
+            "title": "General Progress",
+            "rows": [
+                {"label": "Punctuality", "value": "Good"},
+                {"label": "Conduct", "value": "Very Good"},
+                {"label": "Tidiness", "value": "Excellent"},
+                {"label": "Works Independently & Neatly", "value": "Excellent"},
+                {"label": "Shows Interest & Efforts", "value": "Excellent"},
+                {"label": "Follows Instructions", "value": "Excellent"},
+                {"label": "Confidence", "value": "Excellent"},
+            ],
+        },
+        {
+            "title": "Maths",
+            "rows": [
+                {"label": "Oral Counting", "value": "Excellent"},
+                {"label": "Recognition of Numbers", "value": "Very Good"},
+                {"label": "Tracing / Writing of Numbers", "value": "Excellent"},
+                {"label": "Recognition of Shapes", "value": "Excellent"},
+                {"label": "Understanding of Concept", "value": "Excellent"},
+            ],
+        },
+        {
+            "title": "English",
+            "rows": [
+                {"label": "Recognition of Sound / Letter", "value": "Fair"},
+                {"label": "Tracing / Writing of Letter", "value": "Excellent"},
+                {"label": "Listening / Speaking", "value": "Fair"},
+                {"label": "Recitation of Rhymes", "value": "Good"},
+                {"label": "Reading", "value": "Fair"},
+            ],
+        },
+        {
+            "title": "Urdu",
+            "rows": [
+                {"label": "Recognition of Sound / Letter", "value": "Very Good"},
+                {"label": "Tracing / Writing of Letter", "value": "Excellent"},
+                {"label": "Recitation of Rhymes", "value": "Excellent"},
+                {"label": "Reading", "value": "Very Good"},
+            ],
+        },
+        {
+            "title": "Other Subjects",
+            "rows": [
+                {"label": "General Knowledge - Oral", "value": "Excellent"},
+                {"label": "Art / Drawing", "value": "Excellent"},
+            ],
+        },
+        {
+            "title": "Islamiyat",
+            "rows": [
+                {"label": "Islamiyat - Oral", "value": "Excellent"},
+            ],
+        },
+    ],
+}
+
+
 @app.get("/reports/preview/diagnostics", response_class=HTMLResponse)
 def preview_diagnostics_sample():
-    sample = {
-        "student_name": "Muhammad Hashim",
-        "father_name": "Taha",
-        "class_sec": "KG-A",
-        "gr_no": "3779",
-        "rank": "N/A",
-        "total_days": "82",
-        "days_attended": "75",
-        "days_absent": "7",
-        "attendance_dates": "01 Feb - 28 Feb",
-        "overall_remark": "Excellent",
-        "term": "Mid Term",
-        "comment": "Muhammad Hashim has shown excellent performance in all academic areas. Well done!",
-        "diagnostics_sections": [
-            {
-                "title": "General Progress",
-                "rows": [
-                    {"label": "Punctuality", "value": "Good"},
-                    {"label": "Conduct", "value": "Very Good"},
-                    {"label": "Tidiness", "value": "Excellent"},
-                    {"label": "Works Independently & Neatly", "value": "Excellent"},
-                    {"label": "Shows Interest & Efforts", "value": "Excellent"},
-                    {"label": "Follows Instructions", "value": "Excellent"},
-                    {"label": "Confidence", "value": "Excellent"},
-                ],
-            },
-            {
-                "title": "Maths",
-                "rows": [
-                    {"label": "Oral Counting", "value": "Excellent"},
-                    {"label": "Recognition of Numbers", "value": "Very Good"},
-                    {"label": "Tracing / Writing of Numbers", "value": "Excellent"},
-                    {"label": "Recognition of Shapes", "value": "Excellent"},
-                    {"label": "Understanding of Concept", "value": "Excellent"},
-                ],
-            },
-            {
-                "title": "English",
-                "rows": [
-                    {"label": "Recognition of Sound / Letter", "value": "Fair"},
-                    {"label": "Tracing / Writing of Letter", "value": "Excellent"},
-                    {"label": "Listening / Speaking", "value": "Fair"},
-                    {"label": "Recitation of Rhymes", "value": "Good"},
-                    {"label": "Reading", "value": "Fair"},
-                ],
-            },
-            {
-                "title": "Urdu",
-                "rows": [
-                    {"label": "Recognition of Sound / Letter", "value": "Very Good"},
-                    {"label": "Tracing / Writing of Letter", "value": "Excellent"},
-                    {"label": "Recitation of Rhymes", "value": "Excellent"},
-                    {"label": "Reading", "value": "Very Good"},
-                ],
-            },
-            {
-                "title": "Other Subjects",
-                "rows": [
-                    {"label": "General Knowledge - Oral", "value": "Excellent"},
-                    {"label": "Art / Drawing", "value": "Excellent"},
-                ],
-            },
-            {
-                "title": "Islamiyat",
-                "rows": [
-                    {"label": "Islamiyat - Oral", "value": "Excellent"},
-                ],
-            },
-        ],
-    }
+    sample = dict(DIAGNOSTICS_PREVIEW_SAMPLE)
     html_content = PDFManager.render_template(
         sample,
         template_name="report_diagnostics_preview.html",
@@ -2311,6 +4111,8 @@ def download_pdf(file_name: str):
     return FileResponse(pdf_path, media_type="application/pdf", filename=safe_name)
 
 
+startup_profile.mark("app")
+
 if __name__ == "__main__":
     import uvicorn
 
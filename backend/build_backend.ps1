@@ -7,6 +7,7 @@ try {
   python -m pip install pyinstaller
   pyinstaller --clean --onefile --name report-backend app.py `
     --noconsole `
+    --hidden-import pandas --hidden-import numpy `
     --exclude-module PyQt6 --exclude-module PySide6
 } finally {
   Pop-Location
@@ -0,0 +1,114 @@
+"""
+Class Catalog - Ordering, aliases and grade levels for class/section names
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, Optional
+
+LEVEL_PATTERN = re.compile(r"^(FDH)?(NUR|KGII|KGI|KG|VIII|VII|VI|IV|IX|V|X|III|II|I)([A-Z]?)(N?)$")
+UNKNOWN_SORT = 1_000_000.0
+
+
+def normalize_class_name(value: Optional[str]) -> str:
+    return (value or "").upper().replace(" ", "").replace("-", "")
+
+
+def infer_class_parts(value: Optional[str]) -> tuple[str, Optional[str]]:
+    """Split a class name into (program prefix, grade level), e.g. 'FDH-IV-B' -> ('FDH', 'IV')"""
+    match = LEVEL_PATTERN.match(normalize_class_name(value))
+    if not match:
+        return "", None
+    return match.group(1) or "", match.group(2)
+
+
+class ClassCatalog:
+    """
+    Lookup table built from the "class_catalog" section of config.json
+
+    Each entry is {"code": "IVA", "sort": 220, "level": "IV", "aliases": [...]}.
+    Codes and aliases are compared after normalize_class_name, so "IV-A",
+    "iv a" and "IVA" are the same class. Names missing from the catalog are
+    placed right after the last catalogued class of the same program and level
+    (so a new "FDH-V-C" lands after "FDH-V-B"), or at the end when no level can
+    be inferred.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[dict[str, Any]] | None = None,
+        class_defaults: dict[str, Any] | None = None,
+    ):
+        self.entries: list[dict[str, Any]] = []
+        self.class_defaults = dict(class_defaults or {})
+        self._lookup: dict[str, dict[str, Any]] = {}
+        self._anchors: dict[tuple[str, str], float] = {}
+        self._cache: dict[str, tuple[float, str]] = {}
+
+        for idx, raw in enumerate(entries or []):
+            code = normalize_class_name(raw.get("code"))
+            if not code:
+                continue
+            prefix, inferred_level = infer_class_parts(code)
+            entry = {
+                "code": code,
+                "sort": float(raw.get("sort", idx * 10)),
+                "level": raw.get("level") or inferred_level,
+                "aliases": [alias for alias in raw.get("aliases", []) if alias],
+            }
+            self.entries.append(entry)
+            for name in [code, *entry["aliases"]]:
+                self._lookup[normalize_class_name(name)] = entry
+            if entry["level"]:
+                anchor_key = (prefix, entry["level"])
+                self._anchors[anchor_key] = max(self._anchors.get(anchor_key, entry["sort"]), entry["sort"])
+        self.entries.sort(key=lambda item: item["sort"])
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "ClassCatalog":
+        return cls(config.get("class_catalog") or [], config.get("class_defaults") or {})
+
+    def lookup(self, name: Optional[str]) -> Optional[dict[str, Any]]:
+        return self._lookup.get(normalize_class_name(name))
+
+    def sort_key(self, name: Optional[str]) -> tuple[float, str]:
+        """Sort key for a class name; memoized so repeated sorts cost one dict lookup per class"""
+        key = name or ""
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        normalized = normalize_class_name(name)
+        entry = self._lookup.get(normalized)
+        if entry:
+            result = (entry["sort"], normalized)
+        else:
+            prefix, level = infer_class_parts(normalized)
+            anchor = self._anchors.get((prefix, level)) if level else None
+            result = (anchor + 0.5 if anchor is not None else UNKNOWN_SORT, normalized)
+        self._cache[key] = result
+        return result
+
+    def sort(self, names: Iterable[Optional[str]]) -> list[Optional[str]]:
+        return sorted(names, key=self.sort_key)
+
+    def level_for(self, name: Optional[str]) -> Optional[str]:
+        entry = self.lookup(name)
+        if entry and entry["level"]:
+            return entry["level"]
+        return infer_class_parts(name)[1]
+
+    def default_days(self, name: Optional[str]) -> Optional[int]:
+        """Total school days configured in class_defaults for the class's grade level"""
+        level = self.level_for(name)
+        if level is None:
+            return None
+        return self.class_defaults.get(level)
+
+    def describe(self) -> list[dict[str, Any]]:
+        return [
+            {
+                **entry,
+                "default_days": self.class_defaults.get(entry["level"]) if entry["level"] else None,
+            }
+            for entry in self.entries
+        ]
@@ -0,0 +1,71 @@
+"""
+Class Ranks - Per (session, class_sec, term) ranking cache
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+Partition = tuple[str, str, str]
+PartitionFilter = tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class ClassRankCache:
+    """
+    Holds {gr_no: rank} for every (session, class_sec, term) that was asked for
+
+    Missing partitions are handed to the loader in one call, so a batch export
+    spanning many classes costs a single ranking query. Writers invalidate by
+    (session, class_sec, term) where None matches any value; this lets a save
+    that may have moved a student between classes drop every class of that
+    session and term without knowing the previous class. Writes by other PCs are
+    caught through `version`, the database version of the ranked tables: the
+    whole cache is dropped when it changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ranks: dict[Partition, dict[str, int]] = {}
+        self._generation = 0
+        self._version: Any = None
+
+    def get(
+        self,
+        partitions: Iterable[Partition],
+        loader: Callable[[list[Partition]], dict[Partition, dict[str, int]]],
+        version: Any = None,
+    ) -> dict[Partition, dict[str, int]]:
+        wanted = list(dict.fromkeys(partitions))
+        with self._lock:
+            if version != self._version:
+                self._ranks.clear()
+                self._generation += 1
+                self._version = version
+            found = {partition: self._ranks[partition] for partition in wanted if partition in self._ranks}
+            generation = self._generation
+        missing = [partition for partition in wanted if partition not in found]
+        if not missing:
+            return found
+        loaded = loader(missing)
+        fresh = {partition: loaded.get(partition, {}) for partition in missing}
+        with self._lock:
+            # A write that landed while the ranking query ran makes the result stale
+            if generation == self._generation:
+                self._ranks.update(fresh)
+        found.update(fresh)
+        return found
+
+    def invalidate(self, *partitions: PartitionFilter):
+        """Drop matching partitions, or everything when called without arguments"""
+        with self._lock:
+            self._generation += 1
+            if not partitions:
+                self._ranks.clear()
+                return
+            for cached in list(self._ranks):
+                if any(self._matches(cached, pattern) for pattern in partitions):
+                    del self._ranks[cached]
+
+    @staticmethod
+    def _matches(partition: Partition, pattern: PartitionFilter) -> bool:
+        return all(want is None or want == have for have, want in zip(partition, pattern))
@@ -2,67 +2,73 @@
 Config Manager - Handles loading/saving configuration files
 """
 
-import json
+import copy
 from pathlib import Path
 
+from backend.core.config_store import JsonDocument
+
 
 class ConfigManager:
     """Manages application configuration"""
 
     CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
     CONFIG_FILE = CONFIG_DIR / "config.json"
+    DOCUMENT = JsonDocument(CONFIG_FILE)
 
     @staticmethod
-    def load():
-        """Load configuration from config/config.json"""
+    def snapshot():
+        """Cached parsed config shared by the getters (read-only)"""
         try:
-            if ConfigManager.CONFIG_FILE.exists():
-                with open(ConfigManager.CONFIG_FILE, 'r', encoding='utf-8') as handle:
-                    return json.load(handle)
-            print(f"Config file not found at {ConfigManager.CONFIG_FILE}")
-            return {}
+            config = ConfigManager.DOCUMENT.get()
+            if config is None:
+                print(f"Config file not found at {ConfigManager.CONFIG_FILE}")
+                return {}
+            return config
         except Exception as exc:  # pragma: no cover
             print(f"Error loading config: {exc}")
             return {}
 
+    @staticmethod
+    def load():
+        """Load configuration from config/config.json as a private copy, safe to modify before save()"""
+        return copy.deepcopy(ConfigManager.snapshot())
+
     @staticmethod
     def save(config):
         """Save configuration to config/config.json"""
         try:
-            ConfigManager.CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-            with open(ConfigManager.CONFIG_FILE, 'w', encoding='utf-8') as handle:
-                json.dump(config, handle, indent=2)
+            ConfigManager.DOCUMENT.save(config)
             return True
         except Exception as exc:  # pragma: no cover
             print(f"Error saving config: {exc}")
             return False
 
+    @staticmethod
+    def subscribe(callback):
+        """Run callback(config) whenever config.json is saved or changes on disk"""
+        ConfigManager.DOCUMENT.subscribe(callback)
+
     @staticmethod
     def get_sessions():
         """Get list of available sessions"""
-        config = ConfigManager.load()
-        return config.get("sessions", [])
+        return list(ConfigManager.snapshot().get("sessions", []))
 
     @staticmethod
     def get_subjects():
         """Get list of subjects"""
-        config = ConfigManager.load()
-        return config.get("subjects", [])
+        return list(ConfigManager.snapshot().get("subjects", []))
 
     @staticmethod
     def get_max_marks_options():
         """Get available max marks options"""
-        config = ConfigManager.load()
-        return config.get("max_marks_options", [100])
+        return list(ConfigManager.snapshot().get("max_marks_options", [100]))
 
     @staticmethod
     def get_default_session():
         """Get default session"""
-        config = ConfigManager.load()
-        return config.get("default_session", "2025-2026")
+        return ConfigManager.snapshot().get("default_session", "2025-2026")
 
     @staticmethod
     def get_default_max_marks():
         """Get default max marks"""
-        config = ConfigManager.load()
-        return config.get("default_max_marks", 100)
+        return ConfigManager.snapshot().get("default_max_marks", 100)
@@ -0,0 +1,107 @@
+"""
+Config Store - Cached JSON documents with mtime invalidation and atomic saves
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+class JsonDocument:
+    """
+    A JSON file parsed once and served from memory until it changes on disk
+
+    Every read costs one os.stat: the cached document is reused while the file's
+    (mtime_ns, size) is unchanged, so edits made by hand or by another process are
+    still picked up. Saves go to a temp file in the same folder and are swapped in
+    with os.replace, so readers never see a half-written file. Subscribers are
+    called with the new document whenever it is saved or reloaded.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._signature: Optional[tuple[int, int]] = None
+        self._loaded = False
+        self._data: Any = None
+        self._subscribers: list[Callable[[Any], None]] = []
+
+    def _stat_signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def exists(self) -> bool:
+        return self._stat_signature() is not None
+
+    def get(self) -> Any:
+        """Return the parsed document (None when the file is missing); treat it as read-only"""
+        signature = self._stat_signature()
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return self._data
+            if signature is None:
+                data = None
+            else:
+                with open(self.path, "r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+            changed = self._loaded
+            self._data = data
+            self._signature = signature
+            self._loaded = True
+        if changed:
+            self._notify(data)
+        return data
+
+    def get_copy(self) -> Any:
+        return copy.deepcopy(self.get())
+
+    def save(self, data: Any, indent: int = 2) -> Any:
+        """Write the document atomically and update the cache"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f".{self.path.name}.",
+                suffix=".tmp",
+                dir=str(self.path.parent),
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump(data, handle, indent=indent)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(temp_path, self.path)
+            except Exception:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
+            self._data = copy.deepcopy(data)
+            self._signature = self._stat_signature()
+            self._loaded = True
+        self._notify(self._data)
+        return self._data
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def subscribe(self, callback: Callable[[Any], None]):
+        """Register a callback run with the new document after every change"""
+        self._subscribers.append(callback)
+
+    def _notify(self, data: Any):
+        for callback in list(self._subscribers):
+            try:
+                callback(data)
+            except Exception:  # pragma: no cover - one bad subscriber must not break reads
+                logging.exception("Config subscriber failed for %s", self.path)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 import os
 import sys
 from pathlib import Path
 from typing import Any
 
+from backend.core.config_store import JsonDocument
+
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
@@ -30,6 +31,7 @@ def resolve_db_config_file() -> Path:
 
 
 DB_CONFIG_FILE = resolve_db_config_file()
+DB_CONFIG_DOCUMENT = JsonDocument(DB_CONFIG_FILE)
 
 DEFAULT_CONFIG = {
     "host": "127.0.0.1",
@@ -53,18 +55,21 @@ def normalize_db_config(config: dict[str, Any]) -> dict[str, Any]:
 
 
 def load_db_config() -> dict[str, Any]:
-    if DB_CONFIG_FILE.exists():
-        with open(DB_CONFIG_FILE, "r", encoding="utf-8") as handle:
-            data = json.load(handle)
-            payload = {**DEFAULT_CONFIG, **(data or {})}
-            return normalize_db_config(payload)
+    data = DB_CONFIG_DOCUMENT.get()
+    if data is not None:
+        payload = {**DEFAULT_CONFIG, **(data or {})}
+        return normalize_db_config(payload)
     return normalize_db_config(DEFAULT_CONFIG.copy())
 
 
 def save_db_config(config: dict[str, Any]) -> dict[str, Any]:
-    DB_CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
     payload = normalize_db_config({**DEFAULT_CONFIG, **(config or {})})
-    with open(DB_CONFIG_FILE, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
+    DB_CONFIG_DOCUMENT.save(payload)
     return payload
 
+
+def subscribe_db_config(callback):
+    """Run callback(config) with the normalized config whenever db_config.json changes"""
+    DB_CONFIG_DOCUMENT.subscribe(
+        lambda data: callback(normalize_db_config({**DEFAULT_CONFIG, **(data or {})}))
+    )
@@ -0,0 +1,70 @@
+"""
+DB Instrument - psycopg2 connection and cursor classes that time and record every statement
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from psycopg2 import extensions
+
+from backend.core.metrics import db_query_latency, statement_kind
+from backend.core.query_stats import query_stats
+
+_timed_classes: dict[type, type] = {}
+_timed_lock = threading.Lock()
+
+
+def timed_cursor_class(factory: type) -> type:
+    """
+    A subclass of `factory` (cursor, RealDictCursor, ...) whose execute calls are
+    timed into the query latency histogram and recorded in query_stats
+    """
+    timed = _timed_classes.get(factory)
+    if timed is not None:
+        return timed
+
+    class TimedCursor(factory):
+        def execute(self, query, vars=None):
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = super().execute(query, vars)
+                failed = False
+                return result
+            finally:
+                self._observe(query, time.perf_counter() - started, failed)
+
+        def executemany(self, query, vars_list):
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = super().executemany(query, vars_list)
+                failed = False
+                return result
+            finally:
+                self._observe(query, time.perf_counter() - started, failed)
+
+        def _observe(self, query, elapsed: float, failed: bool):
+            db_query_latency.observe(elapsed, statement_kind(query))
+            query_stats.record(query, elapsed, self, failed)
+
+    TimedCursor.__name__ = f"Timed{factory.__name__}"
+    with _timed_lock:
+        return _timed_classes.setdefault(factory, TimedCursor)
+
+
+class InstrumentedConnection(extensions.connection):
+    """
+    Connection factory for get_connection
+
+    Every cursor, whatever cursor_factory the caller asks for, is swapped for its
+    timed subclass, so query metrics need no changes at the call sites.
+    execute_values and friends go through cursor.execute and are covered too.
+    """
+
+    def cursor(self, *args: Any, **kwargs: Any):
+        factory = kwargs.get("cursor_factory") or self.cursor_factory or extensions.cursor
+        kwargs["cursor_factory"] = timed_cursor_class(factory)
+        return super().cursor(*args, **kwargs)
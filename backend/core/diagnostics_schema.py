@@ -0,0 +1,141 @@
+"""
+Diagnostics Schema - Sections, labels and rating scale for early-years diagnostics
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+
+from backend.core.lazy import LazyModule
+
+pd = LazyModule("pandas")
+
+DEFAULT_RATINGS = ["Excellent", "Very Good", "Good", "Fair"]
+DEFAULT_SECTIONS = [
+    {
+        "title": "GENERAL PROGRESS",
+        "items": [
+            "Punctuality",
+            "Conduct",
+            "Tidiness",
+            "Works Independently & Neatly",
+            "Shows Interest & Efforts",
+            "Follows Instructions",
+            "Confidence",
+        ],
+    },
+    {
+        "title": "MATHS",
+        "items": [
+            "Oral Counting",
+            "Recognition of Numbers",
+            "Tracing/Writing of Numbers",
+            "Recognition of Shapes",
+            "Understanding of Concept",
+        ],
+    },
+    {
+        "title": "ENGLISH",
+        "items": [
+            "Recognition of Sound/Letter",
+            "Tracing",
+            "Writing of Letter",
+            "Listening/Speaking",
+            "Recitation of Rhymes",
+            "Reading",
+        ],
+    },
+    {
+        "title": "URDU",
+        "items": ["Recognition of Sound/Letter", "Tracing/Writing of Letter", "Recitation of Rhymes", "Reading"],
+    },
+    {"title": "OTHER SUBJECTS", "items": ["General Knowledge - Oral", "Art/Drawing"]},
+    {"title": "ISLAMIAT", "items": ["Islamiat - Oral"]},
+]
+
+HEADER_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_header(value: Any) -> str:
+    return " ".join(HEADER_SPLIT.split(str(value or "").lower())).strip()
+
+
+class DiagnosticsSchema:
+    """
+    The diagnostics form as data, shared by the bulk grid import and the client
+
+    Grid headers are matched after normalize_header, so "ENGLISH: Reading",
+    "English - Reading" and "english_reading" all name the same cell. A bare
+    label ("Punctuality") is accepted when only one section uses it. Ratings are
+    matched case-insensitively, by full name or initials ("VG" for Very Good).
+    """
+
+    def __init__(self, sections: Iterable[dict[str, Any]] | None = None, ratings: Iterable[str] | None = None):
+        self.sections = [
+            {"title": str(section["title"]), "items": [str(item) for item in section.get("items", [])]}
+            for section in (sections or DEFAULT_SECTIONS)
+            if section.get("title")
+        ]
+        self.ratings = [str(rating) for rating in (ratings or DEFAULT_RATINGS)]
+        self._ratings: dict[str, str] = {}
+        for rating in self.ratings:
+            initials = "".join(word[0] for word in rating.split())
+            self._ratings.setdefault(initials.lower(), rating)
+        self._ratings.update({rating.lower(): rating for rating in self.ratings})
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "DiagnosticsSchema":
+        schema = config.get("diagnostics_schema") or {}
+        return cls(schema.get("sections"), schema.get("ratings"))
+
+    @property
+    def cells(self) -> list[tuple[str, str]]:
+        return [(section["title"], item) for section in self.sections for item in section["items"]]
+
+    def resolve_columns(self, headers: Iterable[Any]) -> tuple[dict[tuple[str, str], Any], list[str]]:
+        """Map every (section, label) to a grid column; returns (mapping, missing headers)"""
+        by_header = {}
+        for header in headers:
+            by_header.setdefault(normalize_header(header), header)
+        label_counts: dict[str, int] = {}
+        for _, label in self.cells:
+            key = normalize_header(label)
+            label_counts[key] = label_counts.get(key, 0) + 1
+
+        mapping: dict[tuple[str, str], Any] = {}
+        missing: list[str] = []
+        for title, label in self.cells:
+            qualified = normalize_header(f"{title} {label}")
+            bare = normalize_header(label)
+            if qualified in by_header:
+                mapping[(title, label)] = by_header[qualified]
+            elif label_counts[bare] == 1 and bare in by_header:
+                mapping[(title, label)] = by_header[bare]
+            else:
+                missing.append(f"{title}: {label}")
+        return mapping, missing
+
+    def normalize_ratings(self, series: pd.Series) -> pd.Series:
+        """Canonical rating names for a whole column; blank or unknown cells become None"""
+        text = series.astype(object).where(series.notna(), "").astype(str).str.strip().str.lower()
+        mapped = text.map(self._ratings).astype(object)
+        return mapped.where(mapped.notna(), None)
+
+    def build_sections(self, ratings: dict[tuple[str, str], str]) -> list[dict[str, Any]]:
+        return [
+            {
+                "title": section["title"],
+                "rows": [
+                    {"label": item, "value": ratings[(section["title"], item)]}
+                    for item in section["items"]
+                ],
+            }
+            for section in self.sections
+        ]
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "ratings": list(self.ratings),
+            "sections": [dict(section, items=list(section["items"])) for section in self.sections],
+            "columns": [f"{title}: {label}" for title, label in self.cells],
+        }
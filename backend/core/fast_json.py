@@ -0,0 +1,102 @@
+"""
+Fast JSON - orjson-backed encoding and decoding for payloads and API responses
+"""
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the standard library
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, "dict"):
+        return value.dict()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+    def dumps_text(value: Any) -> str:
+        return orjson.dumps(value, default=_default, option=_OPTIONS).decode("utf-8")
+
+    loads = orjson.loads
+else:  # pragma: no cover
+
+    def dumps(value: Any) -> bytes:
+        return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def dumps_text(value: Any) -> str:
+        return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+    loads = json.loads
+
+
+def register_jsonb():
+    """Decode json/jsonb columns with the fast decoder for every psycopg2 connection"""
+    from psycopg2 import extras
+
+    extras.register_default_json(loads=loads, globally=True)
+    extras.register_default_jsonb(loads=loads, globally=True)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson
+
+    Endpoints that return an instance directly also skip FastAPI's
+    jsonable_encoder pass, so large results are walked only once.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def encode_rows(rows: Iterable[Sequence[Any]], columns: Sequence[str], raw: Iterable[str] = ()) -> bytes:
+    """
+    Encode tuple rows as a JSON array of objects
+
+    Columns listed in `raw` must already hold JSON text (e.g. selected as
+    payload::text) and are spliced in as-is, so stored payloads are never
+    decoded or re-encoded on their way to the client.
+    """
+    raw_columns = set(raw)
+    keys = [dumps(column) + b":" for column in columns]
+    spliced = [column in raw_columns for column in columns]
+    items = []
+    for row in rows:
+        parts = []
+        for key, is_raw, value in zip(keys, spliced, row):
+            if is_raw:
+                parts.append(key + (value.encode("utf-8") if value is not None else b"null"))
+            else:
+                parts.append(key + dumps(value))
+        items.append(b"{" + b",".join(parts) + b"}")
+    return b"[" + b",".join(items) + b"]"
+
+
+def raw_items_response(rows: Iterable[Sequence[Any]], columns: Sequence[str], raw: Iterable[str] = ()) -> Response:
+    """{"items": [...]} built with encode_rows"""
+    return Response(content=b'{"items":' + encode_rows(rows, columns, raw) + b"}", media_type="application/json")
@@ -0,0 +1,45 @@
+"""
+Grading - Shared grade boundaries for reports and mark sheets
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from backend.core.lazy import LazyModule
+
+np = LazyModule("numpy")
+
+# Mirrors gradeFromPercentage in discord-client/src/utils/formatters.js
+GRADE_BOUNDARIES: list[tuple[float, str]] = [
+    (80.0, "A1"),
+    (70.0, "A"),
+    (60.0, "B"),
+    (50.0, "C"),
+    (40.0, "D"),
+]
+FAIL_GRADE = "U"
+
+
+def grade_from_percentage(value: Any, boundaries: list[tuple[float, str]] | None = None) -> str:
+    """Return the grade for a single percentage"""
+    try:
+        pct = float(str(value).strip().replace("%", ""))
+    except (TypeError, ValueError):
+        return "-"
+    if np.isnan(pct):
+        return "-"
+    for threshold, grade in boundaries or GRADE_BOUNDARIES:
+        if pct >= threshold:
+            return grade
+    return FAIL_GRADE
+
+
+def grades_for(percentages: Any, boundaries: list[tuple[float, str]] | None = None) -> np.ndarray:
+    """Vectorized grade lookup for an array of percentages (NaN becomes '-')"""
+    values = np.asarray(percentages, dtype=float)
+    ordered = boundaries or GRADE_BOUNDARIES
+    conditions = [values >= threshold for threshold, _ in ordered]
+    choices = [grade for _, grade in ordered]
+    grades = np.select(conditions, choices, default=FAIL_GRADE).astype(object)
+    grades[np.isnan(values)] = "-"
+    return grades
@@ -0,0 +1,233 @@
+"""
+HTTP Cache - Version tags, conditional responses and compression for large JSON bodies
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from backend.core.fast_json import dumps
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.getenv("FAIZAN_COMPRESS_MIN_BYTES", "2048"))
+# How long a table version read from the database is trusted before the next probe
+DB_VERSION_TTL_SECONDS = 1.0
+
+
+class DataVersions:
+    """
+    Version tags for endpoints that read a set of tables
+
+    A tag combines the database-side version of each table (see table_versions;
+    read-only markers that move on writes from any PC sharing the database) with
+    this process's own write counters. The database versions come from
+    `probe(conn, tables)`, run on the caller's connection, and are reused for
+    `ttl` seconds; a local bump drops them so this process sees its own writes at
+    once. The per-process nonce keeps tags issued before a restart from matching
+    after it.
+    """
+
+    def __init__(
+        self,
+        probe: Optional[Callable[[Any, list[str]], dict[str, Any]]] = None,
+        ttl: float = DB_VERSION_TTL_SECONDS,
+    ):
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        self._nonce = f"{os.getpid():x}.{time.time_ns():x}"
+        self._probe = probe
+        self._ttl = ttl
+        self._seen: dict[str, tuple[float, Any]] = {}
+
+    def bump(self, *tables: str):
+        with self._lock:
+            for table in tables:
+                self._counters[table] += 1
+                self._seen.pop(table, None)
+
+    def database(self, tables: Iterable[str], conn: Any = None) -> dict[str, Any]:
+        """Database version per table, probed on `conn`; None where it could not be read"""
+        tables = list(tables)
+        if self._probe is None or conn is None or not tables:
+            return {}
+        now = time.monotonic()
+        with self._lock:
+            versions = {
+                table: self._seen[table][1]
+                for table in tables
+                if table in self._seen and now - self._seen[table][0] < self._ttl
+            }
+        missing = [table for table in tables if table not in versions]
+        if missing:
+            try:
+                read = self._probe(conn, missing)
+            except Exception as exc:
+                logging.debug("Table versions unavailable: %s", exc)
+                read = {}
+            with self._lock:
+                for table in missing:
+                    versions[table] = read.get(table)
+                    self._seen[table] = (now, versions[table])
+        return versions
+
+    def tag(self, tables: Iterable[str], conn: Any, *parts: Any) -> str:
+        tables = list(tables)
+        database = self.database(tables, conn)
+        with self._lock:
+            versions = [f"{table}={self._counters[table]}.{database.get(table)}" for table in tables]
+        raw = "|".join([self._nonce, *versions, *(str(part) for part in parts)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+class ResponseStats:
+    """Per-endpoint counters for bytes produced, bytes sent and 304 answers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"responses": 0, "not_modified": 0, "raw_bytes": 0, "sent_bytes": 0, "saved_bytes": 0, "last_bytes": 0}
+        )
+
+    def record(self, endpoint: str, raw_bytes: int, sent_bytes: int):
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats["responses"] += 1
+            stats["raw_bytes"] += raw_bytes
+            stats["sent_bytes"] += sent_bytes
+            stats["saved_bytes"] += raw_bytes - sent_bytes
+            stats["last_bytes"] = raw_bytes
+
+    def record_not_modified(self, endpoint: str):
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats["not_modified"] += 1
+            # The body the client already holds is, at best guess, the last one produced
+            stats["saved_bytes"] += stats["last_bytes"]
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._endpoints.items()}
+
+
+CONTENT_CODINGS = ("br", "gzip")
+
+
+def coded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Tag of one content-coded variant; a compressed body is a different representation"""
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def matching_etag(header: Optional[str], etag: str) -> Optional[str]:
+    """The If-None-Match tag naming `etag` or one of its content-coded variants, if any"""
+    if not header:
+        return None
+    variants = {etag, *(coded_etag(etag, encoding) for encoding in CONTENT_CODINGS)}
+    for candidate in header.split(","):
+        value = candidate.strip().removeprefix("W/").strip('"')
+        if value in variants:
+            return value
+        if value == "*":
+            return etag
+    return None
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    return matching_etag(header, etag) is not None
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class ResponseLayer:
+    """
+    Opt-in conditional GETs and compression for endpoints with large bodies
+
+    Endpoints call conditional() with the tables they read and the connection
+    they will read them on: a matching If-None-Match is answered with 304 after
+    at most one table-version probe and before any of the endpoint's own queries
+    run. send() compresses bodies of at least `threshold` bytes with brotli (when
+    installed) or gzip, and appends the coding to their ETag (`"<tag>-br"`), so
+    each encoding of a body has its own strong validator.
+    """
+
+    def __init__(self, versions: DataVersions, stats: ResponseStats, threshold: int = COMPRESS_MIN_BYTES):
+        self.versions = versions
+        self.stats = stats
+        self.threshold = threshold
+
+    def send(
+        self,
+        request: Request,
+        endpoint: str,
+        content: Any,
+        etag: Optional[str] = None,
+        media_type: str = "application/json",
+        headers: Optional[dict[str, str]] = None,
+    ) -> Response:
+        if isinstance(content, Response):
+            body = bytes(content.body)
+            media_type = content.media_type or media_type
+        elif isinstance(content, bytes):
+            body = content
+        else:
+            body = dumps(content)
+        headers = dict(headers or {})
+        raw_size = len(body)
+        encoding = choose_encoding(request.headers.get("accept-encoding")) if raw_size >= self.threshold else None
+        if etag:
+            headers["ETag"] = f'"{coded_etag(etag, encoding)}"'
+            headers["Cache-Control"] = "no-cache"
+        if encoding:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+        headers["Vary"] = "Accept-Encoding"
+        self.stats.record(endpoint, raw_size, len(body))
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    def not_modified(self, request: Request, endpoint: str, etag: str) -> Optional[Response]:
+        """304 when If-None-Match names `etag` or a compressed variant of it, echoing the tag the client holds"""
+        matched = matching_etag(request.headers.get("if-none-match"), etag)
+        if matched is None:
+            return None
+        self.stats.record_not_modified(endpoint)
+        return Response(status_code=304, headers={"ETag": f'"{matched}"', "Cache-Control": "no-cache"})
+
+    def conditional(
+        self,
+        request: Request,
+        endpoint: str,
+        tables: Iterable[str],
+        conn: Any,
+        build: Callable[[], Any],
+    ) -> Response:
+        """Answer 304 when the tables and query string are unchanged, otherwise build and send"""
+        etag = self.versions.tag(tables, conn, endpoint, request.url.path, request.url.query)
+        cached = self.not_modified(request, endpoint, etag)
+        if cached is not None:
+            return cached
+        return self.send(request, endpoint, build(), etag=etag)
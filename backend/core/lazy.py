@@ -0,0 +1,57 @@
+"""
+Lazy - Module proxies that defer heavy imports until first use
+"""
+from __future__ import annotations
+
+import importlib
+import threading
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module until one of its attributes is read
+
+    `pd = LazyModule("pandas")` costs nothing at startup; the first `pd.DataFrame`
+    imports pandas and later reads are plain attribute lookups because every
+    resolved attribute is copied onto the proxy. Only use it for modules whose
+    names are referenced inside functions or string annotations.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        value = getattr(self._load(), attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def warm(*modules: LazyModule):
+    """Import the given proxies now (e.g. from a background thread after startup)"""
+    for module in modules:
+        module._load()
@@ -0,0 +1,152 @@
+"""
+Marks Sheet - Turns a class marks spreadsheet into report payloads
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Optional
+
+from backend.core.lazy import LazyModule
+from backend.core.results import ABSENT
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# "English CW", "English TE", "English Max" (the same labels as the tabulation export)
+SUBJECT_COLUMN = re.compile(r"^(?P<subject>.+?)[\s_-]+(?P<component>CW|TE|Max)$", re.IGNORECASE)
+COMPONENTS = {"cw": "coursework", "te": "termexam", "max": "maxmarks"}
+GR_NO_HEADERS = {"gr_no", "gr no", "g.r no", "g.r. no", "grno"}
+FIELD_COLUMNS = (
+    "student_name",
+    "class_sec",
+    "total_days",
+    "days_attended",
+    "rank",
+    "conduct",
+    "performance",
+    "progress",
+    "remarks",
+    "status",
+)
+ABSENT_MARKS = {"absent", "ab", "a"}
+
+
+def text_cells(series: pd.Series) -> pd.Series:
+    """Cells as stripped strings; NaN/None become '' and 45.0 from Excel becomes '45'"""
+    values = series.astype(object).where(series.notna(), "")
+    text = values.astype(str).str.strip()
+    return text.str.replace(r"^(-?\d+)\.0+$", r"\1", regex=True)
+
+
+def parse_marks_columns(columns) -> tuple[Optional[str], list[str], dict[str, dict[str, str]]]:
+    """
+    Map sheet headers to (gr_no column, subjects in sheet order, {subject: {component: column}})
+    """
+    gr_column = None
+    subjects: list[str] = []
+    layout: dict[str, dict[str, str]] = {}
+    for column in columns:
+        header = str(column).strip()
+        if header.lower() in GR_NO_HEADERS and gr_column is None:
+            gr_column = column
+            continue
+        match = SUBJECT_COLUMN.match(header)
+        if not match:
+            continue
+        subject = match.group("subject").strip()
+        if subject not in layout:
+            layout[subject] = {}
+            subjects.append(subject)
+        layout[subject][COMPONENTS[match.group("component").lower()]] = column
+    subjects = [subject for subject in subjects if {"coursework", "termexam"} & set(layout[subject])]
+    return gr_column, subjects, layout
+
+
+class MarksSheet:
+    """
+    One row per G.R No, two or three columns per subject
+
+    Every mark column is parsed once as a whole (pandas string and numeric ops),
+    giving (students x subjects) matrices for the marks, absences and invalid
+    cells. Payload dictionaries are only assembled for rows that pass validation.
+    """
+
+    def __init__(self, frame: pd.DataFrame, default_max_marks: Any = 100):
+        frame = frame.copy()
+        frame.columns = [str(column).strip() for column in frame.columns]
+        gr_column, subjects, layout = parse_marks_columns(frame.columns)
+        if gr_column is None:
+            raise ValueError("Missing column: gr_no")
+        if not subjects:
+            raise ValueError('No subject columns found. Use headers such as "English CW" and "English TE".')
+
+        self.subjects = subjects
+        self.gr_nos = text_cells(frame[gr_column]).tolist()
+        self.fields = {
+            column: text_cells(frame[column]).tolist()
+            for column in FIELD_COLUMNS
+            if column in frame.columns
+        }
+
+        count, width = len(frame), len(subjects)
+        self.text = {component: np.full((count, width), "", dtype=object) for component in COMPONENTS.values()}
+        self.values = {component: np.zeros((count, width)) for component in COMPONENTS.values()}
+        self.absent = {component: np.zeros((count, width), dtype=bool) for component in COMPONENTS.values()}
+        self.invalid = np.zeros((count, width), dtype=bool)
+        default_max = str(default_max_marks)
+
+        for col, subject in enumerate(subjects):
+            for component in COMPONENTS.values():
+                source = layout[subject].get(component)
+                if source is None:
+                    cells = pd.Series([default_max if component == "maxmarks" else ""] * count, index=frame.index)
+                else:
+                    cells = text_cells(frame[source])
+                    if component == "maxmarks":
+                        cells = cells.where(cells != "", default_max)
+                absent = cells.str.lower().isin(ABSENT_MARKS).to_numpy()
+                parsed = pd.to_numeric(cells, errors="coerce").to_numpy(dtype=float)
+                blank = (cells == "").to_numpy()
+                self.invalid[:, col] |= ~blank & ~absent & (np.isnan(parsed) | (parsed < 0))
+                self.text[component][:, col] = cells.to_numpy(dtype=object)
+                self.values[component][:, col] = np.nan_to_num(parsed)
+                self.absent[component][:, col] = absent
+
+        cw, te = self.text["coursework"], self.text["termexam"]
+        # A subject with both components blank was not taken by that student
+        self.taken = (cw != "") | (te != "")
+        obtained = self.values["coursework"] + self.values["termexam"]
+        self.over_max = self.taken & (obtained > self.values["maxmarks"])
+
+    def __len__(self) -> int:
+        return len(self.gr_nos)
+
+    def row_errors(self, row: int) -> list[str]:
+        errors = []
+        for col, subject in enumerate(self.subjects):
+            if self.invalid[row, col]:
+                errors.append(f"{subject}: marks must be numbers or Absent")
+            elif self.over_max[row, col]:
+                errors.append(f"{subject}: marks exceed the maximum")
+        if not any(self.taken[row]):
+            errors.append("No marks entered")
+        return errors
+
+    def marks_data(self, row: int) -> dict[str, dict[str, Any]]:
+        marks: dict[str, dict[str, Any]] = {}
+        for col, subject in enumerate(self.subjects):
+            if not self.taken[row, col]:
+                continue
+            entry = {}
+            for component in ("coursework", "termexam"):
+                if self.absent[component][row, col]:
+                    entry[component] = ABSENT
+                else:
+                    entry[component] = self.text[component][row, col] or "0"
+            entry["maxmarks"] = self.text["maxmarks"][row, col]
+            marks[subject] = entry
+        return marks
+
+    def field(self, name: str, row: int) -> str:
+        values = self.fields.get(name)
+        return values[row] if values else ""
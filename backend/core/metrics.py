@@ -0,0 +1,270 @@
+"""
+Metrics - In-process counters, gauges and histograms rendered in Prometheus text format
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Optional
+
+# Seconds; request and query latencies of a desktop backend sit between 1 ms and a few seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[Any, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:  # pragma: no cover - overridden
+        return []
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, key)} {_number(value)}" for key, value in values]
+
+
+class Gauge(Metric):
+    """
+    A value read at scrape time from a callback returning {label values: value}
+
+    With kind="counter" it exposes totals kept elsewhere (e.g. ResponseStats).
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        read: Callable[[], dict[tuple, float]],
+        labels: Iterable[str] = (),
+        kind: str = "gauge",
+    ):
+        super().__init__(name, help_text, labels)
+        self.read = read
+        self.kind = kind
+
+    def samples(self) -> list[str]:
+        values = self.read() or {}
+        return [f"{self.name}{_labels(self.label_names, key)} {_number(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram(Metric):
+    """
+    Cumulative-bucket histogram per label set
+
+    observe() is a bisect and three additions under a lock, a few microseconds,
+    so it is cheap enough to run on every request and query.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: Any):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            snapshot = sorted((key, list(series[0]), series[1], series[2]) for key, series in self._series.items())
+        lines = []
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "faizan"):
+        self.prefix = prefix
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(f"{self.prefix}_{name}", help_text, labels))
+
+    def gauge(
+        self,
+        name: str,
+        help_text: str,
+        read: Callable[[], dict[tuple, float]],
+        labels: Iterable[str] = (),
+        kind: str = "gauge",
+    ) -> Gauge:
+        return self._register(Gauge(f"{self.prefix}_{name}", help_text, read, labels, kind))
+
+    def histogram(
+        self, name: str, help_text: str, labels: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(f"{self.prefix}_{name}", help_text, labels, buckets))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            try:
+                samples = metric.samples()
+            except Exception as exc:  # pragma: no cover - one bad gauge must not hide the rest
+                lines.append(f"# {metric.name} unavailable: {_escape(exc)}")
+                continue
+            lines.extend(metric.header())
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "r", encoding="ascii") as handle:
+                return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.windll.kernel32
+        process = kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter("http_requests_total", "HTTP requests by route template, method and status", ("route", "method", "status"))
+http_latency = registry.histogram("http_request_duration_seconds", "HTTP request latency by route template", ("route", "method"))
+db_query_latency = registry.histogram("db_query_duration_seconds", "Time spent in cursor.execute by statement kind", ("statement",))
+db_connect_latency = registry.histogram("db_connect_duration_seconds", "Time to open a database connection")
+pdf_stage_latency = registry.histogram("pdf_render_stage_seconds", "PDF render time by stage (annotate, jinja, layout, write)", ("template", "stage"))
+batch_sizes = registry.histogram("batch_size", "Records handled per batch operation", ("operation",), BATCH_BUCKETS)
+process_start = time.time()
+
+
+class RequestMetrics:
+    """
+    Pure ASGI middleware recording count and latency per route template
+
+    The route comes from the matched FastAPI route (`/reports/history/{gr_no}`),
+    never the raw path, so the series count stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or ("static" if scope.get("root_path") else "unmatched")
+            method = scope.get("method", "")
+            http_requests.inc(template, method, status[0])
+            http_latency.observe(time.perf_counter() - started, template, method)
+
+
+def statement_kind(query: Any) -> str:
+    """First keyword of a statement (SELECT, INSERT, ...), a bounded label for query metrics"""
+    if isinstance(query, bytes):
+        query = query[:64].decode("utf-8", "replace")
+    text = str(query).lstrip()[:64]
+    word = text.split(None, 1)[0].upper() if text else ""
+    return word if word.isalpha() else "OTHER"
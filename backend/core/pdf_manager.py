@@ -6,11 +6,13 @@ from pathlib import Path
 import os
 import sys
 import logging
+import threading
+import time
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader
-
-from backend.core.db_config import load_db_config
+from backend.core.db_config import load_db_config, subscribe_db_config
+from backend.core.metrics import pdf_stage_latency
+from backend.core.render_profile import RenderProfile, append_render_log, templates_version
 
 class PDFManager:
     """Manages PDF generation using Jinja2 templates and WeasyPrint"""
@@ -28,6 +30,17 @@ class PDFManager:
     TEMPLATES_DIR = PROJECT_ROOT / "templates"
     OUTPUT_DIR = PROJECT_ROOT / "output"
 
+    _ensured_output_dir: Path | None = None
+    FONT_FILES = ("Revue.ttf", "calibri-regular.ttf", "calibri-italic.ttf")
+
+    # Render caches, shared by every request and primed by warm_up()
+    _lock = threading.Lock()
+    _environment = None
+    _css_cache: dict[tuple[str, str | None], tuple[float, str]] = {}
+    _image_cache: dict[str, Any] = {}
+    # JSON lines with the RenderProfile of every export; set by the app at startup
+    render_log: Path | None = None
+
     @staticmethod
     def get_output_dir() -> Path:
         config = load_db_config()
@@ -40,9 +53,16 @@ class PDFManager:
     def ensure_output_dir() -> Path:
         """Create output directory if it doesn't exist"""
         output_dir = PDFManager.get_output_dir()
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if output_dir != PDFManager._ensured_output_dir or not output_dir.exists():
+            output_dir.mkdir(parents=True, exist_ok=True)
+            PDFManager._ensured_output_dir = output_dir
         return output_dir
 
+    @staticmethod
+    def reset_output_dir(_config: dict[str, Any] | None = None):
+        """Forget the prepared output dir (subscribed to db_config.json changes)"""
+        PDFManager._ensured_output_dir = None
+
     @staticmethod
     def get_font_size(text: str) -> int:
         """
@@ -74,12 +94,43 @@ class PDFManager:
         else:
             apply(payload)
 
+    @staticmethod
+    def environment():
+        """One Jinja environment per process, so compiled templates are reused across renders"""
+        if PDFManager._environment is None:
+            from jinja2 import Environment, FileSystemLoader
+
+            with PDFManager._lock:
+                if PDFManager._environment is None:
+                    PDFManager._environment = Environment(loader=FileSystemLoader(str(PDFManager.TEMPLATES_DIR)))
+        return PDFManager._environment
+
+    @staticmethod
+    def stylesheet(css_name: str, asset_base: str | None = None) -> str:
+        """Stylesheet text with font URLs pointed at asset_base (or the templates folder), cached until the file changes"""
+        css_path = PDFManager.TEMPLATES_DIR / css_name
+        mtime = css_path.stat().st_mtime
+        key = (css_name, asset_base)
+        cached = PDFManager._css_cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(css_path, 'r', encoding='utf-8') as handle:
+            css_content = handle.read()
+        templates_dir_str = str(PDFManager.TEMPLATES_DIR).replace('\\', '/')
+        font_base = asset_base or f"file:///{templates_dir_str}"
+        for font_file in PDFManager.FONT_FILES:
+            css_content = css_content.replace(f"url('{font_file}')", f"url('{font_base}/{font_file}')")
+        PDFManager._css_cache[key] = (mtime, css_content)
+        return css_content
+
     @staticmethod
     def render_template(
         data: dict[str, Any],
         template_name: str = 'report_card.html',
         asset_base: str | None = None,
         css_name: str = 'styles.css',
+        profile: RenderProfile | None = None,
     ):
         """
         Render HTML template with student data using Jinja2
@@ -87,37 +138,28 @@ class PDFManager:
         Args:
             data (dict): Dictionary containing payload for the template
             template_name (str): Template filename to render
+            profile (RenderProfile): Receives the annotate and jinja stage timings
 
         Returns:
             str: Rendered HTML content
         """
+        profile = profile or RenderProfile(template_name)
         try:
-            PDFManager.annotate_font_sizes(data)
-
-            css_path = PDFManager.TEMPLATES_DIR / css_name
-            with open(css_path, 'r', encoding='utf-8') as handle:
-                css_content = handle.read()
-
-            templates_dir_str = str(PDFManager.TEMPLATES_DIR).replace('\\', '/')
-            if asset_base:
-                css_content = css_content.replace("url('Revue.ttf')", f"url('{asset_base}/Revue.ttf')")
-                css_content = css_content.replace("url('calibri-regular.ttf')", f"url('{asset_base}/calibri-regular.ttf')")
-                css_content = css_content.replace("url('calibri-italic.ttf')", f"url('{asset_base}/calibri-italic.ttf')")
-            else:
-                css_content = css_content.replace("url('Revue.ttf')", f"url('file:///{templates_dir_str}/Revue.ttf')")
-                css_content = css_content.replace("url('calibri-regular.ttf')", f"url('file:///{templates_dir_str}/calibri-regular.ttf')")
-                css_content = css_content.replace("url('calibri-italic.ttf')", f"url('file:///{templates_dir_str}/calibri-italic.ttf')")
-
-            env = Environment(loader=FileSystemLoader(str(PDFManager.TEMPLATES_DIR)))
-            template = env.get_template(template_name)
-
-            context: dict[str, Any] = dict(data)
-            context['css_content'] = css_content
-            context['template_dir'] = templates_dir_str
-            context['report'] = data
-            context['template_asset_base'] = asset_base
-
-            html_content = template.render(**context)
+            with profile.stage("annotate"):
+                PDFManager.annotate_font_sizes(data)
+
+            with profile.stage("jinja"):
+                css_content = PDFManager.stylesheet(css_name, asset_base)
+                templates_dir_str = str(PDFManager.TEMPLATES_DIR).replace('\\', '/')
+                template = PDFManager.environment().get_template(template_name)
+
+                context: dict[str, Any] = dict(data)
+                context['css_content'] = css_content
+                context['template_dir'] = templates_dir_str
+                context['report'] = data
+                context['template_asset_base'] = asset_base
+
+                html_content = template.render(**context)
             return html_content
 
         except Exception as exc:  # pragma: no cover
@@ -130,6 +172,7 @@ class PDFManager:
         data: dict[str, Any],
         template_name: str = 'report_card.html',
         css_name: str = 'styles.css',
+        profile: RenderProfile | None = None,
     ):
         """
         Generate PDF from HTML template
@@ -138,26 +181,38 @@ class PDFManager:
             filename (str): Base name for the PDF file
             data (dict): Dictionary with payload data
             template_name (str): Template filename to render
+            profile (RenderProfile): Filled with stage timings and sizes; pass one
+                in to read them back (e.g. for a Server-Timing header)
 
         Returns:
             tuple: (success: bool, message: str, pdf_path: str or None)
         """
+        profile = profile or RenderProfile(template_name)
+        profile.template_name = template_name
+        records = data.get('records')
+        profile.records = len(records) if isinstance(records, list) else 1
         try:
             from weasyprint import HTML
 
             output_dir = PDFManager.ensure_output_dir()
-            html_content = PDFManager.render_template(data, template_name, css_name=css_name)
-
-            temp_html = output_dir / "temp_report.html"
-            with open(temp_html, 'w', encoding='utf-8') as handle:
-                handle.write(html_content)
+            html_content = PDFManager.render_template(data, template_name, css_name=css_name, profile=profile)
+            profile.html_bytes = len(html_content.encode('utf-8'))
 
             pdf_filename = f"{filename}.pdf"
             pdf_path = output_dir / pdf_filename
 
-            HTML(str(temp_html)).write_pdf(str(pdf_path))
+            with profile.stage("layout"):
+                temp_html = output_dir / "temp_report.html"
+                with open(temp_html, 'w', encoding='utf-8') as handle:
+                    handle.write(html_content)
+                document = HTML(str(temp_html)).render(cache=PDFManager._image_cache)
+            with profile.stage("write"):
+                document.write_pdf(str(pdf_path))
             temp_html.unlink()
 
+            profile.pages = len(document.pages)
+            profile.output_bytes = pdf_path.stat().st_size
+            PDFManager.record_profile(profile, pdf_filename)
             return True, "PDF created successfully!", str(pdf_path)
 
         except ImportError:
@@ -166,3 +221,56 @@ class PDFManager:
         except Exception as exc:  # pragma: no cover
             logging.exception("Error generating PDF")
             return False, f"Error generating PDF: {exc}", None
+
+    @staticmethod
+    def record_profile(profile: RenderProfile, file_name: str):
+        """Feed the stage metrics and append the profile to the render log"""
+        for stage in ("annotate", "jinja", "layout", "write"):
+            if stage in profile.stages:
+                pdf_stage_latency.observe(profile.stages[stage] / 1000, profile.template_name, stage)
+        try:
+            profile.templates_version = templates_version(PDFManager.TEMPLATES_DIR)
+            if PDFManager.render_log is not None:
+                append_render_log(PDFManager.render_log, {"file": file_name, **profile.summary()})
+        except OSError as exc:  # pragma: no cover - the export itself succeeded
+            logging.warning("Unable to write render log: %s", exc)
+
+    @staticmethod
+    def warm_up(jobs: list[dict[str, Any]]) -> dict[str, float]:
+        """
+        Render sample payloads once so the first real export skips the cold work
+
+        Each job is {"name", "data", "template_name", "css_name", "asset_base",
+        "pdf"}. HTML rendering compiles the Jinja template and caches the
+        stylesheet; jobs with "pdf" also lay out the document in memory, which
+        imports WeasyPrint, initialises fontconfig, loads the @font-face files
+        and fills the shared image cache. Returns milliseconds per job; failures
+        are logged, not raised.
+        """
+        timings: dict[str, float] = {}
+        try:
+            from weasyprint import HTML
+        except ImportError:
+            HTML = None
+            logging.info("WeasyPrint not installed; warming HTML templates only")
+
+        for job in jobs:
+            started = time.perf_counter()
+            try:
+                html_content = PDFManager.render_template(
+                    dict(job["data"]),
+                    job["template_name"],
+                    asset_base=job.get("asset_base"),
+                    css_name=job.get("css_name", 'styles.css'),
+                )
+                if job.get("pdf") and HTML is not None:
+                    base_url = str(PDFManager.TEMPLATES_DIR)
+                    HTML(string=html_content, base_url=base_url).write_pdf(cache=PDFManager._image_cache)
+            except Exception:  # pragma: no cover
+                logging.exception("Render warm-up failed for %s", job["name"])
+                continue
+            timings[job["name"]] = round((time.perf_counter() - started) * 1000, 1)
+        return timings
+
+
+subscribe_db_config(PDFManager.reset_output_dir)
@@ -0,0 +1,241 @@
+"""
+Query Stats - Statement fingerprints, slow-statement tracking and optional EXPLAIN capture
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from psycopg2 import extensions
+
+SLOW_QUERY_MS = float(os.getenv("FAIZAN_SLOW_QUERY_MS", "100"))
+# Unset or 0 disables EXPLAIN capture; it re-runs the statement, so keep it for diagnosis sessions
+EXPLAIN_SLOW_MS = float(os.getenv("FAIZAN_EXPLAIN_SLOW_MS", "0") or 0)
+EXPLAIN_INTERVAL_SECONDS = 600
+MAX_FINGERPRINTS = 500
+SLOWEST_KEPT = 25
+SAMPLE_CHARS = 2000
+NORMALIZE_CHARS = 4096
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\(\w+\)s|%s")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_TUPLE = r"\(\s*\?(?:\s*,\s*\?)*\s*\)"
+_TUPLE_LIST = re.compile(rf"{_TUPLE}(?:\s*,\s*{_TUPLE})+")
+_ARRAY = re.compile(r"ARRAY\[\s*\?(?:\s*,\s*\?)*\s*\]", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+_OPEN_STRING = re.compile(r"'(?:[^']|'')*$")
+
+
+def statement_text(query: Any) -> str:
+    if isinstance(query, (bytes, bytearray, memoryview)):
+        return bytes(query).decode("utf-8", "replace")
+    return str(query)
+
+
+def redact(text: str) -> str:
+    """Text with every string literal replaced by ?, including one cut open at the end"""
+    return _OPEN_STRING.sub("?", _STRING.sub("?", text))
+
+
+def fingerprint(query: Any) -> str:
+    """
+    Statement text with literals and placeholders replaced by ?, lists collapsed and
+    whitespace squeezed, so every execution of one statement shares a fingerprint
+
+    `VALUES (1, 'a'), (2, 'b')` from execute_values and `ARRAY['x', 'y']` become
+    `VALUES (?, ...)` and `ARRAY[...]` whatever their length. Only the first
+    NORMALIZE_CHARS characters are looked at, which keeps huge batches cheap.
+    """
+    text = statement_text(query)[:NORMALIZE_CHARS]
+    text = _STRING.sub("?", text)
+    text = _PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _TUPLE_LIST.sub("(?, ...)", text)
+    text = _ARRAY.sub("ARRAY[...]", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+def explainable(text: str) -> bool:
+    """Only reads are explained: EXPLAIN ANALYZE executes the statement again"""
+    head = text.lstrip().split(None, 1)[0].upper() if text.strip() else ""
+    if head == "SELECT":
+        return True
+    if head == "WITH":
+        return not re.search(r"\b(INSERT|UPDATE|DELETE)\b", text, re.IGNORECASE)
+    return False
+
+
+class QueryStats:
+    """
+    In-memory statistics for every statement run through an instrumented cursor
+
+    Aggregates are kept per fingerprint (at most MAX_FINGERPRINTS; the one with the
+    least total time is dropped to make room). The slowest individual executions
+    over `slow_ms` are kept with the SQL as written, placeholders in place of bound
+    parameters and string literals redacted, so values such as passwords never
+    reach /admin/query-stats. With `explain_ms` set, a read that
+    takes longer is re-run once under EXPLAIN (ANALYZE, BUFFERS) on a separate
+    cursor inside a savepoint, at most every EXPLAIN_INTERVAL_SECONDS per fingerprint.
+    """
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS, explain_ms: float = EXPLAIN_SLOW_MS, keep: int = SLOWEST_KEPT):
+        self.slow_ms = slow_ms
+        self.explain_ms = explain_ms
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._fingerprints: dict[Any, str] = {}
+        self._statements: dict[str, dict[str, Any]] = {}
+        self._slowest: list[tuple[float, int, dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self.started = time.time()
+
+    def _fingerprint(self, query: Any) -> str:
+        # Most statements are constant strings, so their fingerprint is computed once
+        cacheable = isinstance(query, str) and len(query) <= NORMALIZE_CHARS
+        if cacheable:
+            cached = self._fingerprints.get(query)
+            if cached is not None:
+                return cached
+        value = fingerprint(query)
+        if cacheable:
+            if len(self._fingerprints) >= 1024:
+                self._fingerprints.clear()
+            self._fingerprints[query] = value
+        return value
+
+    def record(self, query: Any, elapsed: float, cursor: Any = None, failed: bool = False):
+        key = self._fingerprint(query)
+        elapsed_ms = elapsed * 1000
+        rows = getattr(cursor, "rowcount", -1) if cursor is not None and not failed else -1
+        with self._lock:
+            stats = self._statements.get(key)
+            if stats is None:
+                if len(self._statements) >= MAX_FINGERPRINTS:
+                    evicted = min(self._statements, key=lambda fp: self._statements[fp]["total_ms"])
+                    del self._statements[evicted]
+                stats = self._statements[key] = {
+                    "fingerprint": key,
+                    "calls": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "slow_calls": 0,
+                    "rows": 0,
+                    "last_at": 0.0,
+                    "explain": None,
+                }
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["last_at"] = time.time()
+            if failed:
+                stats["errors"] += 1
+            elif rows > 0:
+                stats["rows"] += rows
+            slow = elapsed_ms >= self.slow_ms
+            if slow:
+                stats["slow_calls"] += 1
+            explain = stats["explain"]
+            want_explain = (
+                not failed
+                and self.explain_ms > 0
+                and elapsed_ms >= self.explain_ms
+                and (explain is None or time.time() - explain["captured_at"] >= EXPLAIN_INTERVAL_SECONDS)
+            )
+            if want_explain:
+                # Claim the capture so concurrent slow calls do not explain the same statement
+                stats["explain"] = {"captured_at": time.time(), "plan": None, "pending": True}
+
+        if slow and cursor is not None:
+            entry = {
+                "fingerprint": key,
+                "elapsed_ms": round(elapsed_ms, 2),
+                "rows": rows,
+                "failed": failed,
+                "at": time.time(),
+                "statement": redact(statement_text(query)[:SAMPLE_CHARS]),
+            }
+            with self._lock:
+                item = (elapsed_ms, next(self._sequence), entry)
+                if len(self._slowest) < self.keep:
+                    heapq.heappush(self._slowest, item)
+                elif elapsed_ms > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, item)
+
+        if want_explain:
+            plan = self.explain(cursor)
+            with self._lock:
+                stats["explain"] = {"captured_at": time.time(), "plan": plan, "trigger_ms": round(elapsed_ms, 2)}
+
+    def explain(self, cursor: Any) -> Optional[str]:
+        """
+        EXPLAIN (ANALYZE, BUFFERS) of the statement the cursor just ran, or None when not possible
+
+        The executed SQL, parameters bound, is only the EXPLAIN input; the plan
+        quotes filter values, so its string literals are redacted as well.
+        """
+        executed = getattr(cursor, "query", None)
+        conn = getattr(cursor, "connection", None)
+        if not executed or conn is None or getattr(cursor, "name", None):
+            return None
+        text = statement_text(executed)
+        if not explainable(text):
+            return None
+        in_transaction = conn.get_transaction_status() == extensions.TRANSACTION_STATUS_INTRANS
+        if not conn.autocommit and not in_transaction:
+            return None
+        # A plain cursor class, so the EXPLAIN itself is neither timed nor recorded
+        explain_cursor = extensions.cursor(conn)
+        try:
+            if in_transaction:
+                explain_cursor.execute("SAVEPOINT query_stats_explain")
+            try:
+                explain_cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + text)
+                plan = redact("\n".join(row[0] for row in explain_cursor.fetchall()))
+            except Exception as exc:
+                if in_transaction:
+                    explain_cursor.execute("ROLLBACK TO SAVEPOINT query_stats_explain")
+                logging.info("EXPLAIN capture failed: %s", exc)
+                return None
+            if in_transaction:
+                explain_cursor.execute("RELEASE SAVEPOINT query_stats_explain")
+            return plan
+        except Exception:  # pragma: no cover - never break the caller's query over a diagnostic
+            logging.exception("EXPLAIN capture failed")
+            return None
+        finally:
+            explain_cursor.close()
+
+    def snapshot(self, limit: int = 20, sort: str = "total_ms") -> dict[str, Any]:
+        with self._lock:
+            statements = [dict(stats) for stats in self._statements.values()]
+            slowest = [dict(item[2]) for item in sorted(self._slowest, reverse=True)]
+        for stats in statements:
+            stats["mean_ms"] = round(stats["total_ms"] / stats["calls"], 3) if stats["calls"] else 0.0
+            stats["total_ms"] = round(stats["total_ms"], 3)
+            stats["max_ms"] = round(stats["max_ms"], 3)
+        statements.sort(key=lambda stats: stats.get(sort, 0), reverse=True)
+        return {
+            "since": self.started,
+            "slow_ms": self.slow_ms,
+            "explain_ms": self.explain_ms or None,
+            "fingerprints": len(statements),
+            "statements": statements[:limit],
+            "slowest": slowest[:limit],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._slowest.clear()
+            self.started = time.time()
+
+
+query_stats = QueryStats()
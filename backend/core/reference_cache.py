@@ -0,0 +1,56 @@
+"""
+Reference Cache - In-process cache for small, frequently read lookup data
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable
+
+
+class ReferenceCache:
+    """
+    Holds reference data (subjects, classes, roster stats) with an ETag per entry
+
+    Entries are loaded on first use and kept until a write endpoint invalidates
+    them, so repeated page loads cost no database round trip and, when the client
+    sends If-None-Match, no response body either. Callers may pass the database
+    version of the tables an entry is read from; an entry loaded under another
+    version is reloaded, which picks up writes made by other PCs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[Any, str, Any]] = {}
+        self._generation = 0
+
+    @staticmethod
+    def make_etag(value: Any) -> str:
+        raw = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()[:20]
+
+    def get(self, key: str, loader: Callable[[], Any], version: Any = None) -> tuple[Any, str]:
+        """Return (value, etag), calling loader() only when the entry is missing or from another version"""
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry is not None and entry[2] == version:
+            return entry[0], entry[1]
+        value = loader()
+        etag = self.make_etag(value)
+        with self._lock:
+            # Skip caching a value that an invalidation raced past while it was loading
+            if generation == self._generation:
+                self._entries[key] = (value, etag, version)
+        return value, etag
+
+    def invalidate(self, *keys: str):
+        """Drop the given entries, or every entry when no key is passed"""
+        with self._lock:
+            self._generation += 1
+            if not keys:
+                self._entries.clear()
+                return
+            for key in keys:
+                self._entries.pop(key, None)
@@ -0,0 +1,96 @@
+"""
+Render Profile - Timing breakdown and size counters for one PDF render
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+RENDER_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+_log_lock = threading.Lock()
+_templates_version: dict[str, tuple[float, str]] = {}
+
+
+class RenderProfile:
+    """
+    Where the time of one export went
+
+    Endpoints create one, time their own database fetch with stage("db") and
+    hand it to PDFManager.generate_pdf, which adds the annotate, jinja, layout
+    and write stages and the page, HTML, output and record counts.
+    """
+
+    def __init__(self, template_name: str = ""):
+        self.started = time.perf_counter()
+        self.template_name = template_name
+        self.stages: dict[str, float] = {}
+        self.records: Optional[int] = None
+        self.pages: Optional[int] = None
+        self.html_bytes: Optional[int] = None
+        self.output_bytes: Optional[int] = None
+        self.templates_version: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "template": self.template_name,
+            "templates_version": self.templates_version,
+            "stages_ms": {name: round(elapsed, 2) for name, elapsed in self.stages.items()},
+            "total_ms": round(self.total_ms, 2),
+            "records": self.records,
+            "pages": self.pages,
+            "html_bytes": self.html_bytes,
+            "output_bytes": self.output_bytes,
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. `db;dur=4.1, jinja;dur=22.0, ..., total;dur=410.3`"""
+        parts = [f"{name};dur={elapsed:.1f}" for name, elapsed in self.stages.items()]
+        parts.append(f"total;dur={self.total_ms:.1f}")
+        return ", ".join(parts)
+
+
+def templates_version(templates_dir: Path) -> str:
+    """Short hash of every template and stylesheet, recomputed only when one of them changes"""
+    files = sorted(path for path in templates_dir.iterdir() if path.suffix in {".html", ".css"})
+    newest = max((path.stat().st_mtime for path in files), default=0.0)
+    key = str(templates_dir)
+    cached = _templates_version.get(key)
+    if cached and cached[0] == newest:
+        return cached[1]
+    digest = hashlib.sha1()
+    for path in files:
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    version = digest.hexdigest()[:12]
+    _templates_version[key] = (newest, version)
+    return version
+
+
+def append_render_log(path: Path, entry: dict[str, Any]):
+    """One JSON object per line; the file is rotated to `<name>.1` past RENDER_LOG_MAX_BYTES"""
+    line = json.dumps({"at": datetime.now().isoformat(timespec="seconds"), **entry}, ensure_ascii=False)
+    with _log_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size > RENDER_LOG_MAX_BYTES:
+            path.replace(path.with_name(path.name + ".1"))
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
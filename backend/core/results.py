@@ -0,0 +1,223 @@
+"""
+Results - Server-side computation of subject totals, percentages, grades and ranks
+"""
+from __future__ import annotations
+
+import copy
+from typing import Any, Callable, Optional, Sequence
+
+from backend.core.grading import GRADE_BOUNDARIES, grades_for
+from backend.core.lazy import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+ABSENT = "Absent"
+
+
+def boundaries_from_config(config: dict[str, Any]) -> list[tuple[float, str]]:
+    """Read optional "grade_boundaries" ([{"min": 80, "grade": "A1"}, ...]) from config.json"""
+    entries = config.get("grade_boundaries") or []
+    boundaries = []
+    for entry in entries:
+        try:
+            boundaries.append((float(entry["min"]), str(entry["grade"])))
+        except (KeyError, TypeError, ValueError):
+            continue
+    if not boundaries:
+        return list(GRADE_BOUNDARIES)
+    return sorted(boundaries, key=lambda item: -item[0])
+
+
+def is_absent(value: Any) -> bool:
+    return str(value).strip().lower() == "absent"
+
+
+def parse_mark(value: Any) -> float:
+    """Marks arrive as strings; blanks count as 0 like the Reports page does"""
+    if value is None or is_absent(value):
+        return 0.0
+    text = str(value).strip().replace("%", "")
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return float("nan")
+
+
+def js_number(value: float) -> str:
+    """Match JavaScript Number.toString() for the totals the client used to send"""
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.10g}"
+
+
+class ResultEngine:
+    """
+    Recomputes report payloads for a whole class at once
+
+    Marks are laid out as (students x subjects) NumPy matrices, so obtained
+    marks, percentages, grades and grand totals are computed with array
+    operations instead of per-subject Python arithmetic. The rules mirror
+    computeRow/grandTotals in the Reports page: a subject with both components
+    absent is excluded from the totals, a single absent component counts as 0.
+    """
+
+    def __init__(
+        self,
+        boundaries: Optional[list[tuple[float, str]]] = None,
+        max_marks_options: Optional[Sequence[Any]] = None,
+        default_max_marks: Any = 100,
+        default_days: Optional[Callable[[Optional[str]], Optional[int]]] = None,
+    ):
+        self.boundaries = boundaries or list(GRADE_BOUNDARIES)
+        self.max_marks_options = {float(option) for option in (max_marks_options or [])}
+        self.default_max_marks = default_max_marks
+        self.default_days = default_days
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], default_days=None) -> "ResultEngine":
+        return cls(
+            boundaries=boundaries_from_config(config),
+            max_marks_options=config.get("max_marks_options") or [],
+            default_max_marks=config.get("default_max_marks", 100),
+            default_days=default_days,
+        )
+
+    def compute(
+        self, payloads: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[list[str]], list[list[str]]]:
+        """
+        Return recomputed copies of the payloads, per-payload warnings and per-payload errors
+
+        A payload with a mark that is neither a number nor Absent (a typo such as
+        "4O") gets an error and is returned unchanged: it must not be counted,
+        ranked or saved. rank is left untouched; use rank_percentages for the
+        class ranking.
+        """
+        records = [copy.deepcopy(payload) for payload in payloads]
+        warnings: list[list[str]] = [[] for _ in records]
+        errors: list[list[str]] = [[] for _ in records]
+        subjects: list[str] = []
+        positions: dict[str, int] = {}
+        for record in records:
+            for subject in (record.get("marks_data") or {}):
+                if subject not in positions:
+                    positions[subject] = len(subjects)
+                    subjects.append(subject)
+
+        count, width = len(records), len(subjects)
+        coursework = np.zeros((count, width))
+        termexam = np.zeros((count, width))
+        maxmarks = np.zeros((count, width))
+        present = np.zeros((count, width), dtype=bool)
+        cw_absent = np.zeros((count, width), dtype=bool)
+        te_absent = np.zeros((count, width), dtype=bool)
+
+        for row, record in enumerate(records):
+            for subject, entry in (record.get("marks_data") or {}).items():
+                col = positions[subject]
+                entry = entry or {}
+                present[row, col] = True
+                cw_absent[row, col] = is_absent(entry.get("coursework"))
+                te_absent[row, col] = is_absent(entry.get("termexam"))
+                coursework[row, col] = parse_mark(entry.get("coursework"))
+                termexam[row, col] = parse_mark(entry.get("termexam"))
+                raw_max = entry.get("maxmarks")
+                if raw_max in (None, "") or is_absent(raw_max):
+                    raw_max = self.default_max_marks
+                maxmarks[row, col] = parse_mark(raw_max)
+                if self.max_marks_options and not (cw_absent[row, col] and te_absent[row, col]):
+                    if maxmarks[row, col] not in self.max_marks_options:
+                        warnings[row].append(f"{subject}: max marks {raw_max} is not a configured option")
+                if np.isnan(coursework[row, col]) or np.isnan(termexam[row, col]) or np.isnan(maxmarks[row, col]):
+                    errors[row].append(f"{subject}: marks must be numbers or Absent")
+
+        coursework = np.nan_to_num(coursework)
+        termexam = np.nan_to_num(termexam)
+        maxmarks = np.nan_to_num(maxmarks)
+        both_absent = cw_absent & te_absent
+        counted = present & ~both_absent
+
+        obtained = coursework + termexam
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent = np.where(maxmarks > 0, obtained / maxmarks * 100, 0.0)
+        grades = grades_for(percent, self.boundaries)
+
+        total_cw = np.where(counted, coursework, 0).sum(axis=1)
+        total_te = np.where(counted, termexam, 0).sum(axis=1)
+        total_max = np.where(counted, maxmarks, 0).sum(axis=1)
+        total_obt = total_cw + total_te
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total_pct = np.where(total_max > 0, total_obt / total_max * 100, 0.0)
+        total_grades = grades_for(total_pct, self.boundaries)
+
+        for row, record in enumerate(records):
+            if errors[row]:
+                continue
+            marks_data = record.get("marks_data") or {}
+            for subject in marks_data:
+                col = positions[subject]
+                if both_absent[row, col]:
+                    marks_data[subject] = {
+                        "coursework": ABSENT,
+                        "termexam": ABSENT,
+                        "maxmarks": ABSENT,
+                        "obt": ABSENT,
+                        "pct": ABSENT,
+                        "grade": ABSENT,
+                        "is_absent": True,
+                    }
+                    continue
+                entry = marks_data[subject] or {}
+                marks_data[subject] = {
+                    **entry,
+                    "coursework": ABSENT if cw_absent[row, col] else js_number(coursework[row, col]),
+                    "termexam": ABSENT if te_absent[row, col] else js_number(termexam[row, col]),
+                    "maxmarks": js_number(maxmarks[row, col]),
+                    "obt": f"{obtained[row, col]:.1f}",
+                    "pct": f"{percent[row, col]:.1f}%",
+                    "grade": grades[row, col],
+                    "is_absent": False,
+                }
+            record["grand_totals"] = {
+                "cw": js_number(total_cw[row]),
+                "te": js_number(total_te[row]),
+                "max": js_number(total_max[row]),
+                "obt": js_number(total_obt[row]),
+                "pct": f"{total_pct[row]:.1f}%",
+                "grade": total_grades[row],
+            }
+            self._fill_attendance(record)
+        return records, warnings, errors
+
+    def _fill_attendance(self, record: dict[str, Any]):
+        total_days = str(record.get("total_days") or "").strip()
+        if (not total_days or total_days == "0") and self.default_days:
+            days = self.default_days(record.get("class_sec"))
+            if days:
+                record["total_days"] = total_days = str(days)
+        try:
+            absent = max(int(float(total_days)) - int(float(record.get("days_attended") or 0)), 0)
+        except ValueError:
+            return
+        record["days_absent"] = str(absent)
+
+
+def rank_percentages(percentages: Sequence[float], groups: Sequence[Any]) -> list[Optional[int]]:
+    """Competition rank (1, 2, 2, 4) by percentage within each group; NaN gets no rank"""
+    series = pd.Series(np.asarray(percentages, dtype=float))
+    ranks = series.groupby(pd.Series(list(groups), dtype=object)).rank(method="min", ascending=False)
+    return [None if np.isnan(value) else int(value) for value in ranks.to_numpy()]
+
+
+def payload_percentage(payload: dict[str, Any]) -> float:
+    """Grand total percentage of a stored payload, NaN when it has no counted marks"""
+    totals = payload.get("grand_totals") or {}
+    try:
+        if float(str(totals.get("max") or 0)) <= 0:
+            return float("nan")
+        return float(str(totals.get("pct") or "").replace("%", ""))
+    except ValueError:
+        return float("nan")
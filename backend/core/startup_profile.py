@@ -0,0 +1,177 @@
+"""
+Startup Profile - Startup phase timings and an optional per-module import breakdown
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+STARTUP_BUDGET_MS = float(os.getenv("FAIZAN_STARTUP_BUDGET_MS", "1000"))
+
+
+class _TimedLoader:
+    """Wraps a spec's loader for one import and hands the module back to the real loader"""
+
+    def __init__(self, timer: "ImportTimer", loader: Any, name: str):
+        self._timer = timer
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # The module never keeps the wrapper, so isinstance checks on __loader__ still work
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._timer._enter(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._leave(self._name)
+
+
+class ImportTimer:
+    """
+    A meta path finder that times every module executed while it is installed
+
+    Self time excludes nested imports; cumulative time includes them, the same
+    split as `python -X importtime`, but usable inside the frozen executable.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.modules: dict[str, dict[str, float]] = {}
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self, spec.loader, name)
+        return spec
+
+    def _stack(self) -> list[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name: str):
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _leave(self, name: str):
+        stack = self._stack()
+        _, started, nested = stack.pop()
+        elapsed = time.perf_counter() - started
+        if stack:
+            stack[-1][2] += elapsed
+        with self._lock:
+            self.modules[name] = {
+                "self_ms": round((elapsed - nested) * 1000, 3),
+                "cumulative_ms": round(elapsed * 1000, 3),
+            }
+
+    def breakdown(self) -> list[dict[str, Any]]:
+        """Modules sorted by self time, the order that shows what to defer first"""
+        with self._lock:
+            rows = [{"module": name, **timings} for name, timings in self.modules.items()]
+        return sorted(rows, key=lambda row: row["self_ms"], reverse=True)
+
+
+class StartupProfile:
+    """
+    Wall-clock marks from module load to the first request being servable
+
+    Marks are always recorded and summarised against the startup budget in the
+    log. With FAIZAN_PROFILE_STARTUP set, an ImportTimer is installed as well and
+    the per-module breakdown is written to a JSON file: the variable's value when
+    it is a path, otherwise startup-profile.json in the log directory.
+    """
+
+    def __init__(self, budget_ms: float = STARTUP_BUDGET_MS):
+        self.started = time.perf_counter()
+        self.budget_ms = budget_ms
+        self.marks: dict[str, float] = {}
+        self.timer: Optional[ImportTimer] = None
+        self.report_path: Optional[Path] = None
+
+    def install_from_env(self, default_dir: Path | None = None):
+        value = os.getenv("FAIZAN_PROFILE_STARTUP", "").strip()
+        if not value or value.lower() in {"0", "false", "no", "off"}:
+            return
+        if value.lower() in {"1", "true", "yes", "on"}:
+            self.report_path = Path(default_dir or Path.cwd()) / "startup-profile.json"
+        else:
+            self.report_path = Path(value)
+        self.timer = ImportTimer()
+        self.timer.install()
+
+    def mark(self, phase: str):
+        self.marks.setdefault(phase, round((time.perf_counter() - self.started) * 1000, 1))
+
+    def summary(self) -> dict[str, Any]:
+        total = max(self.marks.values(), default=0.0)
+        return {
+            "phases_ms": dict(self.marks),
+            "total_ms": total,
+            "budget_ms": self.budget_ms,
+            "within_budget": total <= self.budget_ms,
+        }
+
+    def finish(self, phase: str = "ready") -> dict[str, Any]:
+        """Record the final mark, log the budget summary and write the import breakdown"""
+        self.mark(phase)
+        summary = self.summary()
+        phases = ", ".join(f"{name} {elapsed:.0f} ms" for name, elapsed in summary["phases_ms"].items())
+        log = logging.info if summary["within_budget"] else logging.warning
+        log("Startup: %s (budget %.0f ms)", phases, self.budget_ms)
+        if self.timer is not None:
+            self.timer.uninstall()
+            self.write_report(summary)
+        return summary
+
+    def write_report(self, summary: dict[str, Any]):
+        modules = self.timer.breakdown()
+        report = {**summary, "module_count": len(modules), "modules": modules}
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        except OSError as exc:
+            logging.warning("Unable to write startup profile %s: %s", self.report_path, exc)
+            return
+        slowest = ", ".join(f"{row['module']} {row['self_ms']:.0f} ms" for row in modules[:10])
+        logging.info("Startup profile written to %s; slowest imports: %s", self.report_path, slowest)
+
+
+startup_profile = StartupProfile()
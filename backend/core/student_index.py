@@ -0,0 +1,238 @@
+"""
+Student Index - In-memory prefix/trigram index for name and G.R No suggestions
+"""
+from __future__ import annotations
+
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Any, Iterable, Optional
+
+TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(value: Optional[str]) -> str:
+    return " ".join(TOKEN_SPLIT.split((value or "").lower())).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[idx:idx + 3] for idx in range(len(padded) - 2)}
+
+
+class StudentIndex:
+    """
+    Autocomplete index over student_name, father_name and gr_no
+
+    Each field keeps a sorted list of distinct tokens plus a posting set per
+    token, so a prefix lookup is a bisect, a short scan over distinct tokens and
+    set unions/intersections done in C. Ranking works tier by tier (exact G.R No,
+    G.R No prefix, name prefix, name token, father name token, trigram) and only
+    the top-k of each tier is ordered with heapq.
+    """
+
+    # Posting groups: G.R No, first token of the student name, any student name token, any father name token
+    GROUPS = ("gr_no", "name_first", "name", "father")
+    MAX_PREFIX_TOKENS = 500
+    COMMON_TRIGRAM_SHARE = 0.25
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._students: dict[str, dict[str, Any]] = {}
+        self._sort_keys: dict[str, tuple[str, str]] = {}
+        self._tokens: dict[str, list[str]] = {group: [] for group in self.GROUPS}
+        self._postings: dict[str, dict[str, set[str]]] = {group: defaultdict(set) for group in self.GROUPS}
+        self._trigrams: dict[str, set[str]] = defaultdict(set)
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._students)
+
+    @staticmethod
+    def _build_entry(row: dict[str, Any]) -> dict[str, Any]:
+        gr_no = str(row.get("gr_no") or "").strip()
+        return {
+            "gr_no": gr_no,
+            "student_name": row.get("student_name"),
+            "father_name": row.get("father_name"),
+            "current_class_sec": row.get("current_class_sec"),
+            "status": row.get("status"),
+            "gr_no_norm": normalize_text(gr_no),
+            "student_name_norm": normalize_text(row.get("student_name")),
+            "father_name_norm": normalize_text(row.get("father_name")),
+        }
+
+    @staticmethod
+    def _entry_tokens(entry: dict[str, Any]) -> dict[str, set[str]]:
+        name_tokens = entry["student_name_norm"].split()
+        return {
+            "gr_no": {entry["gr_no_norm"]} if entry["gr_no_norm"] else set(),
+            "name_first": set(name_tokens[:1]),
+            "name": set(name_tokens),
+            "father": set(entry["father_name_norm"].split()),
+        }
+
+    @staticmethod
+    def _entry_trigrams(entry: dict[str, Any]) -> set[str]:
+        grams = trigrams(entry["student_name_norm"]) | trigrams(entry["father_name_norm"])
+        return grams | trigrams(entry["gr_no_norm"])
+
+    def _add_locked(self, entry: dict[str, Any], sort_tokens: bool):
+        gr_no = entry["gr_no"]
+        self._students[gr_no] = entry
+        self._sort_keys[gr_no] = (entry["student_name_norm"], gr_no)
+        for group, tokens in self._entry_tokens(entry).items():
+            postings = self._postings[group]
+            for token in tokens:
+                if token not in postings and sort_tokens:
+                    insort(self._tokens[group], token)
+                postings[token].add(gr_no)
+        for gram in self._entry_trigrams(entry):
+            self._trigrams[gram].add(gr_no)
+
+    def _remove_locked(self, gr_no: str):
+        entry = self._students.pop(gr_no, None)
+        if not entry:
+            return
+        self._sort_keys.pop(gr_no, None)
+        for group, tokens in self._entry_tokens(entry).items():
+            postings = self._postings[group]
+            for token in tokens:
+                bucket = postings.get(token)
+                if bucket is None:
+                    continue
+                bucket.discard(gr_no)
+                if not bucket:
+                    del postings[token]
+                    token_list = self._tokens[group]
+                    idx = bisect_left(token_list, token)
+                    if idx < len(token_list) and token_list[idx] == token:
+                        del token_list[idx]
+        for gram in self._entry_trigrams(entry):
+            bucket = self._trigrams.get(gram)
+            if bucket:
+                bucket.discard(gr_no)
+                if not bucket:
+                    del self._trigrams[gram]
+
+    def rebuild(self, rows: Iterable[dict[str, Any]]):
+        """Replace the whole index (startup or manual refresh)"""
+        entries = [self._build_entry(row) for row in rows]
+        with self._lock:
+            self._students = {}
+            self._sort_keys = {}
+            self._postings = {group: defaultdict(set) for group in self.GROUPS}
+            self._trigrams = defaultdict(set)
+            for entry in entries:
+                if entry["gr_no"]:
+                    self._add_locked(entry, sort_tokens=False)
+            self._tokens = {group: sorted(self._postings[group]) for group in self.GROUPS}
+            self.ready = True
+
+    def upsert(self, row: dict[str, Any]):
+        """Write-through hook for inserted or edited students"""
+        entry = self._build_entry(row)
+        if not entry["gr_no"]:
+            return
+        with self._lock:
+            self._remove_locked(entry["gr_no"])
+            self._add_locked(entry, sort_tokens=True)
+
+    def remove(self, gr_no: str):
+        """Write-through hook for deleted students"""
+        with self._lock:
+            self._remove_locked(str(gr_no).strip())
+
+    def _prefix_match(self, group: str, prefix: str) -> set[str]:
+        token_list = self._tokens[group]
+        postings = self._postings[group]
+        idx = bisect_left(token_list, prefix)
+        matched = []
+        while idx < len(token_list) and len(matched) < self.MAX_PREFIX_TOKENS:
+            token = token_list[idx]
+            if not token.startswith(prefix):
+                break
+            matched.append(postings[token])
+            idx += 1
+        if not matched:
+            return set()
+        return set().union(*matched)
+
+    def _trigram_match(self, query: str, exclude: set[str]) -> dict[str, float]:
+        grams = trigrams(query)
+        limit = max(1, int(len(self._students) * self.COMMON_TRIGRAM_SHARE))
+        buckets = [self._trigrams[gram] for gram in grams if gram in self._trigrams]
+        # Grams shared by a large part of the roster add cost but carry almost no signal
+        buckets = [bucket for bucket in buckets if len(bucket) <= limit]
+        if not buckets:
+            return {}
+        counts = Counter(chain.from_iterable(buckets))
+        threshold = max(2, (len(grams) + 1) // 2)
+        return {
+            gr_no: 40.0 * hits / len(grams)
+            for gr_no, hits in counts.items()
+            if hits >= threshold and gr_no not in exclude
+        }
+
+    def suggest(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Return the top `limit` students for a typed name or G.R No prefix"""
+        normalized = normalize_text(query)
+        if not normalized or limit <= 0:
+            return []
+        first, *rest = normalized.split()
+        with self._lock:
+            allowed: Optional[set[str]] = None
+            for token in rest:
+                matches = self._prefix_match("name", token) | self._prefix_match("father", token)
+                allowed = matches if allowed is None else allowed & matches
+
+            tiers: list[tuple[float, set[str]]] = []
+            if not rest:
+                exact = self._postings["gr_no"].get(first)
+                tiers.append((100.0, set(exact or ())))
+                tiers.append((90.0, self._prefix_match("gr_no", first)))
+            name_first = self._prefix_match("name_first", first)
+            if rest:
+                name_first = {
+                    gr_no for gr_no in name_first
+                    if self._students[gr_no]["student_name_norm"].startswith(normalized)
+                }
+            tiers.append((80.0, name_first))
+            tiers.append((70.0, self._prefix_match("name", first)))
+            tiers.append((50.0, self._prefix_match("father", first)))
+
+            ranked: list[tuple[str, float]] = []
+            seen: set[str] = set()
+            for score, candidates in tiers:
+                candidates = candidates - seen
+                if allowed is not None:
+                    candidates &= allowed
+                seen |= candidates
+                if len(ranked) >= limit or not candidates:
+                    continue
+                top = heapq.nsmallest(limit - len(ranked), candidates, key=self._sort_keys.__getitem__)
+                ranked.extend((gr_no, score) for gr_no in top)
+
+            if len(ranked) < limit and len(normalized) >= 3:
+                fuzzy = self._trigram_match(normalized, seen)
+                top = heapq.nsmallest(
+                    limit - len(ranked),
+                    fuzzy.items(),
+                    key=lambda item: (-item[1], self._sort_keys[item[0]]),
+                )
+                ranked.extend(top)
+
+            return [
+                {
+                    "gr_no": self._students[gr_no]["gr_no"],
+                    "student_name": self._students[gr_no]["student_name"],
+                    "father_name": self._students[gr_no]["father_name"],
+                    "current_class_sec": self._students[gr_no]["current_class_sec"],
+                    "status": self._students[gr_no]["status"],
+                    "score": round(score, 1),
+                }
+                for gr_no, score in ranked
+            ]
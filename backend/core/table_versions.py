@@ -0,0 +1,72 @@
+"""
+Table Versions - Read-only change markers for tables shared by every backend on the same database
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+# Tables whose in-memory caches (ETags, reference data, ranks, suggest index) must follow writes from other PCs
+VERSIONED_TABLES = (
+    "report_queue",
+    "report_results",
+    "diagnostics_queue",
+    "students",
+    "student_tombstones",
+    "subjects",
+)
+
+# Index-backed reads from each table; new rows show up here as soon as they commit
+TABLE_MARKERS = {
+    "report_queue": "SELECT MAX(id) FROM report_queue",
+    "report_results": "SELECT MAX(id) FROM report_results",
+    "diagnostics_queue": "SELECT MAX(id) FROM diagnostics_queue",
+    "students": "SELECT MAX(updated_at) FROM students",
+    "student_tombstones": "SELECT MAX(deleted_at) FROM student_tombstones",
+    "subjects": "SELECT COUNT(*) FROM subjects",
+}
+
+# Cumulative insert/update/delete counts, kept by Postgres for writes from every connection
+WRITE_COUNTERS_QUERY = """
+SELECT relname, n_tup_ins, n_tup_upd, n_tup_del
+FROM pg_stat_user_tables
+WHERE schemaname = current_schema() AND relname = ANY(%s)
+"""
+
+# Left behind by the earlier trigger-based versions, whose counter row serialized writes
+LEGACY_FUNCTION = "table_versions_bump"
+
+
+def read_table_versions(cursor, tables: Iterable[str]) -> dict[str, Optional[str]]:
+    """
+    Version of each table computed at read time; None for a table that does not exist
+
+    Combines the table's write counters from pg_stat_user_tables with its marker
+    from TABLE_MARKERS, in two queries for all tables. Nothing is written and no
+    row is locked, so probing never waits on, or holds up, an import or export
+    running on another PC. The counters reach the view when the writing
+    transaction ends (at the latest when its connection closes); the markers
+    already move on inserts before that.
+    """
+    wanted = list(tables)
+    cursor.execute(WRITE_COUNTERS_QUERY, (wanted,))
+    counters = {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+    marked = [table for table in wanted if table in counters and table in TABLE_MARKERS]
+    markers = {}
+    if marked:
+        cursor.execute("SELECT " + ", ".join(f"({TABLE_MARKERS[table]})::text" for table in marked))
+        markers = dict(zip(marked, cursor.fetchone()))
+    return {
+        table: ".".join(str(value) for value in (*counters[table], markers.get(table))) if table in counters else None
+        for table in wanted
+    }
+
+
+def drop_legacy_triggers(cursor) -> bool:
+    """Remove the trigger-based version table and its triggers; True when there was one to remove"""
+    cursor.execute("SELECT 1 FROM pg_proc WHERE proname = %s", (LEGACY_FUNCTION,))
+    if cursor.fetchone() is None:
+        return False
+    # CASCADE drops the per-table triggers that call the function
+    cursor.execute(f"DROP FUNCTION IF EXISTS {LEGACY_FUNCTION}() CASCADE")
+    cursor.execute("DROP TABLE IF EXISTS table_versions")
+    return True
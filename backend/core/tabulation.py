@@ -0,0 +1,164 @@
+"""
+Tabulation - Builds class mark sheets from saved report results
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Optional
+
+from backend.core.grading import grades_for
+from backend.core.lazy import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+MARK_COMPONENTS = [("coursework", "CW"), ("termexam", "TE"), ("obt", "Obt")]
+KEY_COLUMNS = ["session", "class_sec", "term", "gr_no", "student_name"]
+SUMMARY_COLUMNS = ["Total Obtained", "Total Max", "Percentage", "Grade", "Rank"]
+
+
+def flatten_marks(rows: Iterable[tuple]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split result rows into a per-result frame and a long per-subject frame
+
+    Args:
+        rows: tuples of (result_id, session, class_sec, term, gr_no, student_name, marks_data)
+
+    Returns:
+        tuple: (results frame indexed by result_id, long marks frame)
+    """
+    results: dict[str, list[Any]] = {"result_id": [], **{key: [] for key in KEY_COLUMNS}}
+    marks: dict[str, list[Any]] = {
+        "result_id": [],
+        "subject": [],
+        "maxmarks": [],
+        **{component: [] for component, _ in MARK_COMPONENTS},
+    }
+
+    for result_id, session, class_sec, term, gr_no, student_name, marks_data in rows:
+        results["result_id"].append(result_id)
+        results["session"].append(session)
+        results["class_sec"].append(class_sec)
+        results["term"].append(term)
+        results["gr_no"].append(gr_no)
+        results["student_name"].append(student_name)
+        if not isinstance(marks_data, dict):
+            continue
+        for subject, entry in marks_data.items():
+            entry = entry or {}
+            marks["result_id"].append(result_id)
+            marks["subject"].append(subject)
+            marks["maxmarks"].append(entry.get("maxmarks"))
+            for component, _ in MARK_COMPONENTS:
+                marks[component].append(entry.get(component))
+
+    return pd.DataFrame(results).set_index("result_id"), pd.DataFrame(marks)
+
+
+def numeric(series: pd.Series) -> pd.Series:
+    """Parse mark strings such as '45', '45.5' or 'Absent' into floats (NaN when not numeric)"""
+    return pd.to_numeric(series.astype(str).str.strip(), errors="coerce")
+
+
+def build_tabulation(
+    rows: Iterable[tuple],
+    class_sort_key: Optional[Callable[[Any], Any]] = None,
+    boundaries: Optional[list[tuple[float, str]]] = None,
+) -> pd.DataFrame:
+    """
+    Pivot saved results into one mark sheet row per student with totals, grade and rank
+
+    class_sort_key orders the classes (e.g. ClassCatalog.sort_key); it is called once
+    per distinct class, not once per row. boundaries are the (min, grade) pairs from
+    config.json (see boundaries_from_config); the defaults apply when omitted.
+    """
+    results, marks = flatten_marks(rows)
+    if results.empty:
+        return pd.DataFrame(columns=KEY_COLUMNS + SUMMARY_COLUMNS)
+
+    subject_order = list(dict.fromkeys(marks["subject"])) if not marks.empty else []
+
+    if not marks.empty:
+        for component, _ in MARK_COMPONENTS:
+            parsed = numeric(marks[component])
+            marks[component] = parsed.where(parsed.notna(), marks[component])
+        obt = numeric(marks["obt"])
+        maxmarks = numeric(marks["maxmarks"]).where(obt.notna())
+        totals = pd.DataFrame({"obt": obt, "max": maxmarks, "result_id": marks["result_id"]})
+        totals = totals.groupby("result_id")[["obt", "max"]].sum(min_count=1)
+
+        wide = (
+            marks.drop_duplicates(["result_id", "subject"], keep="last")
+            .set_index(["result_id", "subject"])[[component for component, _ in MARK_COMPONENTS]]
+            .unstack("subject")
+        )
+        labels = dict(MARK_COMPONENTS)
+        columns = [
+            (component, subject)
+            for subject in subject_order
+            for component, _ in MARK_COMPONENTS
+            if (component, subject) in wide.columns
+        ]
+        wide = wide[columns]
+        wide.columns = [f"{subject} {labels[component]}" for component, subject in columns]
+    else:
+        totals = pd.DataFrame(columns=["obt", "max"], dtype=float)
+        wide = pd.DataFrame(index=results.index)
+
+    sheet = results.join(wide).join(totals)
+    total_obt = sheet.pop("obt").astype(float)
+    total_max = sheet.pop("max").astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(total_max > 0, total_obt / total_max * 100, np.nan)
+
+    sheet["Total Obtained"] = total_obt
+    sheet["Total Max"] = total_max
+    sheet["Percentage"] = np.round(pct, 1)
+    sheet["Grade"] = grades_for(pct, boundaries)
+    sheet["Rank"] = (
+        sheet.groupby(["session", "class_sec", "term"], dropna=False)["Percentage"]
+        .rank(method="min", ascending=False)
+        .astype("Int64")
+    )
+
+    class_order = sorted(sheet["class_sec"].dropna().unique(), key=class_sort_key)
+    positions = {class_sec: idx for idx, class_sec in enumerate(class_order)}
+    sheet["_class_order"] = sheet["class_sec"].map(positions)
+    sheet = sheet.sort_values(
+        ["session", "_class_order", "term", "Rank", "student_name"],
+        na_position="last",
+    )
+    return sheet.drop(columns="_class_order").reset_index(drop=True)
+
+
+def drop_empty_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Remove subject columns that have no marks (used for per-class sheets)"""
+    fixed = set(KEY_COLUMNS) | set(SUMMARY_COLUMNS)
+    keep = [column for column in frame.columns if column in fixed or frame[column].notna().any()]
+    return frame[keep]
+
+
+def sheet_name(class_sec: Any, term: Any, used: set[str]) -> str:
+    """Excel sheet titles are limited to 31 characters and cannot contain []:*?/\\"""
+    base = f"{class_sec or 'Unknown'} {term or ''}".strip()
+    for char in "[]:*?/\\":
+        base = base.replace(char, "-")
+    base = base[:31] or "Sheet"
+    name = base
+    suffix = 2
+    while name in used:
+        tail = f" ({suffix})"
+        name = base[: 31 - len(tail)] + tail
+        suffix += 1
+    used.add(name)
+    return name
+
+
+def write_tabulation_xlsx(frame: pd.DataFrame, path) -> None:
+    """Write one worksheet per class and term, each with only its own subjects"""
+    used: set[str] = set()
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        if frame.empty:
+            frame.to_excel(writer, sheet_name="Tabulation", index=False)
+            return
+        for (class_sec, term), group in frame.groupby(["class_sec", "term"], sort=False, dropna=False):
+            drop_empty_columns(group).to_excel(writer, sheet_name=sheet_name(class_sec, term, used), index=False)
@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Loaded through LazyModule proxies, which PyInstaller's import scan cannot see
+    hiddenimports=['pandas', 'numpy'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1 @@
+"""Benchmarks for Faizan Report Studio"""
@@ -0,0 +1,102 @@
+"""
+Import responsiveness check - polls /health while a large roster is previewed
+
+Start the backend first (python -m uvicorn backend.app:app), then run:
+    python -m benchmarks.import_health_latency --rows 50000
+
+The preview endpoint only reads from the database, so the check is safe to run
+against a development database.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+import uuid
+import urllib.request
+from io import BytesIO
+
+from benchmarks.roster_formats import build_roster
+
+
+def encode_multipart(field: str, filename: str, content: bytes, content_type: str) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = BytesIO()
+    body.write(f"--{boundary}\r\n".encode())
+    body.write(f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'.encode())
+    body.write(f"Content-Type: {content_type}\r\n\r\n".encode())
+    body.write(content)
+    body.write(f"\r\n--{boundary}--\r\n".encode())
+    return body.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+
+def poll_health(base_url: str, stop: threading.Event, samples: list[float], interval: float):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(f"{base_url}/health", timeout=30) as response:
+                response.read()
+            samples.append((time.perf_counter() - started) * 1000)
+        except Exception as exc:  # pragma: no cover - reported, not fatal
+            print(f"/health failed: {exc}")
+        time.sleep(interval)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between /health polls")
+    parser.add_argument("--max-p95-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    roster = build_roster(args.rows)
+    buffer = BytesIO()
+    if args.format == "csv":
+        roster.to_csv(buffer, index=False)
+        content_type = "text/csv"
+    else:
+        roster.to_excel(buffer, index=False)
+        content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    body, header = encode_multipart("file", f"roster.{args.format}", buffer.getvalue(), content_type)
+
+    samples: list[float] = []
+    stop = threading.Event()
+    poller = threading.Thread(target=poll_health, args=(args.base_url, stop, samples, args.interval), daemon=True)
+    poller.start()
+
+    request = urllib.request.Request(
+        f"{args.base_url}/students/import/preview",
+        data=body,
+        headers={"Content-Type": header},
+        method="POST",
+    )
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=600) as response:
+        response.read()
+    import_s = time.perf_counter() - started
+    stop.set()
+    poller.join()
+
+    if not samples:
+        raise SystemExit("No /health samples were collected")
+    p95 = percentile(samples, 95)
+    print(f"Preview of {args.rows} rows took {import_s:.2f}s")
+    print(
+        f"/health during import: n={len(samples)} median={statistics.median(samples):.1f}ms "
+        f"p95={p95:.1f}ms max={max(samples):.1f}ms"
+    )
+    if p95 > args.max_p95_ms:
+        raise SystemExit(f"/health p95 {p95:.1f}ms exceeds {args.max_p95_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+JSON pipeline benchmark - /reports/queue/items on a queue of report payloads
+
+Compares, per request, the old path (stdlib json decoding in psycopg2,
+RealDictRow copies, jsonable_encoder, stdlib rendering) with the orjson
+decoder plus FastJSONResponse, and with splicing payload::text as-is.
+The database is simulated by the JSON text Postgres would send.
+
+Usage:
+    python -m benchmarks.json_pipeline --items 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.app import row_to_dict
+from backend.core.fast_json import FastJSONResponse, loads, orjson, raw_items_response
+from backend.core.results import ResultEngine
+
+SUBJECTS = ["English", "Urdu", "Mathematics", "Science/Env.Sci", "S.St/P.St", "Islamiyat", "Sindhi", "Computer"]
+
+
+def build_queue(items: int, seed: int = 42) -> list[tuple[int, str]]:
+    """(id, payload text) rows shaped like report_queue"""
+    rng = random.Random(seed)
+    drafts = []
+    for idx in range(items):
+        drafts.append(
+            {
+                "student_name": f"Student {idx}",
+                "father_name": f"Father {idx}",
+                "class_sec": f"{rng.choice(['IV', 'V', 'VI'])}-{rng.choice('AB')}",
+                "session": "2025-2026",
+                "gr_no": str(10000 + idx),
+                "rank": "N/A",
+                "total_days": "220",
+                "days_attended": str(rng.randint(150, 220)),
+                "days_absent": "0",
+                "term": "Mid Year",
+                "marks_data": {
+                    subject: {
+                        "coursework": str(rng.randint(5, 20)),
+                        "termexam": str(rng.randint(20, 80)),
+                        "maxmarks": "100",
+                    }
+                    for subject in SUBJECTS
+                },
+                "conduct": "Excellent",
+                "performance": "Good",
+                "progress": "Satisfactory",
+                "remarks": "Shows steady progress in all subjects and participates actively in class.",
+                "status": "Passed",
+                "date": "15 March 2026",
+                "grand_totals": {},
+            }
+        )
+    records, _, _ = ResultEngine().compute(drafts)
+    return [(idx + 1, json.dumps(record)) for idx, record in enumerate(records)]
+
+
+def stdlib_dict_rows(rows: list[tuple[int, str]]) -> bytes:
+    fetched = [{"id": row_id, "payload": json.loads(text)} for row_id, text in rows]
+    content = {"items": [row_to_dict(row) for row in fetched]}
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def orjson_tuple_rows(rows: list[tuple[int, str]]) -> bytes:
+    fetched = [(row_id, loads(text)) for row_id, text in rows]
+    return FastJSONResponse({"items": [{"id": row_id, "payload": payload} for row_id, payload in fetched]}).body
+
+
+def spliced_rows(rows: list[tuple[int, str]]) -> bytes:
+    return raw_items_response(rows, ("id", "payload"), raw=("payload",)).body
+
+
+def measure(func, rows, repeat: int) -> dict[str, float]:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(func(rows))
+        timings.append(time.perf_counter() - started)
+    return {"median_ms": statistics.median(timings) * 1000, "best_ms": min(timings) * 1000, "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    rows = build_queue(args.items)
+    # Every pipeline must describe the same data
+    reference = json.loads(stdlib_dict_rows(rows))
+    for func in (orjson_tuple_rows, spliced_rows):
+        assert json.loads(func(rows)) == reference, func.__name__
+
+    print(f"Queue items: {args.items} (orjson {'available' if orjson else 'missing, stdlib fallback'})")
+    print(f"{'pipeline':<20}{'median ms':>12}{'best ms':>10}{'KiB':>10}")
+    for name, func in (
+        ("stdlib + dict rows", stdlib_dict_rows),
+        ("orjson + tuples", orjson_tuple_rows),
+        ("payload::text splice", spliced_rows),
+    ):
+        stats = measure(func, rows, args.repeat)
+        print(f"{name:<20}{stats['median_ms']:>12.2f}{stats['best_ms']:>10.2f}{stats['bytes'] / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
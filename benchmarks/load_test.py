@@ -0,0 +1,278 @@
+"""
+End-of-term load test - concurrent teachers previewing and saving while the office exports
+
+Each simulated user loops over a weighted mix of requests with a short think
+time. Teachers enter synthetic marks and preview or save them, search students
+and open analytics; now and then someone runs a batch export. /reports/save and
+/reports/export write to the database and output folder, so point this at a
+scratch database (e.g. one seeded by benchmarks.suite).
+
+Start the backend first (python -m uvicorn backend.app:app), then run:
+    python -m benchmarks.load_test --users 20 --duration 120
+    python -m benchmarks.load_test --mix preview=50,search=50 --output load.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.roster_formats import LAST_NAMES
+from benchmarks.synthetic import TERMS, SyntheticSchool
+
+DEFAULT_MIX = "preview=35,save=20,search=25,analytics=15,export=5"
+# Export answers 400 when another export has already drained the queue; that is not a failure
+EXPECTED_STATUSES = {"export": {200, 400}}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class Recorder:
+    """Thread-safe latency and status samples per endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {}
+        self.statuses: dict[str, Counter] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, name: str, elapsed_ms: float, status: Any, failed: bool):
+        with self._lock:
+            self.latencies.setdefault(name, []).append(elapsed_ms)
+            self.statuses.setdefault(name, Counter())[str(status)] += 1
+            self.errors[name] = self.errors.get(name, 0) + int(failed)
+
+    def total(self) -> int:
+        with self._lock:
+            return sum(len(samples) for samples in self.latencies.values())
+
+    def summary(self, elapsed_s: float) -> dict[str, Any]:
+        with self._lock:
+            names = sorted(self.latencies)
+            endpoints = {}
+            for name in names:
+                samples = self.latencies[name]
+                endpoints[name] = {
+                    "requests": len(samples),
+                    "throughput_rps": round(len(samples) / elapsed_s, 2),
+                    "error_rate": round(self.errors[name] / len(samples), 4),
+                    "p50_ms": round(percentile(samples, 50), 1),
+                    "p95_ms": round(percentile(samples, 95), 1),
+                    "p99_ms": round(percentile(samples, 99), 1),
+                    "mean_ms": round(statistics.fmean(samples), 1),
+                    "max_ms": round(max(samples), 1),
+                    "statuses": dict(self.statuses[name]),
+                }
+            everything = [value for samples in self.latencies.values() for value in samples]
+            errors = sum(self.errors.values())
+        overall = {
+            "requests": len(everything),
+            "throughput_rps": round(len(everything) / elapsed_s, 2) if elapsed_s else 0.0,
+            "error_rate": round(errors / len(everything), 4) if everything else 0.0,
+        }
+        if everything:
+            overall.update(
+                p50_ms=round(percentile(everything, 50), 1),
+                p95_ms=round(percentile(everything, 95), 1),
+                p99_ms=round(percentile(everything, 99), 1),
+            )
+        return {"overall": overall, "endpoints": endpoints}
+
+
+class Workload:
+    """Builds the requests of each action from a small synthetic school"""
+
+    def __init__(self, base_url: str, students: int, seed: int):
+        self.base_url = base_url.rstrip("/")
+        self.school = SyntheticSchool(students, sessions=1, seed=seed)
+        rows = self.school.student_rows()
+        self.drafts = [
+            draft
+            for term in TERMS
+            for draft in self.school.report_drafts(self.school.current_session, term, rows)
+        ]
+        self.classes = sorted({row["current_class_sec"] for row in rows})
+        self.actions: dict[str, Callable[[random.Random], urllib.request.Request]] = {
+            "preview": self.preview,
+            "save": self.save,
+            "search": self.search,
+            "analytics": self.analytics,
+            "export": self.export,
+        }
+
+    def _json(self, path: str, payload: dict[str, Any]) -> urllib.request.Request:
+        return urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+
+    def _get(self, path: str, params: dict[str, Any]) -> urllib.request.Request:
+        query = urllib.parse.urlencode({key: value for key, value in params.items() if value is not None})
+        return urllib.request.Request(f"{self.base_url}{path}?{query}")
+
+    def preview(self, rng: random.Random) -> urllib.request.Request:
+        return self._json("/reports/preview", rng.choice(self.drafts))
+
+    def save(self, rng: random.Random) -> urllib.request.Request:
+        return self._json("/reports/save?overwrite=true", rng.choice(self.drafts))
+
+    def search(self, rng: random.Random) -> urllib.request.Request:
+        if rng.random() < 0.5:
+            return self._get("/students", {"search": rng.choice(LAST_NAMES).lower(), "limit": 50})
+        return self._get("/students", {"class_sec": rng.choice(self.classes), "status": "Active", "limit": 200})
+
+    def analytics(self, rng: random.Random) -> urllib.request.Request:
+        return self._get(
+            "/reports/analytics",
+            {
+                "session": self.school.current_session,
+                "class_sec": rng.choice(self.classes) if rng.random() < 0.7 else None,
+                "term": rng.choice(TERMS),
+            },
+        )
+
+    def export(self, rng: random.Random) -> urllib.request.Request:
+        return urllib.request.Request(f"{self.base_url}/reports/export", data=b"", method="POST")
+
+
+def run_user(
+    user: int,
+    workload: Workload,
+    mix: dict[str, float],
+    recorder: Recorder,
+    deadline: float,
+    think: float,
+    timeout: float,
+    seed: int,
+):
+    rng = random.Random(seed * 1000 + user)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        request = workload.actions[name](rng)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                status: Any = response.status
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            status = exc.code
+        except Exception as exc:  # connection refused, timeout, reset
+            status = type(exc).__name__
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        failed = status not in EXPECTED_STATUSES.get(name, {200})
+        recorder.record(name, elapsed_ms, status, failed)
+        if think:
+            time.sleep(rng.uniform(0, 2 * think))
+
+
+def print_summary(summary: dict[str, Any]):
+    print(f"\n{'endpoint':<12}{'reqs':>8}{'rps':>8}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  statuses")
+    for name, stats in summary["endpoints"].items():
+        statuses = " ".join(f"{status}:{count}" for status, count in sorted(stats["statuses"].items()))
+        print(
+            f"{name:<12}{stats['requests']:>8}{stats['throughput_rps']:>8.1f}{stats['error_rate']:>8.1%}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}  {statuses}"
+        )
+    overall = summary["overall"]
+    print(
+        f"{'all':<12}{overall['requests']:>8}{overall['throughput_rps']:>8.1f}{overall['error_rate']:>8.1%}"
+        f"{overall.get('p50_ms', 0):>9.1f}{overall.get('p95_ms', 0):>9.1f}{overall.get('p99_ms', 0):>9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to run")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which users are started")
+    parser.add_argument("--think", type=float, default=0.5, help="Mean seconds between a user's requests")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted actions (default {DEFAULT_MIX})")
+    parser.add_argument("--students", type=int, default=500, help="Size of the synthetic school the payloads come from")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", type=Path, help="Write the summary JSON here")
+    parser.add_argument("--max-error-rate", type=float, help="Exit non-zero above this overall error rate (e.g. 0.01)")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    workload = Workload(args.base_url, args.students, args.seed)
+    unknown = set(mix) - set(workload.actions)
+    if unknown:
+        parser.error(f"unknown actions in --mix: {', '.join(sorted(unknown))}; choose from {', '.join(workload.actions)}")
+
+    with urllib.request.urlopen(f"{workload.base_url}/health", timeout=10) as response:
+        response.read()
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + args.ramp + args.duration
+    threads = []
+    for user in range(args.users):
+        thread = threading.Thread(
+            target=run_user,
+            args=(user, workload, mix, recorder, deadline, args.think, args.timeout, args.seed),
+            daemon=True,
+        )
+        threads.append(thread)
+        thread.start()
+        if args.users > 1:
+            time.sleep(args.ramp / args.users)
+
+    while any(thread.is_alive() for thread in threads):
+        time.sleep(min(10.0, max(0.1, deadline - time.perf_counter())))
+        elapsed = time.perf_counter() - started
+        if time.perf_counter() < deadline:
+            print(f"{elapsed:6.0f}s  {recorder.total()} requests")
+    for thread in threads:
+        thread.join(args.timeout)
+    elapsed = time.perf_counter() - started
+
+    summary = recorder.summary(elapsed)
+    summary["config"] = {
+        "base_url": workload.base_url,
+        "users": args.users,
+        "duration_s": round(elapsed, 1),
+        "think_s": args.think,
+        "mix": mix,
+        "students": args.students,
+        "seed": args.seed,
+    }
+    print_summary(summary)
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"Summary written to {args.output}")
+    if args.max_error_rate is not None and summary["overall"]["error_rate"] > args.max_error_rate:
+        raise SystemExit(
+            f"Error rate {summary['overall']['error_rate']:.2%} exceeds {args.max_error_rate:.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Roster import benchmark - compares Excel, CSV and Parquet parsing
+
+Usage:
+    python -m benchmarks.roster_formats --rows 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from io import BytesIO
+from typing import Sequence
+
+import pandas as pd
+
+from backend.app import REQUIRED_STUDENT_COLUMNS, extract_student_rows
+
+CLASSES = ["NUR-A", "KG-A", "I-A", "II-B", "III-A", "IV-B", "V-A", "VI-A", "VII-B", "VIII-A", "IX-A", "X-B"]
+FIRST_NAMES = ["Ali", "Ayesha", "Hamza", "Fatima", "Usman", "Zainab", "Bilal", "Maryam", "Hassan", "Sana"]
+LAST_NAMES = ["Khan", "Shah", "Ahmed", "Siddiqui", "Qureshi", "Memon", "Baloch", "Raza"]
+
+
+def build_roster(
+    rows: int,
+    seed: int = 42,
+    classes: Sequence[str] = CLASSES,
+    session: str = "2025-2026",
+    first_gr_no: int = 10000,
+) -> pd.DataFrame:
+    rng = random.Random(seed)
+    records = []
+    for idx in range(rows):
+        last = rng.choice(LAST_NAMES)
+        records.append(
+            {
+                "gr_no": str(first_gr_no + idx),
+                "student_name": f"{rng.choice(FIRST_NAMES)} {last}",
+                "father_name": f"{rng.choice(FIRST_NAMES)} {last}",
+                "current_class_sec": rng.choice(classes),
+                "current_session": session,
+                "date_of_birth": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2008, 2021)}",
+                "contact_number_resident": f"0300{rng.randint(1000000, 9999999)}",
+                "contact_number_neighbour": f"0321{rng.randint(1000000, 9999999)}",
+                "contact_number_relative": None,
+                "contact_number_other1": None,
+                "contact_number_other2": None,
+                "contact_number_other3": None,
+                "contact_number_other4": None,
+                "address": f"House {rng.randint(1, 400)}, Block {rng.choice('ABCDEFG')}, Karachi",
+            }
+        )
+    return pd.DataFrame(records, columns=REQUIRED_STUDENT_COLUMNS)
+
+
+def encode(df: pd.DataFrame, fmt: str) -> bytes:
+    buffer = BytesIO()
+    if fmt == "xlsx":
+        df.to_excel(buffer, index=False)
+    elif fmt == "csv":
+        df.to_csv(buffer, index=False)
+    else:
+        df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def measure(content: bytes, filename: str, repeat: int) -> dict[str, float]:
+    timings = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        extract_student_rows(content, filename)
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "best_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "peak_mib": peak / (1024 * 1024),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    roster = build_roster(args.rows)
+    print(f"Roster rows: {args.rows}")
+    print(f"{'format':<10}{'size KiB':>12}{'best s':>10}{'mean s':>10}{'peak MiB':>10}")
+    for fmt in ("xlsx", "csv", "parquet"):
+        try:
+            content = encode(roster, fmt)
+        except ImportError as exc:
+            print(f"{fmt:<10} skipped ({exc})")
+            continue
+        stats = measure(content, f"roster.{fmt}", args.repeat)
+        print(
+            f"{fmt:<10}{len(content) / 1024:>12.1f}{stats['best_s']:>10.3f}"
+            f"{stats['mean_s']:>10.3f}{stats['peak_mib']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+"""
+Benchmark suite - scenario timings against a local Postgres seeded with synthetic data
+
+The database is emptied and reseeded, so the suite refuses to run unless the
+database name contains "bench" (or --force is given):
+    createdb faizan_bench
+    python -m benchmarks.suite --db-name faizan_bench --students 2000 --output bench.json
+    python -m benchmarks.suite --db-name faizan_bench --baseline bench.json
+
+Requests go through the app in-process (TestClient), so the numbers cover
+routing, SQL, pandas and rendering but not the network. PDF scenarios are
+skipped when WeasyPrint is not installed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from benchmarks.synthetic import TERMS, SyntheticSchool
+
+IMPORT_GR_NO = 900000
+IMPORT_ROWS = 500
+
+STUDENTS_DDL = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id SERIAL PRIMARY KEY,
+    gr_no TEXT UNIQUE NOT NULL,
+    student_name TEXT,
+    father_name TEXT,
+    current_class_sec TEXT,
+    current_session TEXT,
+    status TEXT DEFAULT 'Active',
+    joining_date DATE,
+    left_date DATE,
+    left_reason TEXT,
+    date_of_birth DATE,
+    contact_number_resident TEXT,
+    contact_number_neighbour TEXT,
+    contact_number_relative TEXT,
+    contact_number_other1 TEXT,
+    contact_number_other2 TEXT,
+    contact_number_other3 TEXT,
+    contact_number_other4 TEXT,
+    address TEXT,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+)
+"""
+STUDENT_COLUMNS = [
+    "gr_no",
+    "student_name",
+    "father_name",
+    "current_class_sec",
+    "current_session",
+    "date_of_birth",
+    "contact_number_resident",
+    "contact_number_neighbour",
+    "contact_number_relative",
+    "contact_number_other1",
+    "contact_number_other2",
+    "contact_number_other3",
+    "contact_number_other4",
+    "address",
+    "status",
+]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def weasyprint_available() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+class BenchDatabase:
+    """Schema setup and seeding through the app's own get_connection and ensure_* helpers"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def execute(self, *statements: str):
+        conn = self.backend.get_connection()
+        try:
+            cursor = conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def prepare(self):
+        self.execute(STUDENTS_DDL)
+        self.backend.ensure_report_queue_table()
+        self.backend.ensure_report_results_table()
+        self.backend.ensure_diagnostics_queue_table()
+        self.backend.ensure_student_sync_schema()
+        self.execute(
+            "TRUNCATE students, student_tombstones, report_queue, report_results, diagnostics_queue RESTART IDENTITY"
+        )
+
+    def seed(self, school: SyntheticSchool) -> dict[str, int]:
+        from psycopg2 import extras
+
+        students = school.student_rows()
+        conn = self.backend.get_connection()
+        try:
+            cursor = conn.cursor()
+            extras.execute_values(
+                cursor,
+                f"INSERT INTO students ({', '.join(STUDENT_COLUMNS)}) VALUES %s",
+                [tuple(row.get(column) for column in STUDENT_COLUMNS) for row in students],
+                page_size=1000,
+            )
+            results = 0
+            batch = []
+            for record in school.report_results(students):
+                batch.append(
+                    (
+                        record["gr_no"],
+                        record["student_name"],
+                        record["class_sec"],
+                        record["session"],
+                        record["term"],
+                        json.dumps(record),
+                    )
+                )
+                if len(batch) >= 2000:
+                    results += self._insert_results(cursor, batch)
+                    batch = []
+            results += self._insert_results(cursor, batch)
+            diagnostics = school.diagnostics_payloads(students)
+            extras.execute_values(
+                cursor,
+                "INSERT INTO diagnostics_queue (payload) VALUES %s",
+                [(json.dumps(payload),) for payload in diagnostics],
+            )
+            conn.commit()
+            cursor.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+        return {"students": len(students), "report_results": results, "diagnostics_queue": len(diagnostics)}
+
+    @staticmethod
+    def _insert_results(cursor, batch: list[tuple]) -> int:
+        from psycopg2 import extras
+
+        if batch:
+            extras.execute_values(
+                cursor,
+                "INSERT INTO report_results (gr_no, student_name, class_sec, session, term, payload) VALUES %s",
+                batch,
+                page_size=1000,
+            )
+        return len(batch)
+
+    def scalar(self, query: str, params: tuple = ()) -> Any:
+        conn = self.backend.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def queue_reports(self, session: str, term: str, limit: int) -> int:
+        """Fill report_queue with saved results, as if teachers had just saved them"""
+        self.execute("DELETE FROM report_queue")
+        conn = self.backend.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO report_queue (payload)
+                SELECT payload FROM report_results
+                WHERE session = %s AND term = %s
+                ORDER BY id
+                LIMIT %s
+                """,
+                (session, term, limit),
+            )
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Any],
+        setup: Optional[Callable[[], None]] = None,
+        teardown: Optional[Callable[[], None]] = None,
+        repeat: int = 5,
+    ):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+        self.repeat = repeat
+
+    def measure(self, warmup: int = 1) -> dict[str, Any]:
+        timings = []
+        profile = None
+        for index in range(warmup + self.repeat):
+            if self.setup:
+                self.setup()
+            started = time.perf_counter()
+            response = self.run()
+            elapsed = (time.perf_counter() - started) * 1000
+            if self.teardown:
+                self.teardown()
+            if response.status_code >= 400:
+                raise RuntimeError(f"{self.name}: HTTP {response.status_code} {response.text[:300]}")
+            if index >= warmup:
+                timings.append(elapsed)
+                if "Server-Timing" in response.headers:
+                    profile = response.headers["Server-Timing"]
+        timings.sort()
+        result = {
+            "runs": len(timings),
+            "median_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            "min_ms": round(timings[0], 2),
+            "max_ms": round(timings[-1], 2),
+        }
+        if profile:
+            result["server_timing"] = profile
+        return result
+
+
+def build_scenarios(client, db: BenchDatabase, school: SyntheticSchool, repeat: int, pdf: bool) -> list[Scenario]:
+    session = school.current_session
+    term = TERMS[0]
+    sample_class = school.classes[len(school.classes) // 2]
+    import_file = school.roster_file("xlsx", rows=IMPORT_ROWS, first_gr_no=IMPORT_GR_NO, seed=school.seed + 7)
+
+    def drop_imported():
+        db.execute(f"DELETE FROM students WHERE gr_no::bigint >= {IMPORT_GR_NO}")
+
+    scenarios = [
+        Scenario(
+            f"roster_import_{IMPORT_ROWS}",
+            lambda: client.post(
+                "/students/import",
+                files={"file": ("roster.xlsx", import_file, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")},
+            ),
+            setup=drop_imported,
+            teardown=drop_imported,
+            repeat=repeat,
+        ),
+        Scenario("students_search", lambda: client.get("/students", params={"search": "khan", "limit": 50}), repeat=repeat * 4),
+        Scenario(
+            "students_class_filter",
+            lambda: client.get("/students", params={"class_sec": sample_class, "status": "Active", "limit": 200}),
+            repeat=repeat * 4,
+        ),
+        Scenario("analytics_session", lambda: client.get("/reports/analytics", params={"session": session}), repeat=repeat),
+        Scenario(
+            "analytics_class_term",
+            lambda: client.get("/reports/analytics", params={"session": session, "class_sec": sample_class, "term": term}),
+            repeat=repeat * 2,
+        ),
+    ]
+    if not pdf:
+        return scenarios
+
+    first_result = db.scalar("SELECT MIN(id) FROM report_results WHERE session = %s", (session,))
+    scenarios.append(Scenario("single_pdf", lambda: client.get(f"/reports/history/{first_result}/pdf"), repeat=repeat))
+    for size in (50, 500):
+        last_id: list[int] = []
+
+        def setup(size=size, last_id=last_id):
+            last_id[:] = [db.scalar("SELECT COALESCE(MAX(id), 0) FROM report_results")]
+            db.queue_reports(session, term, size)
+
+        def teardown(last_id=last_id):
+            # The export moves the queue into report_results; put the table back as seeded
+            db.execute(f"DELETE FROM report_results WHERE id > {int(last_id[0])}")
+
+        scenarios.append(
+            Scenario(
+                f"batch_export_{size}",
+                lambda: client.post("/reports/export"),
+                setup=setup,
+                teardown=teardown,
+                repeat=max(1, repeat // (2 if size > 50 else 1)),
+            )
+        )
+    return scenarios
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Print a median-vs-baseline table and return the scenarios slower than the tolerance"""
+    regressions = []
+    print(f"\n{'scenario':<28}{'baseline':>12}{'now':>12}{'change':>10}")
+    for name, now in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or "median_ms" not in now:
+            print(f"{name:<28}{'-':>12}{now.get('median_ms', '-'):>12}")
+            continue
+        change = (now["median_ms"] - before["median_ms"]) / before["median_ms"] if before["median_ms"] else 0.0
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28}{before['median_ms']:>12.1f}{now['median_ms']:>12.1f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-host", default="localhost")
+    parser.add_argument("--db-port", default="5432")
+    parser.add_argument("--db-name", default="faizan_bench")
+    parser.add_argument("--db-user", default="postgres")
+    parser.add_argument("--db-password", default=os.getenv("DB_PASSWORD", ""))
+    parser.add_argument("--force", action="store_true", help="run even if the database name lacks 'bench'")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="compare against a previous results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed median slowdown (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if "bench" not in args.db_name and not args.force:
+        parser.error(f"refusing to reseed '{args.db_name}'; use a database named *bench* or pass --force")
+
+    # get_connection reads these on every call, so they must be set before the app is used
+    os.environ.update(
+        DB_HOST=args.db_host,
+        DB_PORT=str(args.db_port),
+        DB_NAME=args.db_name,
+        DB_USER=args.db_user,
+        DB_PASSWORD=args.db_password,
+    )
+    from fastapi.testclient import TestClient
+
+    import backend.app as backend
+
+    school = SyntheticSchool(args.students, args.sessions, args.seed)
+    db = BenchDatabase(backend)
+    started = time.perf_counter()
+    db.prepare()
+    sizes = db.seed(school)
+    print(f"Seeded {sizes} in {time.perf_counter() - started:.1f}s")
+
+    # Not used as a context manager: the startup hook (queue tables, render warm-up) stays out of the numbers
+    client = TestClient(backend.app)
+    pdf = weasyprint_available()
+    scenarios = build_scenarios(client, db, school, args.repeat, pdf)
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.only]
+
+    results: dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "data": {**school.describe(), **sizes},
+        },
+        "scenarios": {},
+    }
+    for scenario in scenarios:
+        result = scenario.measure()
+        results["scenarios"][scenario.name] = result
+        print(f"{scenario.name:<28} median {result['median_ms']:>9.1f} ms  p95 {result['p95_ms']:>9.1f} ms")
+    if not pdf:
+        results["scenarios"]["pdf"] = {"skipped": "WeasyPrint is not installed"}
+        print("PDF scenarios skipped: WeasyPrint is not installed")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} scenario(s) slower than the baseline by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
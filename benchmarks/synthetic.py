@@ -0,0 +1,210 @@
+"""
+Synthetic school data - deterministic students, results, diagnostics and rosters
+
+Classes, sessions, grade boundaries and school days come from config/config.json,
+so the data has the shape of a real school. The same seed and sizes always give
+the same data, which is what makes benchmark runs comparable.
+
+Usage:
+    python -m benchmarks.synthetic --students 2000 --sessions 3 --out bench-data
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from backend.app import extract_student_rows
+from backend.core.class_catalog import ClassCatalog
+from backend.core.config_manager import ConfigManager
+from backend.core.diagnostics_schema import DiagnosticsSchema
+from backend.core.results import ABSENT, ResultEngine, payload_percentage, rank_percentages
+from benchmarks.roster_formats import build_roster, encode
+
+TERMS = ("Mid Year", "Annual Year")
+SUBJECTS = ["English", "Urdu", "Mathematics", "Science/Env.Sci", "S.St/P.St", "Islamiyat", "Sindhi", "Computer"]
+EARLY_YEARS_LEVELS = ("NUR", "KG")
+REMARKS = [
+    "Shows steady progress in all subjects and participates actively in class.",
+    "Needs to focus on written work and complete homework regularly.",
+    "A confident learner who helps classmates.",
+    "Should read more at home to improve comprehension.",
+]
+CONDUCT = ["Excellent", "Very Good", "Good", "Satisfactory"]
+FIRST_GR_NO = 10000
+
+
+class SyntheticSchool:
+    """
+    One school's worth of data for the benchmarks
+
+    Students are spread over every catalogued class. Each student gets a
+    report_results payload per session and term, computed by ResultEngine and
+    ranked within its class. Students in early-years classes also get
+    diagnostics payloads shaped by DiagnosticsSchema.
+    """
+
+    def __init__(self, students: int = 2000, sessions: int = 3, seed: int = 42, config: Optional[dict[str, Any]] = None):
+        config = config if config is not None else ConfigManager.snapshot()
+        self.students = students
+        self.seed = seed
+        self.catalog = ClassCatalog.from_config(config)
+        self.classes = [entry["code"] for entry in self.catalog.entries] or ["IA"]
+        configured = list(config.get("sessions") or ["2025-2026"])
+        self.sessions = configured[: max(1, sessions)]
+        self.engine = ResultEngine.from_config(config, default_days=self.catalog.default_days)
+        self.diagnostics = DiagnosticsSchema.from_config(config)
+
+    @property
+    def current_session(self) -> str:
+        return self.sessions[-1]
+
+    def roster(self, rows: Optional[int] = None, first_gr_no: int = FIRST_GR_NO, seed: Optional[int] = None):
+        """Roster DataFrame with the import columns, as teachers upload it"""
+        return build_roster(
+            rows if rows is not None else self.students,
+            seed=self.seed if seed is None else seed,
+            classes=self.classes,
+            session=self.current_session,
+            first_gr_no=first_gr_no,
+        )
+
+    def roster_file(self, fmt: str = "xlsx", **kwargs: Any) -> bytes:
+        return encode(self.roster(**kwargs), fmt)
+
+    def student_rows(self) -> list[dict[str, Any]]:
+        """Normalized student rows (through the real import parser) plus a status column"""
+        rows, _ = extract_student_rows(self.roster_file("csv"), "roster.csv")
+        rng = random.Random(self.seed + 1)
+        for row in rows:
+            row["status"] = "Left" if rng.random() < 0.04 else "Active"
+        return rows
+
+    def _marks(self, rng: random.Random, ability: float) -> dict[str, dict[str, str]]:
+        marks = {}
+        for subject in SUBJECTS:
+            if rng.random() < 0.01:
+                marks[subject] = {"coursework": ABSENT, "termexam": ABSENT, "maxmarks": "100"}
+                continue
+            coursework = min(20, max(0, round(rng.gauss(ability * 20, 3))))
+            termexam = min(80, max(0, round(rng.gauss(ability * 80, 10))))
+            marks[subject] = {"coursework": str(coursework), "termexam": str(termexam), "maxmarks": "100"}
+        return marks
+
+    def report_drafts(self, session: str, term: str, students: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        rng = random.Random(f"{self.seed}:{session}:{term}")
+        drafts = []
+        for student in students:
+            ability = random.Random(f"{self.seed}:{student['gr_no']}").uniform(0.35, 0.95)
+            class_sec = student["current_class_sec"]
+            total_days = self.catalog.default_days(class_sec) or 220
+            attended = rng.randint(int(total_days * 0.75), total_days)
+            drafts.append(
+                {
+                    "student_name": student["student_name"] or "",
+                    "father_name": student["father_name"] or "",
+                    "class_sec": class_sec,
+                    "session": session,
+                    "gr_no": student["gr_no"],
+                    "rank": "N/A",
+                    "total_days": str(total_days),
+                    "days_attended": str(attended),
+                    "days_absent": str(total_days - attended),
+                    "term": term,
+                    "marks_data": self._marks(rng, ability),
+                    "conduct": rng.choice(CONDUCT),
+                    "performance": rng.choice(CONDUCT),
+                    "progress": rng.choice(CONDUCT),
+                    "remarks": rng.choice(REMARKS),
+                    "status": "Passed",
+                    "date": f"{rng.randint(1, 28)} March {session.split('-')[-1]}",
+                    "grand_totals": {},
+                }
+            )
+        return drafts
+
+    def report_results(self, students: Optional[list[dict[str, Any]]] = None) -> Iterator[dict[str, Any]]:
+        """Computed and ranked payloads, one per student, session and term"""
+        students = students if students is not None else self.student_rows()
+        for session in self.sessions:
+            for term in TERMS:
+                records, _, _ = self.engine.compute(self.report_drafts(session, term, students))
+                ranks = rank_percentages(
+                    [payload_percentage(record) for record in records],
+                    [record["class_sec"] for record in records],
+                )
+                for record, rank in zip(records, ranks):
+                    record["rank"] = str(rank) if rank is not None else "N/A"
+                    record["status"] = "Passed" if payload_percentage(record) >= 40 else "Failed"
+                    yield record
+
+    def diagnostics_payloads(self, students: Optional[list[dict[str, Any]]] = None, term: str = "Mid Year") -> list[dict[str, Any]]:
+        students = students if students is not None else self.student_rows()
+        rng = random.Random(f"{self.seed}:diagnostics:{term}")
+        payloads = []
+        for student in students:
+            level = self.catalog.level_for(student["current_class_sec"]) or ""
+            if not level.startswith(EARLY_YEARS_LEVELS):
+                continue
+            ratings = {cell: rng.choice(self.diagnostics.ratings) for cell in self.diagnostics.cells}
+            total_days = self.catalog.default_days(student["current_class_sec"]) or 80
+            attended = rng.randint(int(total_days * 0.8), total_days)
+            payloads.append(
+                {
+                    "student_name": student["student_name"] or "",
+                    "father_name": student["father_name"] or "",
+                    "class_sec": student["current_class_sec"],
+                    "gr_no": student["gr_no"],
+                    "rank": "N/A",
+                    "total_days": str(total_days),
+                    "days_attended": str(attended),
+                    "days_absent": str(total_days - attended),
+                    "attendance_dates": "01 Feb - 28 Feb",
+                    "overall_remark": rng.choice(self.diagnostics.ratings),
+                    "term": term,
+                    "comment": f"{student['student_name']} {rng.choice(REMARKS).lower()}",
+                    "diagnostics_sections": self.diagnostics.build_sections(ratings),
+                }
+            )
+        return payloads
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "students": self.students,
+            "seed": self.seed,
+            "sessions": self.sessions,
+            "terms": list(TERMS),
+            "classes": len(self.classes),
+            "subjects": len(SUBJECTS),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=Path("bench-data"))
+    args = parser.parse_args()
+
+    school = SyntheticSchool(args.students, args.sessions, args.seed)
+    args.out.mkdir(parents=True, exist_ok=True)
+    (args.out / "roster.xlsx").write_bytes(school.roster_file("xlsx"))
+    students = school.student_rows()
+    with open(args.out / "report_results.jsonl", "w", encoding="utf-8") as handle:
+        count = 0
+        for record in school.report_results(students):
+            handle.write(json.dumps(record) + "\n")
+            count += 1
+    diagnostics = school.diagnostics_payloads(students)
+    (args.out / "diagnostics_queue.json").write_text(json.dumps(diagnostics), encoding="utf-8")
+    print(
+        f"{len(students)} students in {len(school.classes)} classes, {count} results over "
+        f"{len(school.sessions)} sessions, {len(diagnostics)} diagnostics -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import { useRef } from 'react';
 
-export default function FileUploadButton({ label, loading, onSelect, accept = '.xlsx,.xls' }) {
+export default function FileUploadButton({ label, loading, onSelect, accept = '.xlsx,.xls,.csv,.parquet' }) {
   const inputRef = useRef(null);
 
   const handleClick = () => inputRef.current?.click();
@@ -6,7 +6,8 @@ const makeKey = (prefix, ...parts) => `${prefix}:${parts.join('|')}`;
 
 export default function ResultsPage() {
   const toast = useToast();
-  const [items, setItems] = useState([]);
+  const [summary, setSummary] = useState([]);
+  const [termItems, setTermItems] = useState({});
   const [loading, setLoading] = useState(false);
   const [openSessions, setOpenSessions] = useState(new Set());
   const [openClasses, setOpenClasses] = useState(new Set());
@@ -17,8 +18,8 @@ export default function ResultsPage() {
     const fetchResults = async () => {
       setLoading(true);
       try {
-        const response = await api.get('/reports/history');
-        setItems(response.data.items || []);
+        const response = await api.get('/reports/history/summary');
+        setSummary(response.data.items || []);
       } catch (error) {
         toast({
           type: 'error',
@@ -41,17 +42,44 @@ export default function ResultsPage() {
 
   const grouped = useMemo(() => {
     const tree = {};
-    items.forEach((item) => {
-      const session = item.session || 'Unknown Session';
-      const classSec = item.class_sec || 'Unknown Class';
-      const term = item.term || 'Term';
+    summary.forEach((group) => {
+      const session = group.session || 'Unknown Session';
+      const classSec = group.class_sec || 'Unknown Class';
+      const term = group.term || 'Term';
       if (!tree[session]) tree[session] = {};
       if (!tree[session][classSec]) tree[session][classSec] = {};
-      if (!tree[session][classSec][term]) tree[session][classSec][term] = [];
-      tree[session][classSec][term].push(item);
+      tree[session][classSec][term] = group;
     });
     return tree;
-  }, [items]);
+  }, [summary]);
+
+  const loadTermItems = async (termKey, group) => {
+    if (termItems[termKey]) return;
+    const items = [];
+    let cursor = null;
+    try {
+      do {
+        // axios drops null params; '' asks the backend for the NULL ("Unknown") group instead of no filter
+        const response = await api.get('/reports/history', {
+          params: {
+            session: group.session ?? '',
+            class_sec: group.class_sec ?? '',
+            term: group.term ?? '',
+            cursor,
+          },
+        });
+        items.push(...(response.data.items || []));
+        cursor = response.data.cursor;
+      } while (cursor);
+      setTermItems((prev) => ({ ...prev, [termKey]: items }));
+    } catch (error) {
+      toast({
+        type: 'error',
+        title: 'Load failed',
+        message: error.response?.data?.detail || 'Unable to fetch saved results.',
+      });
+    }
+  };
 
   const toggleSet = (setter, key) => {
     setter((prev) => {
@@ -145,14 +173,18 @@ export default function ResultsPage() {
                             </button>
                             {classOpen && (
                               <div className="results-children">
-                                {Object.entries(terms).map(([term, students]) => {
+                                {Object.entries(terms).map(([term, group]) => {
                                   const termKey = makeKey('term', session, classSec, term);
                                   const termOpen = openTerms.has(termKey);
+                                  const students = termItems[termKey] || [];
                                   return (
                                     <div key={termKey} className="results-group">
                                       <button
                                         className={`results-toggle ${termOpen ? 'is-open' : ''}`}
-                                        onClick={() => toggleSet(setOpenTerms, termKey)}
+                                        onClick={() => {
+                                          if (!termOpen) loadTermItems(termKey, group);
+                                          toggleSet(setOpenTerms, termKey);
+                                        }}
                                         onContextMenu={(event) => {
                                           event.preventDefault();
                                           setContextMenu({
@@ -165,7 +197,7 @@ export default function ResultsPage() {
                                         }}
                                       >
                                         <span>{term}</span>
-                                        <span className="muted">{students.length} students</span>
+                                        <span className="muted">{group.count} students</span>
                                       </button>
                                       {termOpen && (
                                         <div className="results-children">
@@ -138,7 +138,13 @@ export default function StudentsPage() {
 
   const downloadAllStudents = async () => {
     try {
-      const response = await api.get('/students/export');
+      const response = await api.get('/students/export', {
+        params: {
+          search: filters.search || undefined,
+          class_sec: filters.selectedClasses.length === 0 ? undefined : filters.selectedClasses.join(','),
+          status: filters.status === 'All' ? undefined : filters.status,
+        },
+      });
       const file = response?.data?.file;
       toast({
         type: 'success',
@@ -371,7 +377,7 @@ export default function StudentsPage() {
           <button className="btn btn-ghost" onClick={downloadSample}>
             Sample Excel
           </button>
-          <FileUploadButton label="Import Excel" onSelect={handleImport} loading={importLoading} />
+          <FileUploadButton label="Import Roster" onSelect={handleImport} loading={importLoading} />
         </div>
         <StudentTable
           students={students}